@@ -0,0 +1,55 @@
+"""
+Benchmark solving with the successors of every node pruned to its nearest ones.
+
+Usage: PYTHONPATH=. python benchmarks/arc_pruning.py [num_nodes] [k]
+"""
+import random
+import sys
+from time import perf_counter
+
+import numpy as np
+
+import ort_simpleroute as hlp
+
+NUM_VEHICLES = 8
+
+
+def make_router(points, demands):
+    distances = np.rint(
+        np.hypot(*(points[:, None, :] - points[None, :, :]).transpose(2, 0, 1))
+    )
+    router = hlp.RouteOptimizer(len(points), NUM_VEHICLES)
+    router.set_global_arc_cost(hlp.QuantizedMatrix(distances))
+    capacity = -(-sum(demands) // NUM_VEHICLES) + 10
+    router.add_dimension_w_vehicle_capacity(
+        hlp.QuantizedVector(demands), [capacity] * NUM_VEHICLES, "Load"
+    )
+    return router
+
+
+def main(num_nodes=200, k=10):
+    random.seed(0)
+    points = np.array(
+        [[random.uniform(0, 1000), random.uniform(0, 1000)] for _ in range(num_nodes)]
+    )
+    demands = [0] + [random.randint(1, 5) for _ in range(num_nodes - 1)]
+
+    times = {}
+    for name, pruned in (("full", False), ("pruned", True)):
+        router = make_router(points, demands)
+        if pruned:
+            pruning = router.prune_arcs(k)
+            print("pruned fraction {:.3f}".format(pruning.pruned_fraction))
+        start = perf_counter()
+        solution = router.solve_using_fss(hlp.fss.SAVINGS)
+        times[name] = perf_counter() - start
+        print(
+            "{:<7} solve {:8.2f} s   objective {}".format(
+                name, times[name], solution.ObjectiveValue()
+            )
+        )
+    print("speedup {:.2f}x".format(times["full"] / times["pruned"]))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
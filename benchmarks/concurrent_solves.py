@@ -0,0 +1,44 @@
+"""
+Benchmark solving many medium instances on threads against solving them serially.
+
+Usage: PYTHONPATH=. python benchmarks/concurrent_solves.py [num_instances] [workers]
+"""
+import sys
+from functools import partial
+
+import numpy as np
+
+import ort_simpleroute as hlp
+
+NUM_NODES = 150
+NUM_VEHICLES = 6
+
+
+def make_router(seed):
+    points = np.random.default_rng(seed).uniform(0, 1000, (NUM_NODES, 2))
+    distances = np.rint(
+        np.hypot(*(points[:, None, :] - points[None, :, :]).transpose(2, 0, 1))
+    )
+    router = hlp.RouteOptimizer(NUM_NODES, NUM_VEHICLES)
+    router.set_global_arc_cost(hlp.QuantizedMatrix(distances))
+    router.add_dimension_w_vehicle_capacity(
+        hlp.QuantizedVector([0] + [1] * (NUM_NODES - 1)),
+        [NUM_NODES // NUM_VEHICLES + 5] * NUM_VEHICLES,
+        "Load",
+    )
+    return router
+
+
+def main(num_instances=16, workers=4):
+    factories = [partial(make_router, seed) for seed in range(num_instances)]
+    for name, max_workers in (("serial", 1), ("threads", workers)):
+        report = hlp.solve_all(factories, hlp.fss.PATH_CHEAPEST_ARC, None, max_workers)
+        print(
+            "{:<8} wall {:6.2f} s   speedup {:5.2f}x".format(
+                name, report.wall_seconds, report.speedup
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
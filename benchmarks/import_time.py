@@ -0,0 +1,60 @@
+"""
+Benchmark the cold import time of ort_simpleroute.
+
+Every measurement runs in a fresh interpreter, the eager import of ortools that the
+package used to do is measured as a baseline.
+
+Usage: python benchmarks/import_time.py [repeats]
+"""
+import subprocess
+import sys
+from statistics import median
+
+SCENARIOS = {
+    "eager baseline (ortools pywrapcp + enums)": (
+        "from ortools.constraint_solver import pywrapcp, routing_enums_pb2"
+    ),
+    "import ort_simpleroute": "import ort_simpleroute",
+    "ort_simpleroute.fss constant": (
+        "import ort_simpleroute; ort_simpleroute.fss.PATH_CHEAPEST_ARC"
+    ),
+    "ort_simpleroute.SolutionCache": (
+        "import ort_simpleroute; ort_simpleroute.SolutionCache"
+    ),
+    "ort_simpleroute.RouteOptimizer": (
+        "import ort_simpleroute; ort_simpleroute.RouteOptimizer"
+    ),
+}
+
+_TIMED = """
+from time import perf_counter
+start = perf_counter()
+{statement}
+print(perf_counter() - start)
+"""
+
+
+def time_statement(statement, repeats):
+    """Return the median seconds taken by statement in fresh interpreters."""
+    program = _TIMED.format(statement=statement)
+    times = [
+        float(subprocess.check_output([sys.executable, "-c", program]))
+        for _ in range(repeats)
+    ]
+    return median(times)
+
+
+def main(repeats=7):
+    baseline = None
+    for name, statement in SCENARIOS.items():
+        seconds = time_statement(statement, repeats)
+        baseline = seconds if baseline is None else baseline
+        print(
+            "{:<45} {:8.2f} ms  {:6.1f}x speedup".format(
+                name, seconds * 1000, baseline / seconds
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
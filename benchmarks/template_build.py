@@ -0,0 +1,58 @@
+"""
+Benchmark building RouteOptimizers from a FleetTemplate against building by hand.
+
+Usage: PYTHONPATH=. python benchmarks/template_build.py [num_nodes] [repeats]
+"""
+import random
+import sys
+from time import perf_counter
+
+import ort_simpleroute as hlp
+from ort_simpleroute.templates import FleetTemplate
+
+NUM_VEHICLES = 8
+CAPACITIES = [100] * NUM_VEHICLES
+
+
+def make_data(num_nodes):
+    matrix = [
+        [random.randint(1, 1000) for _ in range(num_nodes)] for _ in range(num_nodes)
+    ]
+    demands = [0] + [random.randint(1, 5) for _ in range(num_nodes - 1)]
+    return matrix, demands
+
+
+def build_by_hand(matrix, demands):
+    router = hlp.RouteOptimizer(len(matrix), NUM_VEHICLES)
+    router.set_global_arc_cost(lambda x, y: matrix[x][y])
+    router.add_dimension_w_vehicle_capacity(lambda x: demands[x], CAPACITIES, "Load")
+    return router
+
+
+def main(num_nodes=200, repeats=200):
+    template = FleetTemplate(NUM_VEHICLES)
+    template.add_dimension_w_vehicle_capacity("Load", CAPACITIES)
+    requests = [make_data(num_nodes) for _ in range(10)]
+
+    for name, build in (
+        ("by hand", build_by_hand),
+        ("template", lambda m, d: template.build(m, {"Load": d})),
+    ):
+        start = perf_counter()
+        for number in range(repeats):
+            build(*requests[number % len(requests)]).close()
+        build_time = (perf_counter() - start) / repeats
+
+        router = build(*requests[0])
+        start = perf_counter()
+        router.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC)
+        solve_time = perf_counter() - start
+        print(
+            "{:<10} build {:8.3f} ms   first solution {:8.1f} ms".format(
+                name, build_time * 1000, solve_time * 1000
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
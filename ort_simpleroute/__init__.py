@@ -1,3 +1,71 @@
-"""An abstraction layer around ortools route optimization modules."""
-from .ortools_helpers import RouteOptimizer, solution_sequence
-from . import fss_enum as fss
+"""
+An abstraction layer around ortools route optimization modules.
+
+Submodules are imported the first time one of their attributes is accessed, so
+importing the package does not load ortools until it is actually needed.
+"""
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .ortools_helpers import RouteOptimizer, solution_sequence, solution_routes
+    from .solution_cache import SolutionCache
+    from .fss_selection import StrategySelector, solve_using_selected_fss
+    from .route_evaluation import RouteEvaluator
+    from .insertion_quotes import InsertionQuoter
+    from .solution_report import solution_report
+    from .templates import FleetTemplate
+    from .quantization import QuantizedMatrix, QuantizedVector, SymmetricMatrix
+    from .time_dependent import TimeDependentMatrix
+    from .partial_reoptimization import reoptimize_subset
+    from .solution_pool import SolutionPool
+    from .solve_executor import solve_all
+    from .lower_bounds import LowerBound
+    from .feasibility import InfeasibleProblem
+    from . import tracing
+    from . import fss_enum as fss
+
+
+# Public attribute name -> (submodule, attribute in submodule or None for module)
+_LAZY_ATTRIBUTES = {
+    "RouteOptimizer": ("ortools_helpers", "RouteOptimizer"),
+    "solution_sequence": ("ortools_helpers", "solution_sequence"),
+    "solution_routes": ("ortools_helpers", "solution_routes"),
+    "SolutionCache": ("solution_cache", "SolutionCache"),
+    "StrategySelector": ("fss_selection", "StrategySelector"),
+    "solve_using_selected_fss": ("fss_selection", "solve_using_selected_fss"),
+    "RouteEvaluator": ("route_evaluation", "RouteEvaluator"),
+    "InsertionQuoter": ("insertion_quotes", "InsertionQuoter"),
+    "solution_report": ("solution_report", "solution_report"),
+    "FleetTemplate": ("templates", "FleetTemplate"),
+    "QuantizedMatrix": ("quantization", "QuantizedMatrix"),
+    "QuantizedVector": ("quantization", "QuantizedVector"),
+    "SymmetricMatrix": ("quantization", "SymmetricMatrix"),
+    "TimeDependentMatrix": ("time_dependent", "TimeDependentMatrix"),
+    "reoptimize_subset": ("partial_reoptimization", "reoptimize_subset"),
+    "SolutionPool": ("solution_pool", "SolutionPool"),
+    "solve_all": ("solve_executor", "solve_all"),
+    "LowerBound": ("lower_bounds", "LowerBound"),
+    "InfeasibleProblem": ("feasibility", "InfeasibleProblem"),
+    "tracing": ("tracing", None),
+    "fss": ("fss_enum", None),
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    try:
+        module_name, attribute = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(
+            "module {!r} has no attribute {!r}".format(__name__, name)
+        ) from None
+    module = import_module("." + module_name, __name__)
+    value = module if attribute is None else getattr(module, attribute)
+    globals()[name] = value  # Later accesses skip __getattr__.
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
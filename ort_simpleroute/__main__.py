@@ -0,0 +1,4 @@
+"""Run the command line solver, see ort_simpleroute.cli."""
+from .cli import main
+
+main()
@@ -11,6 +11,11 @@ from ._typing import (
     SearchParameters,
 )
 from enum import Enum
+from typing import List, Optional
+from types import FunctionType
+from weakref import WeakKeyDictionary
+
+from .tracing import span
 
 
 def node2index_distance_callback(
@@ -26,6 +31,28 @@ def node2index_distance_callback(
     return index_distance_callback
 
 
+def table_distance_callback(
+    index_to_node: List[Node], node_distance_callback: NDistanceCallback
+) -> IDistanceCallback:
+    """Same as node2index_distance_callback, translating with a prebuilt table."""
+
+    def index_distance_callback(from_index: Index, to_index: Index) -> Distance:
+        return node_distance_callback(
+            index_to_node[from_index], index_to_node[to_index]
+        )
+
+    return index_distance_callback
+
+
+def table_demand_callback(index_to_node: List[Node], node_demand_callback):
+    """Same as node2index_demand_callback, translating with a prebuilt table."""
+
+    def index_demand_callback(from_index):
+        return node_demand_callback(index_to_node[from_index])
+
+    return index_demand_callback
+
+
 def node2index_demand_callback(
     manager: Manager, node_demand_callback: NDistanceCallback
 ):
@@ -47,13 +74,45 @@ def _is_callback(callback_or_index):
     raise TypeError("A callback should be callable or represented by a index.")
 
 
+# Code object -> argument count, functions created by the same code share it.
+# Kept weakly, the count goes with the last function using the code.
+_function_argument_counts = WeakKeyDictionary()
+
+
 def _argument_count(callback):
+    # The signature of wrapped functions isn't the one of their code, see
+    # inspect.signature, so it isn't cached.
+    is_function = (
+        isinstance(callback, FunctionType)
+        and not hasattr(callback, "__wrapped__")
+        and not hasattr(callback, "__signature__")
+    )
+    if is_function and callback.__code__ in _function_argument_counts:
+        return _function_argument_counts[callback.__code__]
+
     from inspect import signature
 
     sig = signature(callback)
+    if is_function:
+        _function_argument_counts[callback.__code__] = len(sig.parameters)
     return len(sig.parameters)
 
 
+def callback_values(callback, num_nodes: int):
+    """Evaluate a node callback over every node, or every pair of nodes."""
+    if hasattr(callback, "node_values"):  # Callbacks backed by data, see quantization.
+        return callback.node_values()
+    nodes = range(num_nodes)
+    if _argument_count(callback) == 1:
+        return [callback(node) for node in nodes]
+    return [[callback(from_node, to_node) for to_node in nodes] for from_node in nodes]
+
+
+def _registers_data(callback) -> bool:
+    """True if callback is registered in the solver as data, see quantization."""
+    return hasattr(callback, "node_values") and getattr(callback, "native", True)
+
+
 class _CallbackIndexTracker:
     def __init__(self):
         self._callbacks_and_indexes = dict()
@@ -127,6 +186,12 @@ class CallbackManager:
         self.manager = manager
         self.model = model
         self._callback_index_tracker = _CallbackIndexTracker()
+        # Index -> node table, if set, used instead of asking the manager each call.
+        self.index_to_node: Optional[List[Node]] = None
+        # Callbacks the solver calls back into Python for, not registered as data.
+        self.python_callback_count = 0
+        # Values registered as data, the solver keeps them as 64 bit integers.
+        self.native_value_count = 0
 
     def _register_transit_callback(self, distance_callback: NDistanceCallback) -> int:
         """
@@ -137,9 +202,14 @@ class CallbackManager:
         possible to use the same callback function for multiple purposes like for more
         than one vehicle but not all.
         """
-        index_distance_callback: IDistanceCallback = node2index_distance_callback(
-            self.manager, distance_callback
-        )
+        if self.index_to_node is None:
+            index_distance_callback: IDistanceCallback = node2index_distance_callback(
+                self.manager, distance_callback
+            )
+        else:
+            index_distance_callback = table_distance_callback(
+                self.index_to_node, distance_callback
+            )
         transit_callback_index = self.model.RegisterTransitCallback(
             index_distance_callback
         )
@@ -152,9 +222,14 @@ class CallbackManager:
         Same as register_transit_callback but the callback thakes just one argument
         and returns a value associated to a node instead of a path.
         """
-        index_distance_callback = node2index_demand_callback(
-            self.manager, demand_callback
-        )
+        if self.index_to_node is None:
+            index_distance_callback = node2index_demand_callback(
+                self.manager, demand_callback
+            )
+        else:
+            index_distance_callback = table_demand_callback(
+                self.index_to_node, demand_callback
+            )
         unary_callback_index = self.model.RegisterUnaryTransitCallback(
             index_distance_callback
         )
@@ -164,10 +239,22 @@ class CallbackManager:
         if self._callback_index_tracker.is_present(callback):
             raise ValueError("Callback already present.")
         argument_count = _argument_count(callback)
-        if argument_count == 1:
+        if _registers_data(callback):
+            # Data is copied into the solver, which then makes no Python calls. The
+            # solver only takes lists: while registering, the values are also held
+            # as Python integers.
+            values = callback.node_values().tolist()
+            self.native_value_count += len(values) ** argument_count
+            if argument_count == 1:
+                callback_index = self.model.RegisterUnaryTransitVector(values)
+            else:
+                callback_index = self.model.RegisterTransitMatrix(values)
+        elif argument_count == 1:
             callback_index = self._register_unary_callback(callback)
+            self.python_callback_count += 1
         elif argument_count == 2:
             callback_index = self._register_transit_callback(callback)
+            self.python_callback_count += 1
         else:
             raise ValueError("Callback needs to have 1 or 2 arguments.")
         self._callback_index_tracker.add_callback(callback, callback_index)
@@ -178,7 +265,8 @@ class CallbackManager:
             raise ValueError("Required callback type doesn't match")
         index = self._callback_index_tracker.get_index(callback)
         if index is None:
-            self._register_callback(callback)
+            with span("register_callback", native=_registers_data(callback)):
+                self._register_callback(callback)
             index = self._callback_index_tracker.get_index(callback)
             assert index is not None
         return index
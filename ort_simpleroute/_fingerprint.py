@@ -0,0 +1,73 @@
+"""Canonical hashing of the problem built into a RouteOptimizer."""
+from hashlib import blake2b
+from typing import Dict, List
+
+from ._callback_management import callback_values
+
+
+def _hash_values(values) -> bytes:
+    """Digest a sequence of numbers, independent of the container holding them."""
+    import numpy as np
+
+    array = np.asarray(values)
+    if array.dtype.kind in "iub":
+        array = array.astype(np.int64)
+    elif array.dtype.kind == "f":
+        array = array.astype(np.float64)
+    else:
+        return blake2b(repr(array.tolist()).encode()).digest()
+    return blake2b(array.dtype.str.encode() + array.tobytes()).digest()
+
+
+def _hash_rows(rows) -> bytes:
+    """Same digest as _hash_values of the integer matrix made of rows."""
+    hasher = blake2b(b"<i8")
+    for row in rows:
+        hasher.update(row.astype("<i8").tobytes())
+    return hasher.digest()
+
+
+class _ModelFingerprint:
+    """
+    Accumulate the building steps of a model and digest them on demand.
+
+    Steps are recorded as cheap tokens while the model is built, callbacks are only
+    hashed, once each, when the digest is requested: data backed callbacks from their
+    arrays, others evaluated over every node, or pair of nodes, unless they have a
+    data_key attribute, which is hashed in their place.
+    """
+
+    def __init__(self, num_nodes: int):
+        self._num_nodes = num_nodes
+        self._steps: List = []
+        self._callback_digests: Dict = dict()
+
+    def update(self, *parts):
+        self._steps.append(parts)
+
+    def _callback_digest(self, callback) -> bytes:
+        digest = self._callback_digests.get(callback)
+        if digest is None:
+            data_key = getattr(callback, "data_key", None)
+            if data_key is not None:
+                digest = blake2b(b"k" + repr(data_key).encode()).digest()
+            elif hasattr(callback, "rows"):  # Never built whole, see SymmetricMatrix.
+                digest = _hash_rows(callback.rows())
+            else:
+                digest = _hash_values(callback_values(callback, self._num_nodes))
+            self._callback_digests[callback] = digest
+        return digest
+
+    def _part_bytes(self, part) -> bytes:
+        if callable(part) or hasattr(part, "node_values"):
+            return b"c" + self._callback_digest(part)
+        if isinstance(part, (list, tuple)) or hasattr(part, "__array__"):
+            return b"s" + _hash_values(part)
+        return b"v" + repr(part).encode()
+
+    def hexdigest(self, *extra) -> str:
+        """Return the digest of every recorded step, followed by extra parts."""
+        hasher = blake2b(digest_size=20)
+        for parts in self._steps + [extra]:
+            hasher.update(b"|".join(map(self._part_bytes, parts)) + b";")
+        return hasher.hexdigest()
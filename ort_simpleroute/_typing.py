@@ -16,13 +16,30 @@ from ._typing import (
 )
 """
 
+from importlib import import_module
 from typing import Callable, Union, Sequence
-from ortools.constraint_solver import pywrapcp
 
 
-Manager = pywrapcp.RoutingIndexManager
-Model = pywrapcp.RoutingModel
-Solution = Model.SolveWithParameters
+# Aliases of ortools classes, resolved on first access so that modules only using
+# the plain aliases below don't load ortools.
+_ORTOOLS_ALIASES = {
+    "Manager": lambda pywrapcp: pywrapcp.RoutingIndexManager,
+    "Model": lambda pywrapcp: pywrapcp.RoutingModel,
+    "Solution": lambda pywrapcp: pywrapcp.RoutingModel.SolveWithParameters,
+    "SearchParameters": lambda pywrapcp: pywrapcp.DefaultRoutingSearchParameters,
+}
+
+
+def __getattr__(name):
+    if name not in _ORTOOLS_ALIASES:
+        raise AttributeError(
+            "module {!r} has no attribute {!r}".format(__name__, name)
+        )
+    pywrapcp = import_module("ortools.constraint_solver.pywrapcp")
+    value = _ORTOOLS_ALIASES[name](pywrapcp)
+    globals()[name] = value  # Later accesses skip __getattr__.
+    return value
+
 
 _Magnitude = Union[float, int]
 Distance = _Magnitude
@@ -34,6 +51,4 @@ Index = int
 NDistanceCallback = Callable[[Node, Node], Distance]
 IDistanceCallback = Callable[[Index, Index], Distance]
 
-SearchParameters = pywrapcp.DefaultRoutingSearchParameters
-
 Route = Sequence[Node]
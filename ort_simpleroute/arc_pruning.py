@@ -0,0 +1,108 @@
+"""
+Restrict the successors of every node to a list of nearby candidates.
+
+Arcs between far apart nodes hardly ever appear in good routes, yet the solver keeps
+considering them. Pruning removes every successor but the candidates from the domain
+of the next variable of each node, which shrinks the neighbourhoods explored by the
+search.
+
+Candidates are kept in both directions, and pickups keep their delivery as a
+candidate. Route ends stay allowed successors of every node and every node stays an
+allowed successor of route starts, so a node can always be served going straight
+from and back to its depot: with vehicles to spare, or nodes that may be dropped,
+pruning never makes a problem infeasible. Successors already fixed, by locked route
+prefixes, are kept. With a tight fleet small candidate lists may leave no feasible
+routes, insertion based first solution strategies (savings, parallel cheapest
+insertion) cope best with pruned arcs, path cheapest arc may stall backtracking.
+"""
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from ._callback_management import callback_values
+
+
+class ArcPruning(NamedTuple):
+    """Outcome of pruning, candidates[from node, to node] tells if an arc is kept."""
+
+    candidates: np.ndarray
+    kept_arcs: int  # Values left in the domains of the next variables pruned,
+    total_arcs: int  # and values they held before.
+
+    @property
+    def pruned_fraction(self) -> float:
+        return 1 - self.kept_arcs / self.total_arcs if self.total_arcs else 0.0
+
+
+def candidate_arcs(
+    costs: np.ndarray, k: Optional[int] = None, radius: Optional[float] = None
+) -> np.ndarray:
+    """
+    Return which arcs are candidates, by their (from node, to node) costs.
+
+    An arc is a candidate if it's among the k cheapest leaving its node, or if it
+    costs at most radius. Giving both keeps the arcs meeting either condition.
+    """
+    if k is None and radius is None:
+        raise ValueError("Give k, radius or both.")
+    costs = np.asarray(costs)
+    num_nodes = len(costs)
+    candidates = np.zeros(costs.shape, bool)
+    if k is not None and k > 0:
+        ranked = costs.astype(np.float64)
+        np.fill_diagonal(ranked, np.inf)
+        k = min(k, num_nodes - 1)
+        nearest = np.argpartition(ranked, k - 1, axis=1)[:, :k]
+        candidates[np.arange(num_nodes)[:, None], nearest] = True
+    if radius is not None:
+        candidates |= costs <= radius
+    np.fill_diagonal(candidates, False)
+    return candidates
+
+
+def _arc_costs(router) -> np.ndarray:
+    """Cheapest cost of every arc among the arc costs of the vehicles."""
+    callbacks = {id(cb): cb for cb in router._arc_cost_callbacks if cb is not None}
+    if not callbacks:
+        raise ValueError("Arc costs must be set before pruning arcs.")
+    num_nodes = router.manager.GetNumberOfNodes()
+    return np.min(
+        [
+            np.asarray(callback_values(callback, num_nodes))
+            for callback in callbacks.values()
+        ],
+        axis=0,
+    )
+
+
+def prune_arcs(
+    router, k: Optional[int] = None, radius: Optional[float] = None
+) -> ArcPruning:
+    """Prune the successors of the nodes of a RouteOptimizer, see module docs."""
+    model, manager = router.model, router.manager
+    candidates = candidate_arcs(_arc_costs(router), k, radius)
+    candidates |= candidates.T
+    for pickup, delivery in router._delivery_requests:
+        candidates[pickup, delivery] = True
+
+    node_indices = {
+        node: manager.NodeToIndex(node)
+        for node in range(manager.GetNumberOfNodes())
+        if node not in router._route_end_nodes
+    }
+    ends = [model.End(vehicle) for vehicle in range(manager.GetNumberOfVehicles())]
+    kept_arcs = total_arcs = 0
+    for node, index in node_indices.items():
+        next_var = model.NextVar(index)
+        total_arcs += next_var.Size()
+        if next_var.Bound():  # Locked, see RouteOptimizer.lock_route_prefixes.
+            kept_arcs += 1
+            continue
+        successors = [
+            node_indices[to_node]
+            for to_node in np.flatnonzero(candidates[node])
+            if to_node in node_indices
+        ]
+        next_var.SetValues(successors + ends + [index])
+        kept_arcs += next_var.Size()
+    return ArcPruning(candidates, kept_arcs, total_arcs)
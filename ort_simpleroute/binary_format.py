@@ -0,0 +1,147 @@
+"""
+Compact columnar binary format for problem instances.
+
+A file starts with a fixed size preamble:
+
+- 4 bytes magic b"ORSR", 2 bytes little endian format version, 2 bytes reserved.
+- 4 bytes little endian length of the json header that follows.
+
+The json header holds the scalar values of the instance ("num_vehicles", "depot",
+...) and, for every array, its numpy dtype, shape and byte offset in the file. Array
+data follows the header, each array aligned to 8 bytes, stored with the smallest
+integer type its values fit in.
+
+Arrays are read as views over the file contents (memory mapped by default), so
+loading an instance doesn't copy nor parse its matrix.
+"""
+import json
+import mmap
+import os
+import struct
+from typing import Union
+
+import numpy as np
+
+_MAGIC = b"ORSR"
+_VERSION = 1
+_PREAMBLE = struct.Struct("<4sHHI")
+_ALIGNMENT = 8
+
+_ARRAY_KEYS = (
+    "distance_matrix",
+    "demands",
+    "vehicle_capacities",
+    "pickups_deliveries",
+    "penalties",
+    "starts",
+    "ends",
+)
+_INTEGER_TYPES = (np.int8, np.int16, np.int32, np.int64)
+
+
+def _compact_array(values) -> np.ndarray:
+    """Return values as an array of the smallest integer type they fit in."""
+    array = np.asarray(values)
+    if array.dtype.kind == "f":
+        return array.astype("<f8")
+    if array.size == 0:
+        return array.astype("<i4")
+    low, high = array.min(), array.max()
+    for integer_type in _INTEGER_TYPES:
+        info = np.iinfo(integer_type)
+        if info.min <= low and high <= info.max:
+            return array.astype(np.dtype(integer_type).newbyteorder("<"))
+    raise OverflowError("Values don't fit in a 64 bit integer.")
+
+
+def _penalties_array(penalties) -> list:
+    """Encode mandatory nodes (None penalty) as -1."""
+    return [-1 if penalty is None else penalty for penalty in penalties]
+
+
+def _padding(size: int) -> int:
+    return -size % _ALIGNMENT
+
+
+def dumps_binary(data: dict) -> bytes:
+    """Encode an instance dict (see ort_simpleroute.instances) to bytes."""
+    scalars = {key: value for key, value in data.items() if key not in _ARRAY_KEYS}
+    arrays = {}
+    for key in _ARRAY_KEYS:
+        if key not in data:
+            continue
+        values = data[key]
+        if key == "penalties":
+            values = _penalties_array(values)
+        arrays[key] = _compact_array(values)
+
+    columns = {}
+    offset = 0
+    for key, array in arrays.items():
+        columns[key] = [array.dtype.str, list(array.shape), offset]
+        offset += array.nbytes + _padding(array.nbytes)
+
+    header = json.dumps({"scalars": scalars, "columns": columns}).encode()
+    header += b" " * _padding(_PREAMBLE.size + len(header))
+    data_start = _PREAMBLE.size + len(header)
+
+    chunks = [_PREAMBLE.pack(_MAGIC, _VERSION, 0, len(header)), header]
+    for array in arrays.values():
+        chunks.append(array.tobytes())
+        chunks.append(b"\0" * _padding(array.nbytes))
+    encoded = b"".join(chunks)
+    assert len(encoded) == data_start + offset
+    return encoded
+
+
+def write_binary(path: str, data: dict):
+    """
+    Write an instance dict (see ort_simpleroute.instances) to path.
+
+    The file is written aside and then moved in place: instances already read from
+    path keep the contents they mapped, rewriting a mapped file would crash them.
+    """
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as file:
+        file.write(dumps_binary(data))
+    os.replace(temporary, path)
+
+
+def loads_binary(buffer: Union[bytes, bytearray, memoryview, mmap.mmap]) -> dict:
+    """
+    Decode an instance from a buffer, without copying its arrays.
+
+    The arrays returned are read only views of buffer, which is kept alive by them.
+    """
+    magic, version, _, header_length = _PREAMBLE.unpack_from(buffer, 0)
+    if magic != _MAGIC:
+        raise ValueError("Not an ort_simpleroute binary instance.")
+    if version != _VERSION:
+        raise ValueError("Unsupported binary instance version {}.".format(version))
+
+    header_end = _PREAMBLE.size + header_length
+    header = json.loads(bytes(buffer[_PREAMBLE.size : header_end]))
+    data = dict(header["scalars"])
+    for key, (dtype, shape, offset) in header["columns"].items():
+        dtype = np.dtype(dtype)
+        count = int(np.prod(shape))
+        array = np.frombuffer(buffer, dtype, count, header_end + offset)
+        data[key] = array.reshape(shape)
+    return data
+
+
+def read_binary(path: str, use_mmap: bool = True) -> dict:
+    """Read an instance written by write_binary, memory mapping it by default."""
+    with open(path, "rb") as file:
+        if use_mmap:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            buffer = file.read()
+    return loads_binary(buffer)
+
+
+def optimizer_from_binary(path: str, use_mmap: bool = True):
+    """Build a RouteOptimizer from an instance written by write_binary."""
+    from .instances import optimizer_from_data
+
+    return optimizer_from_data(read_binary(path, use_mmap))
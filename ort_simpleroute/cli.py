@@ -0,0 +1,125 @@
+"""
+Command line solver for instance files.
+
+Every instance file given, or found in a directory given, is solved and its routes
+are written as one json line per instance as soon as they are available.
+
+Usage: python -m ort_simpleroute [options] PATH [PATH ...]
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from time import perf_counter
+from typing import Iterator, List
+
+from . import fss_enum as fss
+from .instances import instance_extensions, optimizer_from_data, read_instance
+
+
+def _instance_paths(paths: List[str]) -> Iterator[str]:
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for name in sorted(os.listdir(path)):
+            if name.lower().endswith(instance_extensions()):
+                yield os.path.join(path, name)
+
+
+def solve_instance_file(path: str, strategy: str, time_limit=None, overrides=None):
+    """Solve the instance stored in path and return a json serializable result."""
+    from .ortools_helpers import solution_routes
+
+    start = perf_counter()
+    data = dict(read_instance(path))
+    data.update(overrides or {})
+    router = optimizer_from_data(data)
+    solution = router.solve_using_fss(getattr(fss, strategy), time_limit=time_limit)
+    result = {"instance": path, "solved": bool(solution)}
+    if solution:
+        result["objective"] = solution.ObjectiveValue()
+        result["routes"] = solution_routes(router, solution)
+    result["seconds"] = round(perf_counter() - start, 6)
+    return result
+
+
+def _safe_solve(path, strategy, time_limit, overrides):
+    try:
+        return solve_instance_file(path, strategy, time_limit, overrides)
+    except Exception as error:  # Report and keep going with the other instances.
+        return {"instance": path, "solved": False, "error": repr(error)}
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="python -m ort_simpleroute",
+        description="Solve routing instances and write their routes as json lines.",
+    )
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        metavar="PATH",
+        help="instance files ({}) or directories containing them".format(
+            ", ".join(instance_extensions())
+        ),
+    )
+    parser.add_argument(
+        "-s",
+        "--strategy",
+        default="AUTOMATIC",
+        choices=sorted(fss._strategy_names()),
+        help="first solution strategy (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-t", "--time-limit", type=float, help="time limit per instance in seconds"
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="instances solved in parallel processes (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-o", "--output", help="file to write the json lines to (default: stdout)"
+    )
+    parser.add_argument("--num-vehicles", type=int, help="override the fleet size")
+    parser.add_argument("--depot", type=int, help="override the depot node")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    overrides = {
+        key: value
+        for key, value in (("num_vehicles", args.num_vehicles), ("depot", args.depot))
+        if value is not None
+    }
+    paths = list(_instance_paths(args.paths))
+    solve = partial(
+        _safe_solve,
+        strategy=args.strategy,
+        time_limit=args.time_limit,
+        overrides=overrides,
+    )
+
+    output = sys.stdout if args.output is None else open(args.output, "w")
+    try:
+        if args.jobs > 1 and len(paths) > 1:
+            with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+                results = executor.map(solve, paths)
+                _write_lines(results, output)
+        else:
+            _write_lines(map(solve, paths), output)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+def _write_lines(results, output):
+    for result in results:
+        output.write(json.dumps(result, separators=(",", ":")) + "\n")
+        output.flush()
@@ -0,0 +1,215 @@
+"""
+Pre-solve checks finding why a problem has no solution, with array operations.
+
+The checks read the data registered in a RouteOptimizer (dimension transits and
+capacities, pickup and delivery requests, drop penalties) and report problems no
+search can solve, nodes whose drop penalty isn't set being mandatory:
+
+- unservable node: no vehicle can visit it within the capacities of its dimensions.
+  For dimensions without negative transits the lowest cumul of a route through the
+  node is given by shortest paths from the vehicle start and to its end, for the
+  others by the cheapest arcs into and out of the node (cumuls are never negative).
+  Nodes out of reach of every vehicle, for a maximum route distance, are found here.
+- unservable pair: no vehicle can visit both the pickup and the delivery.
+- fleet capacity: for dimensions counting a non-negative demand per node, the
+  demand of the mandatory nodes is above what the fleet can carry.
+
+Every dimension is checked on its own, so a report without issues doesn't prove the
+problem has a solution; constraints set directly on the model (time windows, locks)
+are not checked. An issue found, on the other hand, always means no solution exists
+until the nodes it names are made droppable.
+"""
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+
+from .route_evaluation import RouteEvaluator
+
+UNSERVABLE_NODE, UNSERVABLE_PAIR, FLEET_CAPACITY = (
+    "unservable_node",
+    "unservable_pair",
+    "fleet_capacity",
+)
+
+
+class FeasibilityIssue(NamedTuple):
+    kind: str
+    nodes: np.ndarray
+    message: str
+
+
+class FeasibilityReport(NamedTuple):
+    """Issues found, and nodes that, if made droppable, would remove them."""
+
+    issues: List[FeasibilityIssue]
+    suggested_drops: np.ndarray
+
+    @property
+    def feasible(self) -> bool:
+        """False if the problem certainly has no solution."""
+        return not self.issues
+
+    @property
+    def messages(self) -> List[str]:
+        return [issue.message for issue in self.issues]
+
+
+class InfeasibleProblem(ValueError):
+    """The problem has no solution, report tells why."""
+
+    def __init__(self, report: FeasibilityReport):
+        super().__init__(" ".join(report.messages))
+        self.report = report
+
+
+def _shortest_paths(weights: np.ndarray, source: int, blocked: np.ndarray):
+    """Shortest path lengths from source, never going through blocked nodes."""
+    distances = np.full(len(weights), np.inf)
+    distances[source] = 0
+    pending = distances.copy()
+    for _ in range(len(weights)):
+        node = int(np.argmin(pending))
+        if pending[node] == np.inf:
+            break
+        pending[node] = np.inf
+        if blocked[node] and node != source:
+            continue
+        through = distances[node] + weights[node]
+        improved = through < distances
+        distances[improved] = through[improved]
+        pending[improved] = through[improved]
+    return distances
+
+
+def _cumul_bounds(
+    transits: np.ndarray, starts: np.ndarray, ends: np.ndarray, visits: np.ndarray
+):
+    """
+    Lowest cumul of every vehicle at every node, and lowest increase from it to the
+    end of the route, (vehicles, nodes) arrays. A route through a node can't end
+    with a cumul below their sum, and cumuls within a route are at most that.
+    """
+    num_nodes = len(transits)
+    weights = transits.astype(np.float64)
+    if (weights >= 0).all():
+        from_start = {
+            start: _shortest_paths(weights, start, ~visits) for start in set(starts)
+        }
+        to_end = {end: _shortest_paths(weights.T, end, ~visits) for end in set(ends)}
+        return (
+            np.array([from_start[start] for start in starts]),
+            np.array([to_end[end] for end in ends]),
+        )
+    # Cumuls are never negative, so the cumul reached going into a node, or out of
+    # it, is at least the transit of the arc taken.
+    np.fill_diagonal(weights, np.inf)
+    predecessors = visits | np.isin(np.arange(num_nodes), starts)
+    successors = visits | np.isin(np.arange(num_nodes), ends)
+    into = np.where(predecessors[:, None], weights, np.inf).min(axis=0)
+    out_of = np.where(successors[None, :], weights, np.inf).min(axis=1)
+    lowest = np.broadcast_to(np.maximum(into, out_of), (len(starts), num_nodes))
+    return lowest, np.zeros_like(lowest)
+
+
+def check_feasibility(
+    router, evaluator: Optional[RouteEvaluator] = None
+) -> FeasibilityReport:
+    """Check a RouteOptimizer, see RouteOptimizer.check_feasibility."""
+    evaluator = evaluator or RouteEvaluator(router)
+    starts = evaluator.route_ends[0::2]
+    ends = evaluator.route_ends[1::2]
+    visits = np.ones(evaluator.num_nodes, bool)
+    visits[evaluator.route_ends] = False
+    mandatory = visits & (evaluator.drop_penalties < 0)
+
+    issues = []
+    suggested = set()
+    bounds = dict()  # dimension name -> (cumul at node, increase to the end)
+    servable = np.ones((evaluator.num_vehicles, evaluator.num_nodes), bool)
+    for name, transits in evaluator.dimension_transits.items():
+        capacities = evaluator.dimension_capacities[name]
+        if int(transits.max()) * len(transits) <= capacities.min():
+            continue  # No route can fill it, like the count of pickups and deliveries.
+        bounds[name] = _cumul_bounds(transits, starts, ends, visits)
+        servable &= bounds[name][0] + bounds[name][1] <= capacities[:, None]
+
+    for node in np.flatnonzero(mandatory & ~servable.any(axis=0)).tolist():
+        reasons = []
+        for name, (at_node, to_end) in bounds.items():
+            lowest = at_node[:, node] + to_end[:, node]
+            capacities = evaluator.dimension_capacities[name]
+            if (lowest > capacities).all():
+                reasons.append(
+                    "{} needs at least {:g}, vehicles hold at most {}".format(
+                        name, lowest.min(), capacities.max()
+                    )
+                )
+        if not reasons:
+            reasons = ["no vehicle meets the capacity of every dimension"]
+        issues.append(
+            FeasibilityIssue(
+                UNSERVABLE_NODE,
+                np.array([node]),
+                "Node {} can't be served, {}.".format(node, "; ".join(reasons)),
+            )
+        )
+        suggested.add(node)
+
+    for pickup, delivery in evaluator.pairs.tolist():
+        if not (mandatory[pickup] or mandatory[delivery]):
+            continue
+        if {pickup, delivery} & suggested:
+            continue  # Already reported.
+        both = servable[:, pickup] & servable[:, delivery]
+        for name, (at_node, to_end) in bounds.items():
+            # The pickup is reached first, the end is reached from the delivery.
+            lowest = at_node[:, pickup] + to_end[:, delivery]
+            both &= lowest <= evaluator.dimension_capacities[name]
+        if both.any():
+            continue
+        issues.append(
+            FeasibilityIssue(
+                UNSERVABLE_PAIR,
+                np.array([pickup, delivery]),
+                "No vehicle can serve both pickup {} and delivery {}.".format(
+                    pickup, delivery
+                ),
+            )
+        )
+        suggested.update((pickup, delivery))
+
+    for name, transits in evaluator.dimension_transits.items():
+        demands = transits[:, 0]
+        if not (transits == demands[:, None]).all() or (demands[visits] < 0).any():
+            continue  # Not a non-negative demand per node.
+        # Summed as Python integers, capacities may be as large as sys.maxsize.
+        fleet = sum(
+            (evaluator.dimension_capacities[name] - demands[starts])
+            .clip(min=0)
+            .tolist()
+        )
+        required = mandatory.copy()
+        required[list(suggested)] = False
+        excess = int(demands[required].sum()) - fleet
+        if excess <= 0:
+            continue
+        # Fewest nodes whose demand covers the excess: the largest demands first.
+        candidates = np.flatnonzero(required)
+        candidates = candidates[np.argsort(-demands[candidates], kind="stable")]
+        count = int(np.searchsorted(np.cumsum(demands[candidates]), excess)) + 1
+        issues.append(
+            FeasibilityIssue(
+                FLEET_CAPACITY,
+                candidates[:count],
+                "Mandatory nodes need {} of {}, the fleet holds {}.".format(
+                    int(demands[required].sum()), name, fleet
+                ),
+            )
+        )
+        suggested.update(candidates[:count].tolist())
+
+    # Pickups and deliveries are dropped together.
+    for pickup, delivery in evaluator.pairs.tolist():
+        if pickup in suggested or delivery in suggested:
+            suggested.update((pickup, delivery))
+    return FeasibilityReport(issues, np.array(sorted(suggested), np.intp))
@@ -3,18 +3,40 @@ First solution strategy enum.
 
 Relevant documentation can be found in:
 https://developers.google.com/optimization/routing/routing_options
+
+The constants are resolved from ortools the first time one of them is accessed, so
+importing this module does not load ortools.
 """
+import sys
+from importlib import import_module
+
+
+def _strategy_names():
+    return sys.modules[__name__].__annotations__
+
+
+def __getattr__(name):
+    if name not in _strategy_names():
+        raise AttributeError(
+            "module {!r} has no attribute {!r}".format(__name__, name)
+        )
+    enums = import_module("ortools.constraint_solver.routing_enums_pb2")
+    value = getattr(enums.FirstSolutionStrategy, name)
+    globals()[name] = value  # Later accesses skip __getattr__.
+    return value
+
 
-from ortools.constraint_solver import routing_enums_pb2
+def __dir__():
+    return sorted(set(globals()) | set(_strategy_names()))
 
 
-AUTOMATIC = routing_enums_pb2.FirstSolutionStrategy.AUTOMATIC
+AUTOMATIC: int
 """
 Lets the solver detect which strategy to use according to the model being solved.
 """
 
 
-PATH_CHEAPEST_ARC = routing_enums_pb2.FirstSolutionStrategy.PATH_CHEAPEST_ARC
+PATH_CHEAPEST_ARC: int
 """
 Starting from a route "start" node, connect it to the node which produces the
 cheapest route segment, then extend the route by iterating on the last node added
@@ -22,9 +44,7 @@ to the route.
 """
 
 
-PATH_MOST_CONSTRAINED_ARC = (
-    routing_enums_pb2.FirstSolutionStrategy.PATH_MOST_CONSTRAINED_ARC
-)
+PATH_MOST_CONSTRAINED_ARC: int
 """
 Similar to PATH_CHEAPEST_ARC, but arcs are evaluated with a comparison-based
 selector which will favor the most constrained arc first. To assign a selector
@@ -32,14 +52,14 @@ to the routing model, use the method ArcIsMoreConstrainedThanArc().
 """
 
 
-EVALUATOR_STRATEGY = routing_enums_pb2.FirstSolutionStrategy.EVALUATOR_STRATEGY
+EVALUATOR_STRATEGY: int
 """
 Similar to PATH_CHEAPEST_ARC, except that arc costs are evaluated using the function
 passed to SetFirstSolutionEvaluator().
 """
 
 
-SAVINGS = routing_enums_pb2.FirstSolutionStrategy.SAVINGS
+SAVINGS: int
 """
 Savings algorithm (Clarke & Wright).
 
@@ -49,7 +69,7 @@ Operations Research, Vol. 12, 1964, pp. 568-581.
 """
 
 
-SWEEP = routing_enums_pb2.FirstSolutionStrategy.SWEEP
+SWEEP: int
 """Sweep algorithm (Wren & Holliday).
 
 Reference: Anthony Wren & Alan Holliday:
@@ -59,7 +79,7 @@ Vol. 23, No. 3 (Sep., 1972), pp. 333-344.
 """
 
 
-CHRISTOFIDES = routing_enums_pb2.FirstSolutionStrategy.CHRISTOFIDES
+CHRISTOFIDES: int
 """Christofides algorithm
 
 (actually a variant of the Christofides algorithm using a maximal matching instead
@@ -73,14 +93,14 @@ Report 388, Graduate School of Industrial Administration, CMU, 1976.
 """
 
 
-ALL_UNPERFORMED = routing_enums_pb2.FirstSolutionStrategy.ALL_UNPERFORMED
+ALL_UNPERFORMED: int
 """
 Make all nodes inactive. Only finds a solution if nodes are optional
 (are element of a disjunction constraint with a finite penalty cost).
 """
 
 
-BEST_INSERTION = routing_enums_pb2.FirstSolutionStrategy.BEST_INSERTION
+BEST_INSERTION: int
 """
 Iteratively build a solution by inserting the cheapest node at its cheapest
 position; the cost of insertion is based on the global cost function of the routing
@@ -89,18 +109,14 @@ model. As of 2/2012, only works on models with optional nodes
 """
 
 
-PARALLEL_CHEAPEST_INSERTION = (
-    routing_enums_pb2.FirstSolutionStrategy.PARALLEL_CHEAPEST_INSERTION
-)
+PARALLEL_CHEAPEST_INSERTION: int
 """Iteratively build a solution by inserting the cheapest node at its cheapest
 position; the cost of insertion is based on the arc cost function.
 Is faster than BEST_INSERTION.
 """
 
 
-LOCAL_CHEAPEST_INSERTION = (
-    routing_enums_pb2.FirstSolutionStrategy.LOCAL_CHEAPEST_INSERTION
-)
+LOCAL_CHEAPEST_INSERTION: int
 """
 Iteratively build a solution by inserting each node at its cheapest position;
 the cost of insertion is based on the arc cost function.
@@ -110,20 +126,18 @@ Is faster than PARALLEL_CHEAPEST_INSERTION.
 """
 
 
-GLOBAL_CHEAPEST_ARC = routing_enums_pb2.FirstSolutionStrategy.GLOBAL_CHEAPEST_ARC
+GLOBAL_CHEAPEST_ARC: int
 """Iteratively connect two nodes which produce the cheapest route segment."""
 
 
-LOCAL_CHEAPEST_ARC = routing_enums_pb2.FirstSolutionStrategy.LOCAL_CHEAPEST_ARC
+LOCAL_CHEAPEST_ARC: int
 """
 Select the first node with an unbound successor and connect it to the node which
 produces the cheapest route segment.
 """
 
 
-FIRST_UNBOUND_MIN_VALUE = (
-    routing_enums_pb2.FirstSolutionStrategy.FIRST_UNBOUND_MIN_VALUE
-)
+FIRST_UNBOUND_MIN_VALUE: int
 """
 Select the first node with an unbound successor and connect it to the first
 available node.
@@ -0,0 +1,208 @@
+"""
+Choose a first solution strategy from cheap features of the instance.
+
+The choice is learned from recorded benchmark runs: for every recorded instance the
+winning strategy is the fastest one reaching an objective within a tolerance of the
+best recorded, and an instance being solved gets the strategy winning on the most
+similar recorded instances. Without records a few fixed rules are used.
+"""
+import json
+import math
+from collections import defaultdict
+from statistics import mean
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Optional
+
+from . import fss_enum as fss
+from ._callback_management import _argument_count
+
+Features = Dict[str, float]
+
+FEATURE_NAMES = (
+    "num_nodes",
+    "num_vehicles",
+    "nodes_per_vehicle",
+    "capacity_tightness",
+    "pickup_delivery_density",
+    "drop_fraction",
+    "relative_drop_penalty",
+)
+# Features compared in logarithmic scale, the others are ratios.
+_LOG_FEATURES = ("num_nodes", "num_vehicles", "nodes_per_vehicle")
+
+
+def instance_features(router) -> Features:
+    """
+    Compute the features of the data registered in a RouteOptimizer.
+
+    Only unary callbacks and arcs leaving the depot are evaluated, so the cost is
+    linear in the number of nodes.
+    """
+    num_nodes = router.manager.GetNumberOfNodes()
+    num_vehicles = router.manager.GetNumberOfVehicles()
+    depot = router.manager.IndexToNode(router.model.Start(0))
+    customers = max(num_nodes - 1, 1)
+
+    capacity_tightness = 0.0
+    for name, (callback, capacities) in router._dimensions.items():
+        if name.startswith("_") or _argument_count(callback) != 1:
+            continue
+        total_demand = sum(callback(node) for node in range(num_nodes))
+        capacity_tightness = max(
+            capacity_tightness, total_demand / max(sum(capacities), 1)
+        )
+
+    relative_drop_penalty = 0.0
+    arc_cost = router._arc_cost_callbacks[0]
+    if router._drop_penalties and arc_cost is not None:
+        round_trip = mean(
+            arc_cost(depot, node) + arc_cost(node, depot) for node in range(num_nodes)
+        )
+        relative_drop_penalty = mean(router._drop_penalties.values()) / max(
+            round_trip, 1
+        )
+
+    return {
+        "num_nodes": num_nodes,
+        "num_vehicles": num_vehicles,
+        "nodes_per_vehicle": customers / num_vehicles,
+        "capacity_tightness": capacity_tightness,
+        "pickup_delivery_density": 2 * len(router._delivery_requests) / customers,
+        "drop_fraction": len(router._drop_penalties) / customers,
+        "relative_drop_penalty": relative_drop_penalty,
+    }
+
+
+def _feature_vector(features: Features) -> List[float]:
+    return [
+        math.log1p(features[name]) if name in _LOG_FEATURES else features[name]
+        for name in FEATURE_NAMES
+    ]
+
+
+def _default_strategy(features: Features) -> str:
+    """Fixed rules used when no benchmark runs were recorded."""
+    if features["pickup_delivery_density"] > 0:
+        return "PARALLEL_CHEAPEST_INSERTION"
+    if features["drop_fraction"] > 0 and features["capacity_tightness"] > 1:
+        return "LOCAL_CHEAPEST_INSERTION"
+    if features["nodes_per_vehicle"] > 50:
+        return "SAVINGS"
+    return "PATH_CHEAPEST_ARC"
+
+
+def _strategy_value(strategy):
+    if isinstance(strategy, str):
+        return getattr(fss, strategy)
+    return strategy
+
+
+class StrategySelector:
+    """Select first solution strategies calibrated from recorded benchmark runs."""
+
+    def __init__(self, records: Iterable[dict] = (), neighbours=5, tolerance=0.01):
+        self.neighbours = neighbours
+        self.tolerance = tolerance
+        self.records: List[dict] = []
+        for record in records:
+            self.record(**record)
+
+    def record(self, features: Features, strategy: str, objective, seconds: float):
+        """Record a benchmark run, objective is None when no solution was found."""
+        self.records.append(
+            {
+                "features": {name: features[name] for name in FEATURE_NAMES},
+                "strategy": strategy,
+                "objective": objective,
+                "seconds": seconds,
+            }
+        )
+
+    def calibrate(
+        self,
+        router_factories: Iterable[Callable],
+        strategies: Iterable[str] = ("PATH_CHEAPEST_ARC", "SAVINGS", "CHRISTOFIDES"),
+        time_limit=None,
+    ):
+        """
+        Solve every instance with every strategy and record the runs.
+
+        Each factory has to return a new RouteOptimizer for its instance.
+        """
+        strategies = list(strategies)
+        for router_factory in router_factories:
+            features = instance_features(router_factory())
+            for strategy in strategies:
+                router = router_factory()
+                start = perf_counter()
+                solution = router.solve_using_fss(
+                    getattr(fss, strategy), time_limit=time_limit
+                )
+                seconds = perf_counter() - start
+                objective = solution.ObjectiveValue() if solution else None
+                self.record(features, strategy, objective, seconds)
+
+    def _winners(self):
+        """Return (feature vector, winning strategy) for every recorded instance."""
+        instances = defaultdict(list)
+        for record in self.records:
+            if record["objective"] is not None:
+                key = tuple(_feature_vector(record["features"]))
+                instances[key].append(record)
+        winners = []
+        for key, runs in instances.items():
+            best = min(run["objective"] for run in runs)
+            threshold = best + abs(best) * self.tolerance
+            good = [run for run in runs if run["objective"] <= threshold]
+            winners.append((key, min(good, key=lambda run: run["seconds"])["strategy"]))
+        return winners
+
+    def select_name(self, features: Features) -> str:
+        """Return the name of the strategy predicted to be the best for features."""
+        winners = self._winners()
+        if not winners:
+            return _default_strategy(features)
+        vector = _feature_vector(features)
+        nearest = sorted(winners, key=lambda winner: math.dist(vector, winner[0]))
+        votes = defaultdict(float)
+        for key, strategy in nearest[: self.neighbours]:
+            votes[strategy] += 1 / (math.dist(vector, key) + 1e-9)
+        return max(votes, key=votes.get)
+
+    def select(self, router_or_features, override=None):
+        """
+        Return the fss enum value to use for a RouteOptimizer or its features.
+
+        If override (an fss value or its name) is given, it is returned instead.
+        """
+        if override is not None:
+            return _strategy_value(override)
+        features = router_or_features
+        if not isinstance(features, dict):
+            features = instance_features(router_or_features)
+        return getattr(fss, self.select_name(features))
+
+    def save(self, path: str):
+        """Write the recorded runs as json lines."""
+        with open(path, "w") as file:
+            for record in self.records:
+                file.write(json.dumps(record) + "\n")
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "StrategySelector":
+        """Create a selector from runs written by save."""
+        with open(path) as file:
+            return cls(map(json.loads, filter(str.strip, file)), **kwargs)
+
+
+def solve_using_selected_fss(
+    router, selector: Optional[StrategySelector] = None, override=None, **kwargs
+):
+    """
+    Solve a RouteOptimizer with the strategy chosen by selector.
+
+    Without selector the fixed rules are used, override forces a strategy and the
+    remaining arguments are passed to solve_using_fss.
+    """
+    selector = StrategySelector() if selector is None else selector
+    return router.solve_using_fss(selector.select(router, override), **kwargs)
@@ -0,0 +1,125 @@
+"""
+Quote the cheapest insertion of new stops into a live plan, without the solver.
+
+A quote tells, for a node of the model that the plan doesn't visit yet, the vehicle
+and the position in its route where visiting it costs the least, and that marginal
+arc cost. Insertions violating the capacity of a dimension are not considered.
+Pickup and delivery pairs are not quoted, only single stops.
+"""
+from typing import List, NamedTuple, Sequence
+
+import numpy as np
+
+from ._typing import Node, Route
+from .route_evaluation import RouteEvaluator, _pad_routes
+
+
+class InsertionQuotes(NamedTuple):
+    """
+    Arrays with one entry per node quoted.
+
+    position is the index the node would take in the route of vehicle, vehicle and
+    position are -1 and cost is inf when no feasible insertion exists.
+    """
+
+    nodes: np.ndarray
+    vehicles: np.ndarray
+    positions: np.ndarray
+    costs: np.ndarray
+    feasible: np.ndarray
+
+
+def _suffix(values: np.ndarray, function) -> np.ndarray:
+    """Return function accumulated from the end, one column longer than values."""
+    reversed_accumulation = function.accumulate(values[:, ::-1], axis=1)[:, ::-1]
+    identity = -np.inf if function is np.maximum else np.inf
+    padding = np.full((len(values), 1), identity)
+    return np.concatenate([reversed_accumulation, padding], axis=1)
+
+
+class InsertionQuoter:
+    """Quote insertions into a plan holding one route per vehicle."""
+
+    def __init__(self, router_or_evaluator, plan: List[Route]):
+        if isinstance(router_or_evaluator, RouteEvaluator):
+            self.evaluator = router_or_evaluator
+        else:
+            self.evaluator = RouteEvaluator(router_or_evaluator)
+        self.set_plan(plan)
+
+    def set_plan(self, plan: List[Route]):
+        """Replace the live plan, the routes include their start and end nodes."""
+        if len(plan) != self.evaluator.num_vehicles:
+            raise ValueError("A plan needs a route for every vehicle.")
+        self.plan = [list(route) for route in plan]
+        self._nodes, self._lengths = _pad_routes(self.plan)
+        evaluation = self.evaluator.evaluate(self.plan)
+
+        width = self._nodes.shape[1]
+        self._arc_mask = np.arange(1, width) < self._lengths[:, None]
+        self._cumuls = evaluation.cumuls
+        self._suffix_max = {
+            name: _suffix(cumul, np.maximum) for name, cumul in self._cumuls.items()
+        }
+        self._suffix_min = {
+            name: _suffix(cumul, np.minimum) for name, cumul in self._cumuls.items()
+        }
+
+    def quote(self, nodes: Sequence[Node]) -> InsertionQuotes:
+        """Quote the cheapest feasible insertion of every node, in one batch."""
+        evaluator = self.evaluator
+        nodes = np.asarray(nodes, np.intp)
+        queried = nodes[:, None, None]
+        from_nodes = self._nodes[None, :, :-1]
+        to_nodes = self._nodes[None, :, 1:]
+        # Cost matrix of every vehicle, indexed in place rather than copied.
+        class_axis = evaluator.vehicle_arc_cost_class[None, :, None]
+        arc_costs = evaluator.arc_costs
+
+        removed = arc_costs[class_axis, from_nodes, to_nodes]
+        removed = np.where((self._lengths <= 2)[None, :, None], 0, removed)
+        delta = (
+            arc_costs[class_axis, from_nodes, queried]
+            + arc_costs[class_axis, queried, to_nodes]
+            - removed
+        ).astype(float)
+        feasible = np.broadcast_to(self._arc_mask, delta.shape).copy()
+
+        for name, transits in evaluator.dimension_transits.items():
+            cumul = self._cumuls[name][None, :, :-1]
+            to_queried = transits[from_nodes, queried]
+            shift = (
+                to_queried
+                + transits[queried, to_nodes]
+                - transits[from_nodes, to_nodes]
+            )
+            capacity = evaluator.dimension_capacities[name][None, :, None]
+            arrival = cumul + to_queried
+            later_max = self._suffix_max[name][None, :, 1:-1] + shift
+            later_min = self._suffix_min[name][None, :, 1:-1] + shift
+            feasible &= (arrival <= capacity) & (later_max <= capacity)
+            feasible &= (arrival >= 0) & (later_min >= 0)
+
+        delta[~feasible] = np.inf
+        flat_best = delta.reshape(len(nodes), -1).argmin(axis=1)
+        best_vehicles, best_arcs = np.unravel_index(flat_best, delta.shape[1:])
+        costs = delta[np.arange(len(nodes)), best_vehicles, best_arcs]
+        found = np.isfinite(costs)
+        return InsertionQuotes(
+            nodes,
+            np.where(found, best_vehicles, -1),
+            np.where(found, best_arcs + 1, -1),
+            costs,
+            found,
+        )
+
+    def insert(self, node: Node) -> InsertionQuotes:
+        """Insert node at its cheapest feasible position and return its quote."""
+        quotes = self.quote([node])
+        if not quotes.feasible[0]:
+            raise ValueError("Node {} has no feasible insertion.".format(node))
+        vehicle, position = int(quotes.vehicles[0]), int(quotes.positions[0])
+        plan = [list(route) for route in self.plan]
+        plan[vehicle].insert(position, node)
+        self.set_plan(plan)
+        return quotes
@@ -0,0 +1,188 @@
+"""
+Read problem instances from files and build a RouteOptimizer from them.
+
+An instance is a dict using the same keys as the data models of the ortools
+examples:
+
+- "distance_matrix": square matrix of arc costs (required).
+- "resolution": quantize float distances to integer multiples of it (see
+  ort_simpleroute.quantization), "max_route_distance" is given in original units.
+- "symmetric": if true, keep only the upper triangle of the distance matrix.
+- "num_vehicles" and "depot": fleet size and depot node, 1 and 0 by default.
+- "starts" and "ends": start and end node of every vehicle, used instead of depot.
+- "demands" and "vehicle_capacities": node demands and vehicle capacities, they add
+  a "Capacity" dimension.
+- "pickups_deliveries": list of [pickup, delivery] node pairs.
+- "max_route_distance": adds a "Distance" dimension using the distance matrix,
+  "global_span_cost_coefficient" sets its global span cost.
+- "drop_penalty" or "penalties": allow dropping every non depot node with the same
+  penalty, or with a penalty per node (None or negative entries keep the node
+  mandatory).
+
+Arrays may be given as lists or as numpy arrays, as read from the binary format.
+Integer numpy arrays are registered with the solver as data, so solving them makes
+no Python calls. The solver only handles integers: distances and demands holding
+fractions raise ValueError unless a resolution is given.
+"""
+import csv
+import json
+import os
+from typing import Callable, Dict
+
+import numpy as np
+
+from .binary_format import read_binary
+from .tracing import span
+
+
+def read_json(path: str) -> dict:
+    """Read an instance stored as a json object."""
+    with open(path) as file:
+        return json.load(file)
+
+
+def _number(text: str):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def read_csv(path: str) -> dict:
+    """
+    Read an instance stored as a csv distance matrix, one row per node.
+
+    Rows starting with "#" are ignored, the remaining fields use the defaults.
+    """
+    with open(path, newline="") as file:
+        rows = [
+            list(map(_number, row))
+            for row in csv.reader(file)
+            if row and not row[0].lstrip().startswith("#")
+        ]
+    return {"distance_matrix": rows}
+
+
+_READERS: Dict[str, Callable[[str], dict]] = {
+    ".json": read_json,
+    ".csv": read_csv,
+    ".orsr": read_binary,
+}
+
+
+def instance_extensions():
+    """Return the file extensions read_instance understands."""
+    return tuple(_READERS)
+
+
+def read_instance(path: str) -> dict:
+    """Read an instance choosing the format from the file extension."""
+    extension = os.path.splitext(path)[1].lower()
+    try:
+        reader = _READERS[extension]
+    except KeyError:
+        raise ValueError(
+            "Unknown instance format {!r}, expected one of {}.".format(
+                extension, ", ".join(_READERS)
+            )
+        ) from None
+    with span("load_data", path=path):
+        return reader(path)
+
+
+def _is_integer_array(values) -> bool:
+    return isinstance(values, np.ndarray) and values.dtype.kind in "iu"
+
+
+def _is_float_data(values, name: str) -> bool:
+    """True if values are floats, raise ValueError if they aren't integers."""
+    array = np.asarray(values)
+    if array.dtype.kind != "f":
+        return False
+    if not np.array_equal(array, np.round(array)):
+        raise ValueError(
+            "{} aren't integers, give a resolution to quantize them.".format(name)
+        )
+    return True
+
+
+def optimizer_from_data(data: dict):
+    """Build a RouteOptimizer with the arc costs, dimensions and requests of data."""
+    from .ortools_helpers import RouteOptimizer
+
+    distance_matrix = data["distance_matrix"]
+    num_nodes = len(distance_matrix)
+    depot = data.get("depot", 0)
+    starts, ends = data.get("starts"), data.get("ends")
+    if starts is not None:
+        starts = [int(node) for node in starts]
+    if ends is not None:
+        ends = [int(node) for node in ends]
+    num_vehicles = data.get("num_vehicles", len(starts or ends or [depot]))
+    router = RouteOptimizer(num_nodes, num_vehicles, depot, starts, ends)
+
+    if data.get("symmetric"):
+        from .quantization import SymmetricMatrix
+
+        distance_callback = SymmetricMatrix(distance_matrix, data.get("resolution", 1))
+    elif "resolution" in data:  # Float distances, quantized to integer units.
+        from .quantization import QuantizedMatrix
+
+        distance_callback = QuantizedMatrix(distance_matrix, data["resolution"])
+    elif _is_integer_array(distance_matrix) or _is_float_data(
+        distance_matrix, "Distances"
+    ):
+        from .quantization import QuantizedMatrix
+
+        distance_callback = QuantizedMatrix(distance_matrix)
+    else:
+
+        def distance_callback(from_node, to_node):
+            return distance_matrix[from_node][to_node]
+
+    router.set_global_arc_cost(distance_callback)
+
+    if "demands" in data:
+        demands = data["demands"]
+        if _is_integer_array(demands) or _is_float_data(demands, "Demands"):
+            from .quantization import QuantizedVector
+
+            demand_callback = QuantizedVector(demands)
+        else:
+
+            def demand_callback(node):
+                return demands[node]
+
+        router.add_dimension_w_vehicle_capacity(
+            demand_callback,
+            [int(capacity) for capacity in data["vehicle_capacities"]],
+            "Capacity",
+        )
+
+    if "max_route_distance" in data:
+        max_route_distance = data["max_route_distance"]
+        if "resolution" in data or data.get("symmetric"):
+            max_route_distance = distance_callback.quantize_value(max_route_distance)
+        distance_dimension = router.add_dimension(
+            distance_callback, max_route_distance, "Distance"
+        )
+        if "global_span_cost_coefficient" in data:
+            distance_dimension.SetGlobalSpanCostCoefficient(
+                data["global_span_cost_coefficient"]
+            )
+
+    for pickup, delivery in data.get("pickups_deliveries", ()):
+        router.add_delivery_request(int(pickup), int(delivery))
+
+    if "penalties" in data:
+        penalties = data["penalties"]
+    elif "drop_penalty" in data:
+        penalties = [data["drop_penalty"]] * num_nodes
+    else:
+        penalties = ()
+    for node, penalty in enumerate(penalties):
+        if node in router._route_end_nodes or penalty is None or penalty < 0:
+            continue
+        router.allow_drop_of_node(node, int(penalty))
+
+    return router
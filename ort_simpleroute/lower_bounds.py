@@ -0,0 +1,124 @@
+"""
+Cheap lower bounds of the objective, computed from the data registered.
+
+Both bounds relax the model to its arc costs and drop penalties, the cheapest
+arc cost among vehicles is used for every arc (zero if a vehicle has no arc cost),
+and costs are taken as non-negative. Other objective terms (span costs, soft
+bounds...) only add to the objective, the bounds stay valid when they're present,
+just looser.
+
+spanning tree: the start and end nodes are merged into one root, every route is
+    then a cycle through the root, so the arcs of a solution connect the root with
+    every node visited. Dropped nodes are connected by an edge to the root costing
+    their penalty. The minimum spanning tree of these edges costs no more than any
+    solution.
+assignment: every index has one successor, another index or itself if dropped,
+    and no index is the successor of two. The reduction step of the Hungarian
+    method (subtract row minimums, then column minimums) yields a feasible dual of
+    this assignment problem, whose value bounds the objective.
+
+The gap of a solution is its distance to the best bound, relative to its objective.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+from .arc_pruning import _arc_costs
+
+
+class LowerBound(NamedTuple):
+    """The best bound, as value, and each of the bounds computed."""
+
+    value: int
+    spanning_tree: int
+    assignment: int
+
+
+def _drop_penalties(router, num_nodes: int) -> np.ndarray:
+    """Penalty of dropping every node, infinite for nodes that must be visited."""
+    penalties = np.full(num_nodes, np.inf)
+    for node, penalty in router._drop_penalties.items():
+        penalties[node] = penalty
+    return penalties
+
+
+def _spanning_tree_cost(weights: np.ndarray) -> float:
+    """Cost of a minimum spanning tree of a symmetric weight matrix, Prim's way."""
+    num_nodes = len(weights)
+    in_tree = np.zeros(num_nodes, bool)
+    in_tree[0] = True
+    best = weights[0].copy()  # Cheapest edge linking every node to the tree.
+    total = 0.0
+    for _ in range(num_nodes - 1):
+        best[in_tree] = np.inf
+        node = int(np.argmin(best))
+        total += best[node]
+        in_tree[node] = True
+        np.minimum(best, weights[node], out=best)
+    return total
+
+
+def spanning_tree_bound(
+    costs: np.ndarray, route_ends, drop_penalties: np.ndarray
+) -> int:
+    """Bound from the (from node, to node) costs, see module docs."""
+    costs = np.asarray(costs, np.float64)
+    ends = np.zeros(len(costs), bool)
+    ends[list(route_ends)] = True
+    symmetric = np.minimum(costs, costs.T)
+    others = np.flatnonzero(~ends)
+    weights = np.empty((len(others) + 1, len(others) + 1))
+    weights[1:, 1:] = symmetric[np.ix_(others, others)]
+    to_root = symmetric[np.ix_(others, np.flatnonzero(ends))].min(axis=1)
+    weights[0, 1:] = weights[1:, 0] = np.minimum(to_root, drop_penalties[others])
+    weights[0, 0] = 0
+    return int(_spanning_tree_cost(weights))
+
+
+def assignment_bound(router, costs: np.ndarray) -> int:
+    """Bound from the (from node, to node) costs, see module docs."""
+    model, manager = router.model, router.manager
+    size, num_vehicles = model.Size(), manager.GetNumberOfVehicles()
+    nodes = np.array(
+        [manager.IndexToNode(index) for index in range(size + num_vehicles)]
+    )
+    starts = np.array([model.Start(v) for v in range(num_vehicles)])
+    # Successors are every index but the starts, ends included.
+    successors = np.setdiff1d(np.arange(size + num_vehicles), starts)
+    matrix = np.asarray(costs, np.float64)[np.ix_(nodes[:size], nodes[successors])]
+
+    penalties = _drop_penalties(router, manager.GetNumberOfNodes())
+    rows = np.flatnonzero(np.isin(np.arange(size), successors))
+    columns = np.searchsorted(successors, rows)
+    matrix[rows, columns] = penalties[nodes[rows]]  # Dropping is a loop.
+    # Unused vehicles go straight from start to end, and the solver charges nothing.
+    ends = np.array([model.End(v) for v in range(num_vehicles)])
+    matrix[starts, np.searchsorted(successors, ends)] = 0
+
+    bounds = []
+    for reduced in (matrix, matrix.T):
+        row_minimums = reduced.min(axis=1)
+        column_minimums = (reduced - row_minimums[:, None]).min(axis=0)
+        bounds.append(row_minimums.sum() + column_minimums.sum())
+    return int(max(bounds))
+
+
+def lower_bound(router) -> LowerBound:
+    """Compute the bounds of a RouteOptimizer, see RouteOptimizer.lower_bound."""
+    if any(callback is None for callback in router._arc_cost_callbacks):
+        # A vehicle without arc costs travels every arc for free.
+        num_nodes = router.manager.GetNumberOfNodes()
+        costs = np.zeros((num_nodes, num_nodes), np.int64)
+    else:
+        costs = _arc_costs(router)
+    penalties = _drop_penalties(router, len(costs))
+    spanning_tree = spanning_tree_bound(costs, router._route_end_nodes, penalties)
+    assignment = assignment_bound(router, costs)
+    return LowerBound(max(spanning_tree, assignment), spanning_tree, assignment)
+
+
+def optimality_gap(objective: int, bound: int) -> float:
+    """Distance from objective to bound, relative to objective."""
+    if objective <= bound:
+        return 0.0
+    return (objective - bound) / objective
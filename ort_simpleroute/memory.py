@@ -0,0 +1,113 @@
+"""
+Estimate and release the memory used by route optimizers.
+
+The solver side of a model lives in C++ and can't be measured directly, it's
+estimated from its size with constants measured on closed models (as left by a
+solve) on 64 bit linux. The Python side is measured walking the data referenced by
+the callbacks and registries of a RouteOptimizer.
+"""
+import ctypes
+import ctypes.util
+import os
+import sys
+from types import FunctionType, MethodType, ModuleType
+from typing import Dict
+
+# Bytes of any closed model, per routing index, and added per dimension and
+# disjunction.
+_BYTES_PER_MODEL = 2_300_000
+_BYTES_PER_INDEX = 8500
+_BYTES_PER_DIMENSION_INDEX = 1700
+_BYTES_PER_DISJUNCTION = 1700
+
+
+def _deep_size(obj, seen: set) -> int:
+    """Return the size of obj and the containers, closures and arrays it refers to."""
+    if id(obj) in seen or isinstance(obj, (ModuleType, type)):
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj, 0)
+
+    referred = ()
+    if isinstance(obj, dict):
+        referred = list(obj.keys()) + list(obj.values())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        referred = obj
+    elif isinstance(obj, FunctionType):
+        cells = obj.__closure__ or ()
+        referred = [cell.cell_contents for cell in cells] + list(obj.__defaults__ or ())
+    elif isinstance(obj, MethodType):
+        referred = (obj.__self__, obj.__func__)
+    elif hasattr(obj, "nbytes") and hasattr(obj, "base"):  # numpy arrays
+        # Views count the array they are taken from, getsizeof covers owned data.
+        referred = () if obj.base is None else (obj.base,)
+    elif hasattr(obj, "__dict__") and not callable(getattr(obj, "this", None)):
+        referred = (vars(obj),)
+
+    return size + sum(_deep_size(item, seen) for item in referred)
+
+
+def memory_footprint(router) -> Dict[str, int]:
+    """
+    Estimate the bytes used by a built RouteOptimizer, by component.
+
+    solver_* entries are estimates of the C++ model, python_data is measured.
+    """
+    model = router.model
+    num_indices = model.Size() + model.vehicles()
+    footprint = {
+        "solver_model": _BYTES_PER_MODEL + num_indices * _BYTES_PER_INDEX,
+        # Matrices and vectors registered as data are copied into the solver.
+        "solver_data": router._callback_manager.native_value_count * 8,
+        "solver_dimensions": (
+            len(model.GetAllDimensionNames()) * num_indices * _BYTES_PER_DIMENSION_INDEX
+        ),
+        "solver_disjunctions": model.GetNumberOfDisjunctions() * _BYTES_PER_DISJUNCTION,
+        "python_data": _deep_size(
+            (
+                router._arc_cost_callbacks,
+                router._dimensions,
+                router._delivery_requests,
+                router._drop_penalties,
+                router._time_dependent_matrices,
+                router._fingerprint,
+                router._callback_manager._callback_index_tracker,
+            ),
+            set(),
+        ),
+    }
+    footprint["total"] = sum(footprint.values())
+    return footprint
+
+
+def process_rss() -> int:
+    """Return the resident memory of this process in bytes, or 0 if unknown."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def release_free_memory() -> bool:
+    """
+    Give memory freed by closed models back to the operating system.
+
+    The C allocator keeps freed memory for later reuse, which is fine while models
+    keep being built but keeps the resident size high after a peak. Only glibc
+    supports it, returns False elsewhere.
+    """
+    library = ctypes.util.find_library("c")
+    if library is None:
+        return False
+    malloc_trim = getattr(ctypes.CDLL(library), "malloc_trim", None)
+    if malloc_trim is None:
+        return False
+    malloc_trim(0)
+    return True
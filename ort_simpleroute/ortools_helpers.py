@@ -1,7 +1,9 @@
 """Handy classes and functions to access ortools routing functionalities."""
+import time
+import weakref
 from sys import maxsize
-from typing import Generator, List
-from ortools.constraint_solver import pywrapcp, routing_enums_pb2
+from typing import Generator, List, Optional, Sequence
+from ortools.constraint_solver import pywrapcp
 from ._typing import (
     Manager,
     Model,
@@ -16,14 +18,45 @@ from ._typing import (
 )
 from . import fss_enum as fss
 from ._callback_management import CallbackManager, CallbackTypes
+from ._fingerprint import _ModelFingerprint
+from .solution_cache import SolutionCache
+from .tracing import is_tracing, record_span, span
 
 
-def _make_search_parameters(fss_enum) -> SearchParameters:
+def _make_search_parameters(fss_enum, time_limit=None) -> SearchParameters:
     search_parameters = pywrapcp.DefaultRoutingSearchParameters()
     search_parameters.first_solution_strategy = fss_enum
+    if time_limit is not None:
+        search_parameters.time_limit.FromMilliseconds(int(time_limit * 1000))
     return search_parameters
 
 
+def _add_solution_hook(router, hook, counted: bool = True):
+    """
+    Call hook(router) at every solution found by the searches of router.
+
+    The model keeps its callbacks and the router keeps the model, a callback holding
+    the router, or its model, would make a cycle the garbage collector can't see
+    through the solver: the router is only referred to weakly. Hooks not counted
+    don't make calls_python true, they must return at once when idle.
+    """
+    router_reference = weakref.ref(router)
+
+    def at_solution():
+        alive = router_reference()
+        if alive is not None:
+            hook(alive)
+
+    router.model.AddAtSolutionCallback(at_solution)
+    if counted:
+        router._python_hooks += 1
+
+
+def _record_solution_time(router):
+    if is_tracing():
+        router._solution_times.append(time.time())
+
+
 _add_dimension_error = RuntimeError(
     "Failed to add dimension, " + "is possible that the name provided is already used."
 )
@@ -32,23 +65,73 @@ _add_dimension_error = RuntimeError(
 class RouteOptimizer:
     """Enclose the routing manager, model, and functions that alter their state."""
 
-    def __init__(self, num_nodes: int, num_vehicles: int = 1, depot: int = 0):
-        self.manager: Manager = pywrapcp.RoutingIndexManager(
-            num_nodes, num_vehicles, depot
-        )
-        self.model: Model = pywrapcp.RoutingModel(self.manager)
+    def __init__(
+        self,
+        num_nodes: int,
+        num_vehicles: int = 1,
+        depot: int = 0,
+        starts: Optional[List[Node]] = None,
+        ends: Optional[List[Node]] = None,
+    ):
+        """
+        Create the manager and model for the nodes and vehicles given.
+
+        Every vehicle starts and ends its route at depot, unless the start and end
+        node of every vehicle are given with starts and ends (one defaults to the
+        other if only one is given). Start and end nodes may be shared by vehicles.
+        """
+        if starts is None and ends is None:
+            starts = ends = [depot] * num_vehicles
+        starts = list(ends if starts is None else starts)
+        ends = list(starts if ends is None else ends)
+        if len(starts) != num_vehicles or len(ends) != num_vehicles:
+            raise ValueError("starts and ends need one node per vehicle.")
+        with span("build_model", nodes=num_nodes, vehicles=num_vehicles):
+            self.manager: Manager = pywrapcp.RoutingIndexManager(
+                num_nodes, num_vehicles, starts, ends
+            )
+            self.model: Model = pywrapcp.RoutingModel(self.manager)
+        self._route_end_nodes = frozenset(starts + ends)
 
         self._callback_manager = CallbackManager(self.model, self.manager)
 
         self._deliveries_enabled = False
         self._cumul_dim = None  # Defined to a dimension when deliveries enabled
 
+        self._fingerprint = _ModelFingerprint(num_nodes)
+        self._fingerprint.update("init", num_nodes, num_vehicles, starts, ends)
+
+        # Data registered through this class, for solver free analysis of the model.
+        self._arc_cost_callbacks = [None] * num_vehicles
+        self._dimensions = dict()  # name -> (callback, vehicle capacities)
+        self._delivery_requests = []  # (pickup node, delivery node)
+        self._drop_penalties = dict()  # node -> penalty
+        self._time_dependent_matrices = dict()  # dimension name -> matrix
+        self._node_index_table = None  # Built on demand, see time_windows.
+        self._python_hooks = 0  # Python code called by the solver, not callbacks.
+        self._solution_times = None  # Set when a search is traced.
+        self._lower_bound = None  # (fingerprint, LowerBound) computed last.
+        self._solution_gaps = None  # Set when a search is given a gap.
+        self._target_gap = None
+        self._gap_bound = None
+
+    def _node_to_index(self, node: Node) -> Index:
+        """Return the index of a node that isn't the start or end of a vehicle."""
+        if node in self._route_end_nodes:
+            raise ValueError(
+                "Node {} is a start or end node, it has one index per vehicle "
+                "using it.".format(node)
+            )
+        return self.manager.NodeToIndex(node)
+
     def set_global_arc_cost(self, distance_callback):
         transit_callback_index = self._callback_manager.callback_to_index(
             distance_callback,
             require_type=CallbackTypes.TRANSIT
         )
         self.model.SetArcCostEvaluatorOfAllVehicles(transit_callback_index)
+        self._fingerprint.update("global_arc_cost", distance_callback)
+        self._arc_cost_callbacks = [distance_callback] * len(self._arc_cost_callbacks)
 
     def set_vehicle_arc_cost(self, distance_callback, vehicle_num: int):
         transit_callback_index = self._callback_manager.callback_to_index(
@@ -56,6 +139,8 @@ class RouteOptimizer:
             require_type=CallbackTypes.TRANSIT
         )
         self.model.SetArcCostEvaluatorOfVehicle(transit_callback_index, vehicle_num)
+        self._fingerprint.update("vehicle_arc_cost", distance_callback, vehicle_num)
+        self._arc_cost_callbacks[vehicle_num] = distance_callback
 
     def add_dimension(
         self,
@@ -66,15 +151,28 @@ class RouteOptimizer:
         fix_start_cumul_to_zero: bool = True,
     ):
         """https://developers.google.com/optimization/reference/python/constraint_solver/pywrapcp#adddimension"""
-        callback_index = self._callback_manager.callback_to_index(callback)
-        success = self.model.AddDimension(
-            callback_index,
-            slack_max,  # capacity slack
-            capacity,  # max capacity of all vehicles
-            fix_start_cumul_to_zero,  # start cumul to zero
-            name,
-        )
+        with span("add_dimension", dimension=name):
+            callback_index = self._callback_manager.callback_to_index(callback)
+            success = self.model.AddDimension(
+                callback_index,
+                slack_max,  # capacity slack
+                capacity,  # max capacity of all vehicles
+                fix_start_cumul_to_zero,  # start cumul to zero
+                name,
+            )
         if success:
+            self._fingerprint.update(
+                "dimension",
+                callback,
+                capacity,
+                name,
+                slack_max,
+                fix_start_cumul_to_zero,
+            )
+            self._dimensions[name] = (
+                callback,
+                [capacity] * len(self._arc_cost_callbacks),
+            )
             return self.model.GetDimensionOrDie(name)
         raise _add_dimension_error
 
@@ -86,44 +184,275 @@ class RouteOptimizer:
         slack_max=0,
         fix_start_cumul_to_zero: bool = True,
     ):
-        callback_index = self._callback_manager.callback_to_index(callback)
-        success = self.model.AddDimensionWithVehicleCapacity(
-            callback_index,
-            slack_max,  # capacity slack
-            vehicle_capacities,  # vehicle maximum capacities
-            fix_start_cumul_to_zero,  # start cumul to zero
-            name,
-        )
+        with span("add_dimension", dimension=name):
+            callback_index = self._callback_manager.callback_to_index(callback)
+            success = self.model.AddDimensionWithVehicleCapacity(
+                callback_index,
+                slack_max,  # capacity slack
+                vehicle_capacities,  # vehicle maximum capacities
+                fix_start_cumul_to_zero,  # start cumul to zero
+                name,
+            )
         if success:
+            self._fingerprint.update(
+                "dimension_w_vehicle_capacity",
+                callback,
+                list(vehicle_capacities),
+                name,
+                slack_max,
+                fix_start_cumul_to_zero,
+            )
+            self._dimensions[name] = (callback, list(vehicle_capacities))
             return self.model.GetDimensionOrDie(name)
         raise _add_dimension_error
 
-    def solve_using_fss(self, fss_enum):
-        search_parameters = _make_search_parameters(fss_enum)
-        return self.model.SolveWithParameters(search_parameters)
+    def add_capacity_dimensions(
+        self,
+        demands,
+        vehicle_capacities,
+        names: Sequence[str],
+        slack_max=0,
+        fix_start_cumul_to_zero: bool = True,
+        resolution=None,
+    ) -> List:
+        """
+        Add a capacity dimension per commodity, like weight, volume and pallets.
+
+        demands is a (nodes, commodities) array, vehicle_capacities a (vehicles,
+        commodities) array, or a (commodities,) one shared by every vehicle. Demands
+        are registered with the solver as data, commodities with the same demands
+        share it, so the search makes no Python calls for them. Returns the
+        dimensions, in the order of names.
+
+        Without resolution demands and capacities must be integers. Otherwise they
+        are divided by it, one value or one per commodity, demands rounded up and
+        capacities down, so no load accepted exceeds the real capacity; slack_max is
+        given in these units.
+        """
+        import numpy as np
+
+        from .quantization import QuantizedVector
+
+        num_nodes = self.manager.GetNumberOfNodes()
+        num_vehicles = self.manager.GetNumberOfVehicles()
+        demands = np.asarray(demands)
+        if demands.ndim != 2 or demands.shape != (num_nodes, len(names)):
+            raise ValueError("demands needs a (nodes, commodities) array.")
+        capacities = np.asarray(vehicle_capacities)
+        if capacities.shape not in ((len(names),), (num_vehicles, len(names))):
+            raise ValueError(
+                "vehicle_capacities needs a (vehicles, commodities) array."
+            )
+        if resolution is None:
+            for values, argument in ((demands, "demands"), (capacities, "capacities")):
+                if values.dtype.kind not in "iu" and (np.mod(values, 1) != 0).any():
+                    raise ValueError(
+                        "{} aren't integers, give a resolution.".format(argument)
+                    )
+            resolutions = np.ones(len(names))
+            capacities = capacities.astype(np.int64)
+        else:
+            resolutions = np.broadcast_to(np.asarray(resolution, float), len(names))
+            # The epsilon keeps exact multiples, like 0.3 / 0.1, from rounding away.
+            capacities = np.floor(capacities / resolutions + 1e-9).astype(np.int64)
+            demands = np.ceil(demands / resolutions - 1e-9) * resolutions
+        capacities = np.broadcast_to(capacities, (num_vehicles, len(names)))
+
+        callbacks = dict()  # (demand bytes, resolution) -> callback
+        dimensions = []
+        for column, name in enumerate(names):
+            values = np.ascontiguousarray(demands[:, column])
+            key = (values.tobytes(), resolutions[column])
+            if key not in callbacks:
+                callbacks[key] = QuantizedVector(values, resolutions[column])
+            dimensions.append(
+                self.add_dimension_w_vehicle_capacity(
+                    callbacks[key],
+                    capacities[:, column].tolist(),
+                    name,
+                    slack_max,
+                    fix_start_cumul_to_zero,
+                )
+            )
+        return dimensions
+
+    def fingerprint(self, search_parameters: Optional[SearchParameters] = None) -> str:
+        """
+        Return a canonical hash of the problem and, if given, the search parameters.
+
+        Only the building steps made through this class are accounted for, changes
+        made directly to model or to the dimensions returned are not.
+
+        Python callbacks are evaluated over every node pair, the first time only,
+        which costs as much as a search would on large models. Give them a data_key
+        attribute, a value naming their data (a version, a file hash...), and it is
+        hashed instead; data backed callbacks, see quantization, are hashed from
+        their arrays.
+        """
+        if search_parameters is None:
+            return self._fingerprint.hexdigest()
+        return self._fingerprint.hexdigest(
+            search_parameters.SerializeToString(deterministic=True)
+        )
+
+    def _search(self, run):
+        """Run a search, tracing the times to its first and last solutions."""
+        if self._solution_times is not None:
+            del self._solution_times[:]
+        if not is_tracing():
+            return run()
+        if self._solution_times is None:
+            # Solvers can't remove callbacks, the hook records nothing once untraced.
+            self._solution_times = []
+            _add_solution_hook(self, _record_solution_time, counted=False)
+        with span("solve") as solve_span:
+            start = time.time()
+            solution = run()
+            end = time.time()
+        if self._solution_times:
+            first = self._solution_times[0]
+            record_span("first_solution", start, first - start, solve_span.span_id)
+            record_span("local_search", first, end - first, solve_span.span_id)
+        return solution
+
+    def lower_bound(self):
+        """
+        Return cheap lower bounds of the objective, see ort_simpleroute.lower_bounds.
+
+        They're computed from the arc costs and drop penalties registered, once for
+        every state of the model.
+        """
+        from .lower_bounds import lower_bound
+
+        fingerprint = self.fingerprint()
+        if self._lower_bound is None or self._lower_bound[0] != fingerprint:
+            with span("lower_bound"):
+                self._lower_bound = (fingerprint, lower_bound(self))
+        return self._lower_bound[1]
+
+    def optimality_gap(self, solution) -> float:
+        """Distance from the objective of solution to the lower bound, relative."""
+        from .lower_bounds import optimality_gap
+
+        return optimality_gap(solution.ObjectiveValue(), self.lower_bound().value)
+
+    @property
+    def solution_gaps(self) -> List:
+        """(objective, gap) of every solution found by the last search given a gap."""
+        return list(self._solution_gaps or ())
+
+    def _watch_gap(self, gap: Optional[float]):
+        """Record the gap of every solution, and stop the search once gap is met."""
+        if gap is None and self._solution_gaps is None:
+            return
+        from .lower_bounds import optimality_gap
+
+        if self._solution_gaps is None:
+            self._solution_gaps = []
+
+            def at_solution(router):
+                objective = router.model.CostVar().Value()
+                reached = optimality_gap(objective, router._gap_bound)
+                router._solution_gaps.append((objective, reached))
+                if router._target_gap is not None and reached <= router._target_gap:
+                    router.model.solver().FinishCurrentSearch()
+
+            _add_solution_hook(self, at_solution)
+        del self._solution_gaps[:]
+        self._gap_bound = self.lower_bound().value
+        self._target_gap = gap
+
+    def _solve(
+        self,
+        search_parameters,
+        cache: Optional[SolutionCache] = None,
+        pool=None,
+        gap: Optional[float] = None,
+    ):
+        if pool is not None:
+            pool.attach(self)
+        self._watch_gap(gap)
+        if cache is None:
+            return self._search(
+                lambda: self.model.SolveWithParameters(search_parameters)
+            )
+
+        key = self.fingerprint(search_parameters)
+        if gap is not None:
+            key = self._fingerprint.hexdigest(
+                search_parameters.SerializeToString(deterministic=True), "gap", gap
+            )
+        routes = cache.get(key)
+        if routes is not None:
+            return self.model.ReadAssignmentFromRoutes(
+                [list(map(self._node_to_index, route)) for route in routes], True
+            )
+        solution = self._search(
+            lambda: self.model.SolveWithParameters(search_parameters)
+        )
+        if solution:
+            cache.put(key, solution_routes(self, solution))
+        return solution
+
+    def solve_using_fss(
+        self,
+        fss_enum,
+        cache: Optional[SolutionCache] = None,
+        time_limit=None,
+        pool=None,
+        gap: Optional[float] = None,
+    ):
+        """
+        Solve using a first solution strategy from fss_enum.
+
+        If a cache is given, the routes of a previously solved identical problem are
+        reused instead of searching again. time_limit is given in seconds. If a
+        SolutionPool is given, it keeps the best distinct solutions met by the search.
+        If a gap is given, the search stops at the first solution whose optimality
+        gap, see lower_bound, is at most gap (0.01 for 1%).
+        """
+        search_parameters = _make_search_parameters(fss_enum, time_limit)
+        return self._solve(search_parameters, cache, pool, gap)
 
-    def optimize_solution(self, initial_solution, time_limit=None, solution_limit=None):
+    def optimize_solution(
+        self,
+        initial_solution,
+        time_limit=None,
+        solution_limit=None,
+        pool=None,
+        gap: Optional[float] = None,
+    ):
         search_parameters = pywrapcp.DefaultRoutingSearchParameters()
         if time_limit is not None:
             search_parameters.time_limit.seconds = time_limit
         if solution_limit is not None:
             search_parameters.solution_limit = solution_limit
 
-        return self.model.SolveFromAssignmentWithParameters(
-            initial_solution, search_parameters
+        if pool is not None:
+            pool.attach(self)
+        self._watch_gap(gap)
+        return self._search(
+            lambda: self.model.SolveFromAssignmentWithParameters(
+                initial_solution, search_parameters
+            )
         )
 
     def _enable_deliveries(self):
         if self._deliveries_enabled:
             return
-        self._cumul_dim = self.add_dimension(lambda x, y: 1, maxsize, "_cumul")
+        from .quantization import QuantizedVector
+
+        ones = QuantizedVector([1] * self.manager.GetNumberOfNodes())
+        self._cumul_dim = self.add_dimension(ones, maxsize, "_cumul")
         self._deliveries_enabled = True
 
     def add_delivery_request(self, from_node, to_node):
         self._enable_deliveries()
-        pickup_index = self.manager.NodeToIndex(from_node)
-        delivery_index = self.manager.NodeToIndex(to_node)
+        pickup_index = self._node_to_index(from_node)
+        delivery_index = self._node_to_index(to_node)
         self.model.AddPickupAndDelivery(pickup_index, delivery_index)
+        self._fingerprint.update("delivery_request", from_node, to_node)
+        self._delivery_requests.append((from_node, to_node))
         self.model.solver().Add(
             self.model.VehicleVar(pickup_index) == self.model.VehicleVar(delivery_index)
         )
@@ -133,14 +462,193 @@ class RouteOptimizer:
         )
 
     def allow_drop_of_node(self, node, penalty):
-        self.model.AddDisjunction([self.manager.NodeToIndex(node)], penalty)
+        self.model.AddDisjunction([self._node_to_index(node)], penalty)
+        self._fingerprint.update("drop", node, penalty)
+        self._drop_penalties[node] = penalty
+
+    def add_time_dependent_dimension(
+        self,
+        matrix,
+        capacity: int,
+        name: str,
+        slack_max: int = 0,
+        fix_start_cumul_to_zero: bool = True,
+    ):
+        """
+        Add a dimension whose transits depend on the cumul at departure.
+
+        matrix is a TimeDependentMatrix, see ort_simpleroute.time_dependent.
+        slack_max is the waiting time allowed at every node.
+        """
+        from .time_dependent import add_time_dependent_dimension
+
+        dimension = add_time_dependent_dimension(
+            self, matrix, capacity, name, slack_max, fix_start_cumul_to_zero
+        )
+        self._python_hooks += 1
+        self._fingerprint.update(
+            "time_dependent",
+            name,
+            matrix,
+            matrix.bucket_width,
+            matrix.start,
+            matrix.interpolate,
+            capacity,
+            slack_max,
+            fix_start_cumul_to_zero,
+        )
+        self._time_dependent_matrices[name] = matrix
+        return dimension
+
+    def lock_route_prefixes(self, prefixes: Sequence[Sequence[Node]]):
+        """
+        Fix the first nodes visited by every vehicle, given one sequence per vehicle.
+
+        The successors of the locked nodes are removed from the search, which only
+        decides how each route continues after its prefix and the remaining nodes.
+        """
+        if len(prefixes) != self.model.vehicles():
+            raise ValueError("prefixes needs one sequence of nodes per vehicle.")
+        prefixes = [list(map(int, prefix)) for prefix in prefixes]
+        locked = [node for prefix in prefixes for node in prefix]
+        if len(set(locked)) != len(locked):
+            raise ValueError("A node can't be locked more than once.")
+        arcs = []
+        for vehicle, prefix in enumerate(prefixes):
+            indices = [self.model.Start(vehicle)]
+            indices += map(self._node_to_index, prefix)
+            for index, following in zip(indices, indices[1:]):
+                if not self.model.NextVar(index).Contains(following):
+                    raise ValueError(
+                        "The prefix of vehicle {} uses a pruned arc, lock prefixes "
+                        "before pruning arcs.".format(vehicle)
+                    )
+                arcs.append((index, following))
+        for index, following in arcs:
+            self.model.NextVar(index).SetValue(following)
+        self._fingerprint.update("locked_prefixes", *map(tuple, prefixes))
+
+    def add_time_windows(
+        self, dimension_name: str, nodes, earliest, latest, penalties=None
+    ):
+        """
+        Restrict the cumul of a dimension at every node given to its window.
+
+        nodes, earliest and latest are arrays (or scalars for earliest and latest)
+        of the same length. Windows are hard unless penalties, per node or for all,
+        are given: then each unit of cumul before earliest or after latest costs
+        the penalty of the node instead.
+        """
+        from .time_windows import add_time_windows
+
+        add_time_windows(self, dimension_name, nodes, earliest, latest, penalties)
+        self._fingerprint.update(
+            "time_windows", dimension_name, nodes, earliest, latest, penalties
+        )
+
+    def add_vehicle_shifts(self, dimension_name: str, earliest, latest, penalties=None):
+        """
+        Make every vehicle start and end its route within its shift.
+
+        earliest and latest hold one value per vehicle, or one for all. With
+        penalties starting early or ending late is allowed at that cost per unit.
+        """
+        from .time_windows import add_vehicle_shifts
+
+        add_vehicle_shifts(self, dimension_name, earliest, latest, penalties)
+        self._fingerprint.update(
+            "vehicle_shifts", dimension_name, earliest, latest, penalties
+        )
+
+    def prune_arcs(self, k: Optional[int] = None, radius: Optional[Distance] = None):
+        """
+        Keep only the k cheapest successors of every node, or those within radius.
+
+        Call it once the arc costs and delivery requests are set. Returns an
+        ArcPruning, see ort_simpleroute.arc_pruning.
+        """
+        from .arc_pruning import prune_arcs
+
+        pruning = prune_arcs(self, k, radius)
+        self._fingerprint.update("prune_arcs", k, radius)
+        return pruning
+
+    def check_feasibility(self, raise_error: bool = False):
+        """
+        Look for reasons the problem has no solution, before solving it.
+
+        Returns a FeasibilityReport, see ort_simpleroute.feasibility, or raises
+        InfeasibleProblem if raise_error and an issue is found.
+        """
+        from .feasibility import InfeasibleProblem, check_feasibility
+
+        with span("check_feasibility"):
+            report = check_feasibility(self)
+        if raise_error and not report.feasible:
+            raise InfeasibleProblem(report)
+        return report
+
+    @property
+    def calls_python(self) -> bool:
+        """
+        Tell if solving calls Python code, callbacks not registered as data or hooks.
+
+        Models that don't can be solved concurrently on threads, see solve_executor.
+        """
+        return bool(self._callback_manager.python_callback_count or self._python_hooks)
+
+    def close(self):
+        """
+        Release the solver, the callbacks and every piece of data registered.
+
+        Solutions obtained before belong to the released model, they must not be
+        used afterwards. Closing an already closed RouteOptimizer does nothing.
+        """
+        if self.closed:
+            return
+        # The model refers to the manager, so it's released first.
+        for name in ("_callback_manager", "_cumul_dim", "model", "manager"):
+            delattr(self, name)
+        self.__dict__.clear()
+        self._closed = True
+
+    @property
+    def closed(self) -> bool:
+        return self.__dict__.get("_closed", False)
+
+    def __getattr__(self, name):
+        if self.__dict__.get("_closed", False):
+            raise RuntimeError("The RouteOptimizer was closed.")
+        raise AttributeError(
+            "{!r} object has no attribute {!r}".format(type(self).__name__, name)
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
 
 
 def solution_sequence(
-    rmod: RouteOptimizer, solution: Solution
+    rmod: RouteOptimizer, solution: Solution, vehicle: int = 0
 ) -> Generator[Node, None, None]:
-    index = rmod.model.Start(0)
+    index = rmod.model.Start(vehicle)
     while not rmod.model.IsEnd(index):
         yield rmod.manager.IndexToNode(index)
         index = solution.Value(rmod.model.NextVar(index))
     yield rmod.manager.IndexToNode(index)
+
+
+def solution_routes(rmod: RouteOptimizer, solution: Solution) -> List[List[Node]]:
+    """Return the nodes visited by each vehicle, without its start and end nodes."""
+    routes = []
+    with span("extract_routes"):
+        for vehicle in range(rmod.manager.GetNumberOfVehicles()):
+            index = solution.Value(rmod.model.NextVar(rmod.model.Start(vehicle)))
+            route = []
+            while not rmod.model.IsEnd(index):
+                route.append(rmod.manager.IndexToNode(index))
+                index = solution.Value(rmod.model.NextVar(index))
+            routes.append(route)
+    return routes
@@ -0,0 +1,131 @@
+"""
+Re-optimize part of a plan, leaving the rest of it untouched.
+
+The vehicles chosen, and the nodes they visit, form a reduced model built from the
+matrices of a RouteEvaluator: arc costs, dimensions (as capacity dimensions without
+slack, as the evaluator reads them), pickup and delivery requests and drop
+penalties. Constraints set directly on the model, time windows or locks are not
+carried over. The reduced model is solved starting from the current routes of the
+vehicles, so the routes merged back never cost more than before, and the time
+spent depends on the size of the part re-optimized, not on the whole instance.
+"""
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from ._typing import Node, Route
+from .quantization import QuantizedMatrix
+from .route_evaluation import RouteEvaluator
+
+
+def _sub_matrix(matrix: np.ndarray, sub_nodes: np.ndarray) -> QuantizedMatrix:
+    return QuantizedMatrix(matrix[np.ix_(sub_nodes, sub_nodes)])
+
+
+def reoptimize_subset(
+    router,
+    plan: List[Route],
+    vehicles: Iterable[int] = (),
+    nodes: Iterable[Node] = (),
+    fss_enum=None,
+    time_limit: Optional[float] = None,
+    evaluator: Optional[RouteEvaluator] = None,
+) -> Optional[List[Route]]:
+    """
+    Re-optimize the routes of vehicles and of the vehicles visiting nodes.
+
+    plan holds one route per vehicle, including start and end nodes. Nodes the
+    plan doesn't visit may be given too, to try to serve them. Returns the merged
+    plan, or None if the reduced model has no solution. Passing the evaluator of
+    router saves building it for every call.
+    """
+    from . import fss_enum as fss
+    from .ortools_helpers import (
+        RouteOptimizer,
+        _make_search_parameters,
+        solution_sequence,
+    )
+
+    evaluator = evaluator or RouteEvaluator(router)
+    if len(plan) != evaluator.num_vehicles:
+        raise ValueError("A plan needs a route for every vehicle.")
+    serving = {node: v for v, route in enumerate(plan) for node in route[1:-1]}
+    nodes = set(map(int, nodes))
+    if nodes & set(evaluator.route_ends.tolist()):
+        raise ValueError("Start and end nodes can't be re-optimized.")
+    vehicles = set(vehicles) | {serving[n] for n in nodes if n in serving}
+    if not vehicles:
+        raise ValueError("Give the vehicles or nodes to re-optimize.")
+
+    # The two halves of a pair are re-optimized together: with the vehicle serving
+    # the other half, or the other half alone when no vehicle does.
+    while True:
+        free = nodes | {node for v in vehicles for node in plan[v][1:-1]}
+        partner_vehicles = set()
+        for pickup, delivery in evaluator.pairs.tolist():
+            if (pickup in free) != (delivery in free):
+                partner = delivery if pickup in free else pickup
+                if partner in serving:
+                    partner_vehicles.add(serving[partner])
+                else:
+                    free.add(partner)
+        if not partner_vehicles:
+            break
+        vehicles |= partner_vehicles
+    vehicles = sorted(vehicles)
+    route_ends = [(plan[v][0], plan[v][-1]) for v in vehicles]
+    sub_nodes = np.array(
+        sorted({node for ends in route_ends for node in ends}) + sorted(free), np.intp
+    )
+    position = {node: number for number, node in enumerate(sub_nodes.tolist())}
+
+    sub = RouteOptimizer(
+        len(sub_nodes),
+        len(vehicles),
+        starts=[position[start] for start, _ in route_ends],
+        ends=[position[end] for _, end in route_ends],
+    )
+    arc_costs = dict()  # arc cost class -> reduced matrix
+    for number, vehicle in enumerate(vehicles):
+        cost_class = evaluator.vehicle_arc_cost_class[vehicle]
+        if cost_class not in arc_costs:
+            arc_costs[cost_class] = _sub_matrix(
+                evaluator.arc_costs[cost_class], sub_nodes
+            )
+        sub.set_vehicle_arc_cost(arc_costs[cost_class], number)
+    for name, transits in evaluator.dimension_transits.items():
+        if name == "_cumul":  # Added again by add_delivery_request.
+            continue
+        sub.add_dimension_w_vehicle_capacity(
+            _sub_matrix(transits, sub_nodes),
+            evaluator.dimension_capacities[name][vehicles].tolist(),
+            name,
+        )
+    for pickup, delivery in evaluator.pairs.tolist():
+        if pickup in free:
+            sub.add_delivery_request(position[pickup], position[delivery])
+    for node in sorted(free):
+        penalty = int(evaluator.drop_penalties[node])
+        if penalty >= 0:
+            sub.allow_drop_of_node(position[node], penalty)
+
+    with sub:
+        parameters = _make_search_parameters(
+            fss.AUTOMATIC if fss_enum is None else fss_enum, time_limit
+        )
+        index_routes = [
+            [sub.manager.NodeToIndex(position[node]) for node in plan[v][1:-1]]
+            for v in vehicles
+        ]
+        initial = sub.model.ReadAssignmentFromRoutes(index_routes, True)
+        if initial is not None:
+            solution = sub.model.SolveFromAssignmentWithParameters(initial, parameters)
+        else:
+            solution = sub.model.SolveWithParameters(parameters)
+        if solution is None:
+            return None
+        merged = [list(route) for route in plan]
+        for number, vehicle in enumerate(vehicles):
+            sequence = solution_sequence(sub, solution, number)
+            merged[vehicle] = [int(sub_nodes[node]) for node in sequence]
+    return merged
@@ -0,0 +1,163 @@
+"""
+Integer quantization of float costs and dimension values.
+
+The solver works with integers, float values returned by callbacks are truncated.
+A quantized matrix or vector holds round(value / resolution) in the smallest
+integer type the values fit in (int32 when possible). They are callables taking
+nodes, so they can be used wherever a callback is, and through their node_values
+method RouteOptimizer registers them directly in the solver, without any Python call
+during the search. The solver then holds every value as a 64 bit integer, and while
+registering they are also built as Python integers.
+
+SymmetricMatrix keeps only the upper triangle of symmetric matrices. Registered
+natively the solver still gets the full matrix; with native=False it's registered
+as a transit callback reading the triangle instead, only the triangle is ever held
+but the search calls back into Python for every arc value it needs.
+"""
+from typing import Union
+
+import numpy as np
+
+# Largest total a route may add up to, the solver uses 64 bit integers.
+_MAX_ROUTE_TOTAL = 2**62
+
+
+def _quantize(values, resolution: float, count_per_route: int) -> np.ndarray:
+    if resolution <= 0:
+        raise ValueError("resolution must be positive.")
+    array = np.asarray(values)
+    if array.dtype.kind in "iu" and resolution == 1:
+        quantized = array.astype(np.int64)
+    else:
+        quantized = np.rint(array / resolution)
+        if not np.isfinite(quantized).all():
+            raise ValueError("Values must be finite.")
+    largest = float(np.abs(quantized).max(initial=0))
+    if largest * max(count_per_route, 1) > _MAX_ROUTE_TOTAL:
+        raise OverflowError(
+            "Quantized values up to {:.0f} could overflow the solver, use a larger "
+            "resolution.".format(largest)
+        )
+    integer_type = np.int32 if largest <= np.iinfo(np.int32).max else np.int64
+    return quantized.astype(integer_type)
+
+
+class _Quantized:
+    def __init__(self, values, resolution: float = 1.0, count_per_route=None):
+        self.resolution = resolution
+        if count_per_route is None:
+            count_per_route = len(values)
+        self.values = _quantize(values, resolution, count_per_route)
+
+    def node_values(self) -> np.ndarray:
+        """Return the values of every node, or every pair of nodes."""
+        return self.values
+
+    def quantize_value(self, value: float) -> int:
+        """Convert a value, like a capacity, to the units of this data."""
+        return int(round(value / self.resolution))
+
+    def dequantize(self, value: Union[int, np.ndarray]):
+        """Convert integer results, like an objective, back to the original units."""
+        return value * self.resolution
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes
+
+
+class QuantizedMatrix(_Quantized):
+    """Square matrix of arc values, indexed by (from node, to node)."""
+
+    def __init__(self, values, resolution: float = 1.0):
+        super().__init__(values, resolution)
+        if self.values.ndim != 2 or self.values.shape[0] != self.values.shape[1]:
+            raise ValueError("A QuantizedMatrix needs a square matrix.")
+
+    def __call__(self, from_node, to_node):
+        return int(self.values[from_node, to_node])
+
+
+class QuantizedVector(_Quantized):
+    """Vector of node values, like demands."""
+
+    def __init__(self, values, resolution: float = 1.0):
+        super().__init__(values, resolution)
+        if self.values.ndim != 1:
+            raise ValueError("A QuantizedVector needs a one dimensional sequence.")
+
+    def __call__(self, node):
+        return int(self.values[node])
+
+
+class SymmetricMatrix(_Quantized):
+    """
+    Symmetric matrix of arc values, storing only its upper triangle.
+
+    values holds the rows of the upper triangle, diagonal included, one after the
+    other: about half the memory of the full matrix, with constant time access.
+    native tells how it's registered in the solver, see module docs.
+    """
+
+    def __init__(
+        self,
+        values,
+        resolution: float = 1.0,
+        check: bool = True,
+        native: bool = True,
+    ):
+        matrix = np.asarray(values)
+        if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+            raise ValueError("A SymmetricMatrix needs a square matrix.")
+        if check and not np.array_equal(matrix, matrix.T):
+            raise ValueError("Matrix isn't symmetric.")
+        num_nodes = len(matrix)
+        upper = np.concatenate([matrix[row, row:] for row in range(num_nodes)])
+        self._set_up(upper, resolution, num_nodes, native)
+
+    @classmethod
+    def from_upper_triangle(
+        cls, values, num_nodes: int, resolution: float = 1.0, native: bool = True
+    ):
+        """Build from the rows of the upper triangle, as stored in values."""
+        if len(values) != num_nodes * (num_nodes + 1) // 2:
+            raise ValueError("values doesn't hold the triangle of the nodes given.")
+        matrix = cls.__new__(cls)
+        matrix._set_up(values, resolution, num_nodes, native)
+        return matrix
+
+    def _set_up(self, upper, resolution: float, num_nodes: int, native: bool):
+        super().__init__(upper, resolution, num_nodes)
+        self.num_nodes = num_nodes
+        self.native = native
+        # Position of (row, 0) if rows were complete, (row, column) is column after.
+        self._row_starts = [
+            row * num_nodes - row * (row + 1) // 2 for row in range(num_nodes)
+        ]
+
+    def __call__(self, from_node, to_node):
+        if from_node > to_node:
+            from_node, to_node = to_node, from_node
+        return int(self.values[self._row_starts[from_node] + to_node])
+
+    def rows(self):
+        """Yield the rows of the full matrix, one at a time."""
+        row_starts = np.array(self._row_starts)
+        for row, start in enumerate(self._row_starts):
+            # Left of the diagonal, the row is the column above it.
+            yield np.concatenate(
+                [
+                    self.values[row_starts[:row] + row],
+                    self.values[start + row : start + self.num_nodes],
+                ]
+            )
+
+    def node_values(self) -> np.ndarray:
+        """Return the full matrix, built on demand."""
+        num_nodes = self.num_nodes
+        matrix = np.empty((num_nodes, num_nodes), self.values.dtype)
+        for row, start in enumerate(self._row_starts):
+            values = self.values[start + row : start + num_nodes]
+            matrix[row, row:] = values
+            matrix[row:, row] = values
+        return matrix
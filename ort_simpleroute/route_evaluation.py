@@ -0,0 +1,203 @@
+"""
+Evaluate routes with the data registered in a RouteOptimizer, without the solver.
+
+Routes are node sequences including the start and end nodes of their vehicle, as
+given by solution_sequence. The registered callbacks are evaluated once into
+matrices, then any amount of routes is scored with array operations.
+
+Dimension cumuls are computed without slack and starting at zero, which gives the
+lowest cumul of every visit, a route violates a dimension when a cumul is negative
+or goes above the capacity of its vehicle.
+"""
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from ._callback_management import callback_values
+from ._typing import Route
+
+
+class RouteEvaluation(NamedTuple):
+    """Arrays with one entry (or row, padded with the last value) per route."""
+
+    lengths: np.ndarray
+    costs: np.ndarray
+    cumuls: Dict[str, np.ndarray]
+    loads: Dict[str, np.ndarray]
+    violations: Dict[str, np.ndarray]
+    feasible: np.ndarray
+
+
+class PlanEvaluation(NamedTuple):
+    """Evaluation of a plan, holding one route per vehicle."""
+
+    routes: RouteEvaluation
+    dropped_nodes: np.ndarray
+    drop_penalty: int
+    missing_nodes: np.ndarray  # Not visited nor droppable.
+    violated_pairs: np.ndarray  # Indices of violated pickup and delivery requests.
+    total_cost: int  # Arc costs plus drop penalties, span costs are not included.
+    feasible: bool
+
+
+def _pad_routes(routes: Sequence[Route]):
+    """Return the routes as a padded (route, position) array and their lengths."""
+    lengths = np.fromiter(map(len, routes), np.intp, len(routes))
+    if lengths.min(initial=1) < 1:
+        raise ValueError("Routes must contain at least their start node.")
+    flat = np.concatenate([np.asarray(route, np.intp) for route in routes])
+    rows = np.repeat(np.arange(len(routes)), lengths)
+    starts = np.cumsum(lengths) - lengths
+    columns = np.arange(len(flat)) - np.repeat(starts, lengths)
+    width = lengths.max(initial=1)
+    # Pad every route repeating its last node, so padding arcs are loops.
+    nodes = np.repeat(flat[np.cumsum(lengths) - 1], width).reshape(-1, width)
+    nodes[rows, columns] = flat
+    return nodes, lengths
+
+
+class RouteEvaluator:
+    """Score routes against the data registered in a RouteOptimizer."""
+
+    def __init__(self, router):
+        self.num_nodes = router.manager.GetNumberOfNodes()
+        self.num_vehicles = router.manager.GetNumberOfVehicles()
+
+        matrices = dict()  # callback -> index in self.arc_costs
+        arc_cost_classes = []
+        for callback in router._arc_cost_callbacks:
+            if callback not in matrices:
+                matrices[callback] = len(matrices)
+            arc_cost_classes.append(matrices[callback])
+        self.arc_costs = np.stack([self._transit_matrix(cb) for cb in matrices])
+        self.vehicle_arc_cost_class = np.array(arc_cost_classes, np.intp)
+
+        self.dimension_transits = dict()
+        self.dimension_capacities = dict()
+        for name, (callback, capacities) in router._dimensions.items():
+            self.dimension_transits[name] = self._transit_matrix(callback)
+            self.dimension_capacities[name] = np.asarray(capacities, np.int64)
+
+        self.pairs = np.array(router._delivery_requests, np.intp).reshape(-1, 2)
+        self.drop_penalties = np.full(self.num_nodes, -1, np.int64)
+        for node, penalty in router._drop_penalties.items():
+            self.drop_penalties[node] = penalty
+        self.route_ends = np.array(
+            [
+                router.manager.IndexToNode(index)
+                for vehicle in range(self.num_vehicles)
+                for index in (router.model.Start(vehicle), router.model.End(vehicle))
+            ],
+            np.intp,
+        )
+
+    def _transit_matrix(self, callback) -> np.ndarray:
+        """Evaluate a callback into a (from node, to node) matrix."""
+        if callback is None:
+            return np.zeros((self.num_nodes, self.num_nodes), np.int64)
+        values = np.asarray(callback_values(callback, self.num_nodes), np.int64)
+        if values.ndim == 1:  # Unary callbacks depend on the node left only.
+            values = np.repeat(values[:, None], self.num_nodes, axis=1)
+        return values
+
+    def evaluate(
+        self, routes: Sequence[Route], vehicles: Optional[Sequence[int]] = None
+    ) -> RouteEvaluation:
+        """
+        Evaluate a batch of routes.
+
+        By default the route at position i is driven by vehicle i modulo the fleet
+        size, so several plans can be concatenated into one batch.
+        """
+        nodes, lengths = _pad_routes(routes)
+        if vehicles is None:
+            vehicles = np.arange(len(routes)) % self.num_vehicles
+        vehicles = np.asarray(vehicles, np.intp)
+        from_nodes, to_nodes = nodes[:, :-1], nodes[:, 1:]
+        arc_mask = np.arange(1, nodes.shape[1]) < lengths[:, None]
+
+        classes = self.vehicle_arc_cost_class[vehicles][:, None]
+        arc_costs = self.arc_costs[classes, from_nodes, to_nodes] * arc_mask
+        costs = arc_costs.sum(axis=1)
+        costs[lengths <= 2] = 0  # Like the solver, unused vehicles cost nothing.
+
+        cumuls, loads, violations = dict(), dict(), dict()
+        feasible = np.ones(len(routes), bool)
+        for name, transits in self.dimension_transits.items():
+            arc_transits = transits[from_nodes, to_nodes] * arc_mask
+            cumul = np.zeros(nodes.shape, np.int64)
+            np.cumsum(arc_transits, axis=1, out=cumul[:, 1:])
+            capacities = self.dimension_capacities[name][vehicles]
+            violated = (cumul.max(axis=1) > capacities) | (cumul.min(axis=1) < 0)
+            cumuls[name] = cumul
+            loads[name] = cumul[:, -1]
+            violations[name] = violated
+            feasible &= ~violated
+
+        return RouteEvaluation(lengths, costs, cumuls, loads, violations, feasible)
+
+    def _plan_checks(self, nodes: np.ndarray, lengths: np.ndarray, rows: np.ndarray):
+        """Return dropped, missing nodes and violated pairs of one padded plan."""
+        mask = np.arange(nodes.shape[1]) < lengths[:, None]
+        route_of = np.full(self.num_nodes, -1, np.intp)
+        position_of = np.full(self.num_nodes, -1, np.intp)
+        route_of[nodes[mask]] = np.repeat(rows, lengths)
+        position_of[nodes[mask]] = np.nonzero(mask)[1]
+        route_of[self.route_ends] = -2  # Start and end nodes are never dropped.
+
+        dropped = np.flatnonzero(route_of == -1)
+        missing = dropped[self.drop_penalties[dropped] < 0]
+        pickups, deliveries = self.pairs[:, 0], self.pairs[:, 1]
+        both_dropped = (route_of[pickups] == -1) & (route_of[deliveries] == -1)
+        served = (
+            (route_of[pickups] >= 0)
+            & (route_of[pickups] == route_of[deliveries])
+            & (position_of[pickups] < position_of[deliveries])
+        )
+        violated_pairs = np.flatnonzero(~(both_dropped | served))
+        return dropped, missing, violated_pairs
+
+    def evaluate_plans(self, plans: Sequence[List[Route]]) -> List[PlanEvaluation]:
+        """Evaluate plans (one route per vehicle each) in a single batch."""
+        for plan in plans:
+            if len(plan) != self.num_vehicles:
+                raise ValueError("A plan needs a route for every vehicle.")
+        flat_routes = [route for plan in plans for route in plan]
+        batch = self.evaluate(flat_routes)
+        nodes, _ = _pad_routes(flat_routes)
+
+        evaluations = []
+        for number in range(len(plans)):
+            rows = slice(number * self.num_vehicles, (number + 1) * self.num_vehicles)
+            routes = RouteEvaluation(
+                *(
+                    {key: value[rows] for key, value in field.items()}
+                    if isinstance(field, dict)
+                    else field[rows]
+                    for field in batch
+                )
+            )
+            dropped, missing, violated_pairs = self._plan_checks(
+                nodes[rows], routes.lengths, np.arange(self.num_vehicles)
+            )
+            drop_penalty = int(self.drop_penalties[dropped].clip(min=0).sum())
+            evaluations.append(
+                PlanEvaluation(
+                    routes,
+                    dropped,
+                    drop_penalty,
+                    missing,
+                    violated_pairs,
+                    int(routes.costs.sum()) + drop_penalty,
+                    bool(
+                        routes.feasible.all()
+                        and len(missing) == 0
+                        and len(violated_pairs) == 0
+                    ),
+                )
+            )
+        return evaluations
+
+    def evaluate_plan(self, plan: List[Route]) -> PlanEvaluation:
+        """Evaluate a plan holding one route per vehicle."""
+        return self.evaluate_plans([plan])[0]
@@ -0,0 +1,424 @@
+"""
+Long running solver, to skip process start up, imports and data loading per job.
+
+Requests are json objects posted to /solve, over HTTP on a TCP port or a Unix socket:
+
+    {"instance": PATH}  an instance file, see ort_simpleroute.instances
+    {"data": INSTANCE}  an instance given inline
+    {"template": NAME, "distance": MATRIX, "dimension_data": {NAME: DATA}}
+                        a request for a fleet template registered by name
+
+with optional "strategy" (default AUTOMATIC), "time_limit" in seconds, "overrides"
+of the instance keys and "check": if true, problems found infeasible before solving,
+see ort_simpleroute.feasibility, are answered at once with the reasons and the
+nodes to make droppable. Answers hold the json of the command line solver,
+plus the seconds spent queued; GET /status reports the load of the server.
+
+ortools is imported, and a model solved, before serving. Instance files are read
+once and kept, keyed by path, modification time and size. Matrices and vectors are
+kept as arrays, so models are built from data without Python callbacks. Solves run
+on max_workers threads; up to max_queue more requests wait for one, any other is
+answered 503 at once.
+
+request sends a request with the standard library only, so jobs don't import ortools.
+
+Templates are registered with add_template, or on the command line with
+--template NAME=MODULE:ATTRIBUTE, ATTRIBUTE being a FleetTemplate of the module.
+
+Usage: python -m ort_simpleroute.server [--port PORT | --socket PATH] [options]
+"""
+import argparse
+import http.client
+import importlib
+import json
+import os
+import socket
+import socketserver
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+
+Address = Union[str, Tuple[str, int]]  # Unix socket path, or (host, port).
+
+
+class ServerBusy(Exception):
+    """Every worker is busy and the queue is full."""
+
+
+def _as_arrays(data: dict) -> dict:
+    """Turn the integer matrices and vectors of an instance into arrays."""
+    data = dict(data)
+    for key in ("distance_matrix", "demands", "vehicle_capacities"):
+        if key in data:
+            values = np.asarray(data[key])
+            if values.dtype.kind in "iu":
+                data[key] = values
+    return data
+
+
+class _InstanceCache:
+    """Instances read from files, the least recently used dropped first."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()  # path -> (stamp, data)
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get(self, path: str) -> dict:
+        from .instances import read_instance
+
+        status = os.stat(path)
+        stamp = (status.st_mtime_ns, status.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry[1]
+        # Arrays are copied out of memory mapped files, which may be rewritten while
+        # their instance is cached.
+        data = {
+            key: np.array(value) if isinstance(value, np.ndarray) else value
+            for key, value in _as_arrays(read_instance(path)).items()
+        }
+        with self._lock:
+            self.misses += 1
+            self._entries[path] = (stamp, data)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return data
+
+
+def _template_data(values, name: str):
+    from .quantization import QuantizedMatrix, QuantizedVector
+
+    values = np.asarray(values)
+    if values.ndim == 1:
+        return QuantizedVector(values)
+    if values.ndim == 2:
+        return QuantizedMatrix(values)
+    raise ValueError("{} must be a matrix or a vector.".format(name))
+
+
+class RoutingServer:
+    """Solve requests with warm workers, see module docs."""
+
+    def __init__(
+        self,
+        max_workers: int = 1,
+        max_queue: int = 16,
+        max_instances: int = 64,
+        default_time_limit: Optional[float] = None,
+    ):
+        if max_workers < 1 or max_queue < 0:
+            raise ValueError("Give at least one worker and a non negative queue.")
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.default_time_limit = default_time_limit
+        self.templates: Dict[str, object] = dict()
+        self._instances = _InstanceCache(max_instances)
+        self._executor = ThreadPoolExecutor(max_workers, "ort-simpleroute-worker")
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._pending = self._running = self._solved = self._rejected = 0
+        self._warm_up()
+
+    def _warm_up(self):
+        """Import ortools and start the worker threads with a first solve."""
+        from . import fss_enum as fss
+        from .ortools_helpers import RouteOptimizer
+        from .quantization import QuantizedMatrix
+
+        def solve_tiny():
+            with RouteOptimizer(2) as router:
+                router.set_global_arc_cost(QuantizedMatrix([[0, 1], [1, 0]]))
+                router.solve_using_fss(fss.PATH_CHEAPEST_ARC)
+
+        futures = [self._executor.submit(solve_tiny) for _ in range(self.max_workers)]
+        for future in futures:
+            future.result()
+
+    def add_template(self, name: str, template):
+        """Register a FleetTemplate, for requests naming it."""
+        self.templates[name] = template
+
+    def _router(self, request: dict):
+        from .instances import optimizer_from_data
+
+        if "template" in request:
+            template = self.templates[request["template"]]
+            dimension_data = {
+                name: _template_data(values, name)
+                for name, values in request.get("dimension_data", {}).items()
+            }
+            drop_penalties = {
+                int(node): penalty
+                for node, penalty in request.get("drop_penalties", {}).items()
+            }
+            distance = _template_data(request["distance"], "distance")
+            return template.build(
+                distance,
+                dimension_data,
+                len(distance.node_values()),
+                pickups_deliveries=request.get("pickups_deliveries", ()),
+                drop_penalties=drop_penalties,
+            )
+        if "instance" in request:
+            data = self._instances.get(request["instance"])
+        else:
+            data = _as_arrays(request["data"])
+        overrides = request.get("overrides")
+        if overrides:
+            data = dict(data, **overrides)
+        return optimizer_from_data(data)
+
+    def _solve(self, request: dict, queued: float) -> dict:
+        from . import fss_enum as fss
+        from .ortools_helpers import solution_routes
+
+        start = perf_counter()
+        with self._lock:
+            self._pending -= 1
+            self._running += 1
+        try:
+            strategy = getattr(fss, request.get("strategy", "AUTOMATIC"))
+            time_limit = request.get("time_limit", self.default_time_limit)
+            with self._router(request) as router:
+                report = router.check_feasibility() if request.get("check") else None
+                if report is not None and not report.feasible:
+                    solution = None
+                else:
+                    solution = router.solve_using_fss(strategy, time_limit=time_limit)
+                result = {"solved": bool(solution)}
+                if "instance" in request:
+                    result["instance"] = request["instance"]
+                if report is not None and not report.feasible:
+                    result["infeasible"] = report.messages
+                    result["suggested_drops"] = report.suggested_drops.tolist()
+                if solution:
+                    result["objective"] = solution.ObjectiveValue()
+                    result["routes"] = solution_routes(router, solution)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._solved += 1
+        result["seconds"] = round(perf_counter() - start, 6)
+        result["queued_seconds"] = round(start - queued, 6)
+        return result
+
+    def submit(self, request: dict):
+        """Queue a request, return the future of its answer, raise ServerBusy if full."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise ServerBusy()
+        with self._lock:
+            self._pending += 1
+        future = self._executor.submit(self._solve, request, perf_counter())
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def solve(self, request: dict) -> dict:
+        """Answer a request, waiting for its turn."""
+        return self.submit(request).result()
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queued": self._pending,
+                "solved": self._solved,
+                "rejected": self._rejected,
+                "cached_instances": len(self._instances._entries),
+                "instance_cache_hits": self._instances.hits,
+                "templates": sorted(self.templates),
+            }
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "ort-simpleroute"
+    protocol_version = "HTTP/1.1"
+
+    def _answer(self, code: int, body: dict):
+        encoded = json.dumps(body, separators=(",", ":")).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def do_GET(self):
+        if self.path != "/status":
+            return self._answer(404, {"error": "Unknown path."})
+        self._answer(200, self.server.routing.status())
+
+    def do_POST(self):
+        if self.path != "/solve":
+            return self._answer(404, {"error": "Unknown path."})
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length))
+            if not isinstance(request, dict):
+                raise ValueError("A request must be a json object.")
+            future = self.server.routing.submit(request)
+        except ServerBusy:
+            return self._answer(503, {"error": "Server busy, try again later."})
+        except Exception as error:
+            return self._answer(400, {"error": repr(error)})
+        try:
+            self._answer(200, future.result())
+        except Exception as error:  # Bad request data, found while solving.
+            self._answer(400, {"error": repr(error)})
+
+    def address_string(self):
+        return str(self.client_address or "unix socket")
+
+    def log_message(self, format, *args):
+        pass  # Answers are the log, keep the server quiet.
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_http_server(routing: RoutingServer, address: Address):
+    """Return an HTTP server answering requests with routing, serve_forever it."""
+    if isinstance(address, str):
+        if os.path.exists(address):
+            os.remove(address)  # A socket left by a previous server.
+        server = _UnixHTTPServer(address, _Handler)
+    else:
+        server = ThreadingHTTPServer(address, _Handler)
+        server.daemon_threads = True
+    server.routing = routing
+    return server
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: Optional[float] = None):
+        super().__init__("localhost", timeout=timeout)
+        self._socket_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self._socket_path)
+
+
+def request(address: Address, body: Optional[dict] = None, timeout=None) -> dict:
+    """
+    Send a request to a server, its status if body is None, and return the answer.
+
+    Raises ServerBusy when the server is full, RuntimeError for other errors.
+    """
+    if isinstance(address, str):
+        connection = _UnixHTTPConnection(address, timeout)
+    else:
+        connection = http.client.HTTPConnection(*address, timeout=timeout)
+    try:
+        if body is None:
+            connection.request("GET", "/status")
+        else:
+            connection.request(
+                "POST",
+                "/solve",
+                json.dumps(body),
+                {"Content-Type": "application/json"},
+            )
+        response = connection.getresponse()
+        answer = json.loads(response.read())
+    finally:
+        connection.close()
+    if response.status == 503:
+        raise ServerBusy()
+    if response.status != 200:
+        raise RuntimeError(answer.get("error", response.reason))
+    return answer
+
+
+def _load_template(option: str):
+    """Return (name, template) for a NAME=MODULE:ATTRIBUTE option."""
+    try:
+        name, reference = option.split("=", 1)
+        module_name, attribute = reference.split(":", 1)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "expected NAME=MODULE:ATTRIBUTE, got {!r}".format(option)
+        ) from None
+    try:
+        template = getattr(importlib.import_module(module_name), attribute)
+    except (ImportError, AttributeError) as error:
+        raise argparse.ArgumentTypeError(str(error)) from None
+    return name, template
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m ort_simpleroute.server",
+        description="Solve routing requests posted as json, with warm workers.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("-p", "--port", type=int, default=8765)
+    parser.add_argument("--socket", help="serve on this Unix socket instead")
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=1,
+        help="requests solved at once (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-q",
+        "--queue",
+        type=int,
+        default=16,
+        help="requests waiting for a worker before refusing (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-t", "--time-limit", type=float, help="default time limit per request"
+    )
+    parser.add_argument(
+        "--template",
+        action="append",
+        default=[],
+        type=_load_template,
+        metavar="NAME=MODULE:ATTRIBUTE",
+        help="register a FleetTemplate for requests naming it, may be repeated",
+    )
+    args = parser.parse_args(argv)
+
+    address = args.socket or (args.host, args.port)
+    with RoutingServer(
+        args.workers, args.queue, default_time_limit=args.time_limit
+    ) as routing:
+        for name, template in args.template:
+            routing.add_template(name, template)
+        server = make_http_server(routing, address)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Cache of solved routes keyed by the fingerprint of the problem."""
+import json
+import os
+from collections import OrderedDict
+from typing import List, Optional
+
+from ._typing import Route
+
+
+class SolutionCache:
+    """
+    Keep solved routes in memory and, optionally, in a directory on disk.
+
+    The memory cache holds up to max_entries routes sets and evicts the least
+    recently used one. The disk cache writes one small json file per key and, when
+    its total size grows above max_disk_bytes, removes the least recently used files.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        directory: Optional[str] = None,
+        max_disk_bytes: int = 64 * 2 ** 20,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: OrderedDict = OrderedDict()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".json")
+
+    def _remember(self, key: str, routes: List[Route]):
+        self._memory[key] = routes
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[List[Route]]:
+        """Return the routes stored for key, or None if not present."""
+        routes = self._memory.get(key)
+        if routes is not None:
+            self._memory.move_to_end(key)
+            return routes
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path) as file:
+                routes = json.load(file)
+        except (OSError, ValueError):
+            return None
+        os.utime(path)  # Mark as recently used for the disk eviction.
+        self._remember(key, routes)
+        return routes
+
+    def put(self, key: str, routes: List[Route]):
+        """Store the routes (one node list per vehicle) under key."""
+        routes = [list(map(int, route)) for route in routes]
+        self._remember(key, routes)
+        if self.directory is None:
+            return
+        with open(self._path(key), "w") as file:
+            json.dump(routes, file, separators=(",", ":"))
+        self._evict_disk()
+
+    def _evict_disk(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            stat = os.stat(os.path.join(self.directory, name))
+            entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            os.remove(os.path.join(self.directory, name))
+            total -= size
+
+    def __contains__(self, key: str) -> bool:
+        """Tell if key is stored, without marking it as recently used."""
+        if key in self._memory:
+            return True
+        return self.directory is not None and os.path.exists(self._path(key))
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def clear(self):
+        """Forget every entry, in memory and on disk."""
+        self._memory.clear()
+        if self.directory is None:
+            return
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                os.remove(os.path.join(self.directory, name))
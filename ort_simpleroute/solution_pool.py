@@ -0,0 +1,117 @@
+"""
+Keep the best distinct solutions met during a search.
+
+Every solution the search finds is read as the array of successor indices. Two
+solutions are distinct when the fraction of indices whose successor differs, among
+those visited by either, reaches min_difference. A new solution too close to a kept
+one replaces it only if it's better, so the pool holds the best solution of each
+structurally different region visited by the search.
+
+Greedy descent, the default local search, improves a solution a few arcs at a time
+and mostly ends with a single region; metaheuristics like guided local search, run
+with a time limit, visit several regions of similar cost.
+"""
+import weakref
+from typing import List, NamedTuple, Tuple
+
+import numpy as np
+
+
+class PooledSolution(NamedTuple):
+    """A solution of the pool, routes hold the nodes visited by each vehicle."""
+
+    objective: int
+    routes: Tuple[np.ndarray, ...]
+
+
+def route_difference(nexts: np.ndarray, other: np.ndarray) -> float:
+    """Fraction of the visited indices whose successor differs between solutions."""
+    indices = np.arange(len(nexts))
+    visited = (nexts != indices) | (other != indices)
+    if not visited.any():
+        return 0.0
+    return float(
+        np.count_nonzero((nexts != other) & visited) / np.count_nonzero(visited)
+    )
+
+
+class SolutionPool:
+    """The best size distinct solutions found by the solves of a RouteOptimizer."""
+
+    def __init__(self, size: int = 3, min_difference: float = 0.1):
+        if size < 1:
+            raise ValueError("size must be at least 1.")
+        self.size = size
+        self.min_difference = min_difference
+        self._entries: List[Tuple[int, np.ndarray]] = []  # (objective, nexts)
+        self._router = None
+
+    def attach(self, router):
+        """Collect the solutions found by every later solve of router."""
+        from .ortools_helpers import _add_solution_hook
+
+        attached = None if self._router is None else self._router()
+        if attached is router:
+            return
+        if self._router is not None:
+            raise ValueError("A SolutionPool collects the solutions of one router.")
+        self._router = weakref.ref(router)  # The router's model keeps the pool.
+        model, manager = router.model, router.manager
+        next_vars = [model.NextVar(index) for index in range(model.Size())]
+        self._index_to_node = np.array(
+            [manager.IndexToNode(i) for i in range(manager.GetNumberOfIndices())]
+        )
+        self._starts = [model.Start(v) for v in range(manager.GetNumberOfVehicles())]
+        self._size = model.Size()
+
+        def at_solution(router):
+            # The cost variable only exists once the model is closed.
+            objective = router.model.CostVar().Value()
+            if len(self._entries) == self.size and objective >= self._entries[-1][0]:
+                return
+            nexts = np.fromiter(
+                (var.Value() for var in next_vars), np.int32, self._size
+            )
+            self.offer(objective, nexts)
+
+        _add_solution_hook(router, at_solution)
+
+    def offer(self, objective: int, nexts: np.ndarray):
+        """Consider a solution given as its objective and successor indices."""
+        close = [
+            entry
+            for entry in self._entries
+            if route_difference(nexts, entry[1]) < self.min_difference
+        ]
+        if any(kept_objective <= objective for kept_objective, _ in close):
+            return
+        replaced = set(map(id, close))
+        self._entries = [entry for entry in self._entries if id(entry) not in replaced]
+        self._entries.append((objective, nexts))
+        self._entries.sort(key=lambda entry: entry[0])
+        del self._entries[self.size :]
+
+    def _routes(self, nexts: np.ndarray) -> Tuple[np.ndarray, ...]:
+        routes = []
+        for start in self._starts:
+            indices = []
+            index = int(nexts[start])
+            while index < self._size:
+                indices.append(index)
+                index = int(nexts[index])
+            routes.append(self._index_to_node[indices].astype(np.int32))
+        return tuple(routes)
+
+    @property
+    def solutions(self) -> List[PooledSolution]:
+        """The solutions kept, best first."""
+        return [
+            PooledSolution(objective, self._routes(nexts))
+            for objective, nexts in self._entries
+        ]
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,120 @@
+"""Break down the objective of a solution into its components."""
+from typing import NamedTuple, Tuple
+
+import numpy as np
+
+
+class SolutionReport(NamedTuple):
+    """
+    Components of the objective of a solution, as arrays.
+
+    Dimension arrays have one entry (or row) per name in dimension_names.
+    unaccounted is the part of the objective not explained by the other components,
+    like costs set directly on the model that this report doesn't know about.
+    """
+
+    vehicle_arc_costs: np.ndarray  # (vehicles,)
+    dimension_names: Tuple[str, ...]
+    global_span_costs: np.ndarray  # (dimensions,)
+    vehicle_span_costs: np.ndarray  # (dimensions, vehicles)
+    soft_bound_costs: np.ndarray  # (dimensions,) soft upper plus lower bounds
+    dropped_nodes: np.ndarray
+    dropped_penalties: np.ndarray
+    objective: int
+    unaccounted: int
+
+
+def _next_values(model, solution) -> np.ndarray:
+    """Return the successor of every index, read in a single pass."""
+    return np.fromiter(
+        (solution.Value(model.NextVar(index)) for index in range(model.Size())),
+        np.int64,
+        model.Size(),
+    )
+
+
+def _soft_bound_cost(dimension, index: int, cumul: int) -> int:
+    cost = 0
+    if dimension.HasCumulVarSoftUpperBound(index):
+        excess = cumul - dimension.GetCumulVarSoftUpperBound(index)
+        cost += max(excess, 0) * dimension.GetCumulVarSoftUpperBoundCoefficient(index)
+    if dimension.HasCumulVarSoftLowerBound(index):
+        lack = dimension.GetCumulVarSoftLowerBound(index) - cumul
+        cost += max(lack, 0) * dimension.GetCumulVarSoftLowerBoundCoefficient(index)
+    return cost
+
+
+def solution_report(rmod, solution) -> SolutionReport:
+    """Build the objective breakdown of a solution of a RouteOptimizer."""
+    model, manager = rmod.model, rmod.manager
+    num_vehicles = manager.GetNumberOfVehicles()
+    nexts = _next_values(model, solution)
+
+    vehicle_arc_costs = np.zeros(num_vehicles, np.int64)
+    starts = [model.Start(vehicle) for vehicle in range(num_vehicles)]
+    ends = [model.End(vehicle) for vehicle in range(num_vehicles)]
+    used = np.array([not model.IsEnd(int(nexts[start])) for start in starts])
+    visited = []  # Indices of every visit, start and end of used vehicles included.
+    for vehicle, start in enumerate(starts):
+        if not used[vehicle]:
+            continue
+        index = start
+        while not model.IsEnd(index):
+            visited.append(index)
+            following = int(nexts[index])
+            vehicle_arc_costs[vehicle] += model.GetArcCostForVehicle(
+                index, following, vehicle
+            )
+            index = following
+        visited.append(index)
+
+    dimension_names = tuple(model.GetAllDimensionNames())
+    global_span_costs = np.zeros(len(dimension_names), np.int64)
+    vehicle_span_costs = np.zeros((len(dimension_names), num_vehicles), np.int64)
+    soft_bound_costs = np.zeros(len(dimension_names), np.int64)
+    for number, name in enumerate(dimension_names):
+        dimension = model.GetDimensionOrDie(name)
+        start_cumuls = np.array([solution.Min(dimension.CumulVar(i)) for i in starts])
+        end_cumuls = np.array([solution.Min(dimension.CumulVar(i)) for i in ends])
+        spans = (end_cumuls - start_cumuls) * used
+        coefficients = np.array(
+            [dimension.GetSpanCostCoefficientForVehicle(v) for v in range(num_vehicles)]
+        )
+        vehicle_span_costs[number] = spans * coefficients
+        if used.any():
+            global_span_costs[number] = dimension.global_span_cost_coefficient() * (
+                end_cumuls[used].max() - start_cumuls[used].min()
+            )
+        soft_bound_costs[number] = sum(
+            _soft_bound_cost(dimension, index, solution.Min(dimension.CumulVar(index)))
+            for index in visited
+        )
+
+    is_dropped = nexts == np.arange(len(nexts))
+    dropped_indices = np.flatnonzero(is_dropped)
+    dropped_nodes = np.array(
+        [manager.IndexToNode(int(index)) for index in dropped_indices], np.int64
+    )
+    dropped_penalties = np.array(
+        [model.UnperformedPenalty(int(index)) for index in dropped_indices], np.int64
+    )
+
+    objective = solution.ObjectiveValue()
+    accounted = (
+        vehicle_arc_costs.sum()
+        + global_span_costs.sum()
+        + vehicle_span_costs.sum()
+        + soft_bound_costs.sum()
+        + dropped_penalties.sum()
+    )
+    return SolutionReport(
+        vehicle_arc_costs,
+        dimension_names,
+        global_span_costs,
+        vehicle_span_costs,
+        soft_bound_costs,
+        dropped_nodes,
+        dropped_penalties,
+        objective,
+        int(objective - accounted),
+    )
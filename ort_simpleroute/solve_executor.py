@@ -0,0 +1,179 @@
+"""
+Solve many RouteOptimizers concurrently.
+
+The solver releases the GIL while searching, so models that never call back into
+Python (their costs and dimensions registered as data, see quantization) are solved
+on threads of this process. Models that do call Python would serialize on the GIL,
+they are solved in worker processes when their factory can be pickled, serially
+otherwise.
+
+Routers are given as factories, callables building one RouteOptimizer, so process
+workers can build their own. Factories are called on the worker threads, which
+solve the routers that never call Python and hand the others on: the router built
+is solved as is when serial, built again in a worker process otherwise. Declaring
+the mode of each factory skips that first build. Routers built here are closed once
+solved.
+"""
+import os
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from time import perf_counter, thread_time
+from typing import Callable, List, NamedTuple, Optional, Sequence
+
+from ._typing import Node
+
+THREADS, PROCESSES, SERIAL = "threads", "processes", "serial"
+
+
+class SolveResult(NamedTuple):
+    """Outcome of one solve, objective and routes are None if none was found."""
+
+    objective: Optional[int]
+    routes: Optional[List[List[Node]]]
+    seconds: float
+    cpu_seconds: float  # Of the thread that solved, waiting for a CPU excluded.
+    mode: str
+
+
+class ExecutionReport(NamedTuple):
+    """Results in the order of the factories, and the parallel speedup achieved."""
+
+    results: List[SolveResult]
+    wall_seconds: float
+
+    @property
+    def speedup(self) -> float:
+        """CPU time spent solving over the wall time taken to run every solve."""
+        busy = sum(result.cpu_seconds for result in self.results)
+        return busy / self.wall_seconds if self.wall_seconds else 1.0
+
+
+def _solve(router, fss_enum, time_limit, mode: str, slots=None) -> SolveResult:
+    from .ortools_helpers import solution_routes
+
+    with router, slots or nullcontext():
+        start, cpu_start = perf_counter(), thread_time()
+        solution = router.solve_using_fss(fss_enum, time_limit=time_limit)
+        seconds, cpu_seconds = perf_counter() - start, thread_time() - cpu_start
+        if not solution:
+            return SolveResult(None, None, seconds, cpu_seconds, mode)
+        routes = solution_routes(router, solution)
+        return SolveResult(
+            solution.ObjectiveValue(), routes, seconds, cpu_seconds, mode
+        )
+
+
+def _build_and_solve(
+    factory, fss_enum, time_limit, mode=PROCESSES, slots=None
+) -> SolveResult:
+    return _solve(factory(), fss_enum, time_limit, mode, slots)
+
+
+def _picklable(obj) -> bool:
+    try:
+        pickle.dumps(obj)
+    except Exception:
+        return False
+    return True
+
+
+def _probe_and_solve(factory, fss_enum, time_limit, use_processes: bool, slots):
+    """
+    Build a router and solve it if it calls no Python, return its SolveResult.
+    Otherwise return PROCESSES if it's to be built again in a worker process, else
+    the router, to be solved serially.
+    """
+    router = factory()
+    if not router.calls_python:
+        return _solve(router, fss_enum, time_limit, THREADS, slots)
+    if use_processes and _picklable(factory):
+        router.close()
+        return PROCESSES
+    return router
+
+
+def solve_all(
+    factories: Sequence[Callable],
+    fss_enum,
+    time_limit: Optional[float] = None,
+    max_workers: Optional[int] = None,
+    use_processes: bool = True,
+    modes: Optional[Sequence[str]] = None,
+) -> ExecutionReport:
+    """
+    Build and solve every router, concurrently when possible, see module docs.
+
+    At most max_workers solves run at once, on threads, processes or serially, by
+    default the CPU count.
+    modes, if given, is the mode of every factory: THREADS, PROCESSES or SERIAL.
+    """
+    start = perf_counter()
+    if modes is None:
+        modes = [None] * len(factories)
+    elif len(modes) != len(factories):
+        raise ValueError("Give one mode per factory.")
+    results: List[Optional[SolveResult]] = [None] * len(factories)
+    serial = []  # (number, router built, or None)
+    max_workers = max_workers or os.cpu_count() or 1
+    slots = threading.BoundedSemaphore(max_workers)  # Shared by every solve.
+    processes = None
+    process_futures = dict()
+
+    def solve_in_process(number):
+        nonlocal processes
+        if processes is None:
+            processes = ProcessPoolExecutor(max_workers)
+        slots.acquire()
+        future = processes.submit(
+            _build_and_solve, factories[number], fss_enum, time_limit
+        )
+        future.add_done_callback(lambda _: slots.release())
+        process_futures[number] = future
+
+    try:
+        with ThreadPoolExecutor(max_workers) as threads:
+            thread_futures = dict()
+            for number, (factory, mode) in enumerate(zip(factories, modes)):
+                if mode is None:
+                    future = threads.submit(
+                        _probe_and_solve,
+                        factory,
+                        fss_enum,
+                        time_limit,
+                        use_processes,
+                        slots,
+                    )
+                elif mode == THREADS:
+                    future = threads.submit(
+                        _build_and_solve, factory, fss_enum, time_limit, THREADS, slots
+                    )
+                elif mode == PROCESSES:
+                    solve_in_process(number)
+                    continue
+                elif mode == SERIAL:
+                    serial.append((number, None))
+                    continue
+                else:
+                    raise ValueError("Unknown mode {!r}.".format(mode))
+                thread_futures[future] = number
+            # Routers calling Python are known once built, start their processes then.
+            for future in as_completed(thread_futures):
+                number, outcome = thread_futures[future], future.result()
+                if isinstance(outcome, SolveResult):
+                    results[number] = outcome
+                elif outcome == PROCESSES:
+                    solve_in_process(number)
+                else:
+                    serial.append((number, outcome))
+            for number, router in sorted(serial, key=lambda entry: entry[0]):
+                if router is None:
+                    router = factories[number]()
+                results[number] = _solve(router, fss_enum, time_limit, SERIAL, slots)
+            for number, future in process_futures.items():
+                results[number] = future.result()
+    finally:
+        if processes is not None:
+            processes.shutdown()
+    return ExecutionReport(results, perf_counter() - start)
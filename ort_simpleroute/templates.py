@@ -0,0 +1,198 @@
+"""
+Reusable fleet templates, to build many RouteOptimizers with the same structure.
+
+A template holds what requests for the same fleet share: vehicles, their start and
+end nodes, and the dimensions with their capacities. Each request then only gives
+its data, as matrices, vectors or callbacks of the arity declared by the template.
+
+Per request construction is cheaper than building from scratch: callbacks made from
+data share their code, so their arity is checked once, and the index to node
+translation of the callbacks uses a table built once per amount of nodes instead of
+asking the index manager on every call.
+"""
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from ._callback_management import _argument_count
+from ._typing import Node
+
+_MAX_INDEX_TABLES = 64
+
+
+class _DimensionSpec(NamedTuple):
+    name: str
+    unary: bool
+    capacity: Optional[int]  # Same capacity for every vehicle, or
+    vehicle_capacities: Optional[List[int]]  # one capacity per vehicle.
+    slack_max: int
+    fix_start_cumul_to_zero: bool
+    global_span_cost_coefficient: int
+
+
+def _matrix_callback(matrix):
+    def distance_callback(from_node, to_node):
+        return matrix[from_node][to_node]
+
+    return distance_callback
+
+
+def _vector_callback(vector):
+    def demand_callback(node):
+        return vector[node]
+
+    return demand_callback
+
+
+def _as_callback(data, unary: bool, name: str):
+    """Return data as a callback of the arity required, made from data if needed."""
+    if not callable(data):
+        return _vector_callback(data) if unary else _matrix_callback(data)
+    if _argument_count(data) != (1 if unary else 2):
+        raise ValueError(
+            "{} needs a {} callback.".format(name, "unary" if unary else "transit")
+        )
+    return data
+
+
+class FleetTemplate:
+    """The fleet and dimension structure shared by many requests."""
+
+    def __init__(
+        self,
+        num_vehicles: int = 1,
+        depot: int = 0,
+        starts: Optional[List[Node]] = None,
+        ends: Optional[List[Node]] = None,
+    ):
+        self.num_vehicles = num_vehicles
+        self.depot = depot
+        self.starts = starts
+        self.ends = ends
+        self._dimensions: List[_DimensionSpec] = []
+        self._index_tables: OrderedDict = OrderedDict()  # num_nodes -> table
+
+    def add_dimension(
+        self,
+        name: str,
+        capacity: int,
+        unary: bool = False,
+        slack_max=0,
+        fix_start_cumul_to_zero: bool = True,
+        global_span_cost_coefficient: int = 0,
+    ):
+        """Declare a dimension, built as RouteOptimizer.add_dimension does."""
+        self._add(
+            _DimensionSpec(
+                name,
+                unary,
+                capacity,
+                None,
+                slack_max,
+                fix_start_cumul_to_zero,
+                global_span_cost_coefficient,
+            )
+        )
+
+    def add_dimension_w_vehicle_capacity(
+        self,
+        name: str,
+        vehicle_capacities: List[int],
+        unary: bool = True,
+        slack_max=0,
+        fix_start_cumul_to_zero: bool = True,
+        global_span_cost_coefficient: int = 0,
+    ):
+        """Declare a dimension, built as add_dimension_w_vehicle_capacity does."""
+        if len(vehicle_capacities) != self.num_vehicles:
+            raise ValueError("vehicle_capacities needs one capacity per vehicle.")
+        self._add(
+            _DimensionSpec(
+                name,
+                unary,
+                None,
+                list(vehicle_capacities),
+                slack_max,
+                fix_start_cumul_to_zero,
+                global_span_cost_coefficient,
+            )
+        )
+
+    def _add(self, spec: _DimensionSpec):
+        if any(dimension.name == spec.name for dimension in self._dimensions):
+            raise ValueError("Dimension {!r} already declared.".format(spec.name))
+        self._dimensions.append(spec)
+
+    def _index_table(self, router, num_nodes: int) -> List[Node]:
+        table = self._index_tables.get(num_nodes)
+        if table is None:
+            manager = router.manager
+            table = list(map(manager.IndexToNode, range(manager.GetNumberOfIndices())))
+            self._index_tables[num_nodes] = table
+            while len(self._index_tables) > _MAX_INDEX_TABLES:
+                self._index_tables.popitem(last=False)
+        else:
+            self._index_tables.move_to_end(num_nodes)
+        return table
+
+    def build(
+        self,
+        distance,
+        dimension_data: Optional[Dict[str, object]] = None,
+        num_nodes: Optional[int] = None,
+        pickups_deliveries: Sequence = (),
+        drop_penalties: Optional[Dict[Node, int]] = None,
+    ):
+        """
+        Build a RouteOptimizer for one request.
+
+        distance is the arc cost of every vehicle, a matrix or a transit callback,
+        dimension_data gives a matrix, vector or callback for every dimension
+        declared. num_nodes is only needed when distance is a callback.
+        """
+        from .ortools_helpers import RouteOptimizer
+
+        dimension_data = dimension_data or {}
+        declared = {dimension.name for dimension in self._dimensions}
+        if set(dimension_data) != declared:
+            raise ValueError(
+                "dimension_data must hold exactly the dimensions {}.".format(
+                    sorted(declared)
+                )
+            )
+        if num_nodes is None:
+            num_nodes = len(distance)
+
+        router = RouteOptimizer(
+            num_nodes, self.num_vehicles, self.depot, self.starts, self.ends
+        )
+        router._callback_manager.index_to_node = self._index_table(router, num_nodes)
+        router.set_global_arc_cost(_as_callback(distance, False, "distance"))
+
+        for spec in self._dimensions:
+            callback = _as_callback(dimension_data[spec.name], spec.unary, spec.name)
+            if spec.vehicle_capacities is None:
+                dimension = router.add_dimension(
+                    callback,
+                    spec.capacity,
+                    spec.name,
+                    spec.slack_max,
+                    spec.fix_start_cumul_to_zero,
+                )
+            else:
+                dimension = router.add_dimension_w_vehicle_capacity(
+                    callback,
+                    spec.vehicle_capacities,
+                    spec.name,
+                    spec.slack_max,
+                    spec.fix_start_cumul_to_zero,
+                )
+            if spec.global_span_cost_coefficient:
+                dimension.SetGlobalSpanCostCoefficient(
+                    spec.global_span_cost_coefficient
+                )
+
+        for pickup, delivery in pickups_deliveries:
+            router.add_delivery_request(pickup, delivery)
+        for node, penalty in (drop_penalties or {}).items():
+            router.allow_drop_of_node(node, penalty)
+        return router
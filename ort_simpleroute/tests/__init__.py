@@ -0,0 +1 @@
+"""Tests of the ort_simpleroute features that go beyond the original examples."""
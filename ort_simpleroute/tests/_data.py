@@ -0,0 +1,25 @@
+"""Shared problem data for the tests."""
+from ort_simpleroute.test_examples_same_output._examples.original import (
+    vrp_drop_nodes,
+)
+import ort_simpleroute as hlp
+
+
+def drop_nodes_data():
+    """Return the data of the original drop nodes example."""
+    return vrp_drop_nodes.create_data_model()
+
+
+def drop_nodes_router(data=None):
+    """Build the drop nodes example as a RouteOptimizer."""
+    data = drop_nodes_data() if data is None else data
+    router = hlp.RouteOptimizer(
+        len(data["distance_matrix"]), data["num_vehicles"], data["depot"]
+    )
+    router.set_global_arc_cost(lambda x, y: data["distance_matrix"][x][y])
+    router.add_dimension_w_vehicle_capacity(
+        lambda x: data["demands"][x], data["vehicle_capacities"], "Capacity"
+    )
+    for node in range(1, len(data["distance_matrix"])):
+        router.allow_drop_of_node(node, 1000)
+    return router
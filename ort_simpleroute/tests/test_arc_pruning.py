@@ -0,0 +1,32 @@
+"""Verify arc pruning keeps routes within the candidate arcs."""
+from unittest import TestCase
+
+import numpy as np
+
+import ort_simpleroute as hlp
+from ort_simpleroute.arc_pruning import candidate_arcs
+from ort_simpleroute.tests._data import drop_nodes_router
+
+
+class ArcPruningTestCase(TestCase):
+    def test_candidate_arcs(self):
+        costs = np.array([[0, 1, 5, 9], [1, 0, 2, 7], [5, 2, 0, 3], [9, 7, 3, 0]])
+        nearest = candidate_arcs(costs, k=1)
+        self.assertEqual(nearest.sum(axis=1).tolist(), [1, 1, 1, 1])
+        self.assertTrue(nearest[3, 2])
+        within = candidate_arcs(costs, radius=2)
+        self.assertEqual(within[1].tolist(), [True, False, True, False])
+        self.assertEqual(candidate_arcs(costs, k=1, radius=2).sum(), 5)
+
+    def test_routes_use_candidates_only(self):
+        router = drop_nodes_router()
+        unpruned = drop_nodes_router().fingerprint()
+        pruning = router.prune_arcs(k=4)
+        self.assertGreater(pruning.pruned_fraction, 0.5)
+        self.assertNotEqual(router.fingerprint(), unpruned)
+
+        solution = router.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC)
+        self.assertTrue(solution)
+        for route in hlp.solution_routes(router, solution):
+            for from_node, to_node in zip(route, route[1:]):
+                self.assertTrue(pruning.candidates[from_node, to_node])
@@ -0,0 +1,98 @@
+"""Verify capacity dimensions added per commodity from arrays."""
+from unittest import TestCase
+
+import numpy as np
+
+import ort_simpleroute as hlp
+from ort_simpleroute.tests._data import drop_nodes_data
+
+
+def _router(data):
+    router = hlp.RouteOptimizer(len(data["distance_matrix"]), data["num_vehicles"])
+    router.set_global_arc_cost(hlp.QuantizedMatrix(data["distance_matrix"]))
+    return router
+
+
+def _demand_callback(demands):
+    return lambda node: demands[node]
+
+
+class CapacityDimensionsTestCase(TestCase):
+    def setUp(self):
+        self.data = drop_nodes_data()
+        demands = np.array(self.data["demands"])
+        self.demands = np.stack([demands, 2 * demands, demands], axis=1)
+        capacities = np.array(self.data["vehicle_capacities"])
+        self.capacities = np.stack([capacities, 2 * capacities, capacities], axis=1)
+        self.names = ["Weight", "Volume", "Pallets"]
+
+    def test_same_solution_as_one_call_per_commodity(self):
+        router = _router(self.data)
+        dimensions = router.add_capacity_dimensions(
+            self.demands, self.capacities + 30, self.names
+        )
+        self.assertEqual([d.name() for d in dimensions], self.names)
+        self.assertFalse(router.calls_python)
+        # Weight and pallets share their demands, registered once.
+        callbacks = [router._dimensions[name][0] for name in self.names]
+        self.assertIs(callbacks[0], callbacks[2])
+        self.assertIsNot(callbacks[0], callbacks[1])
+
+        by_hand = _router(self.data)
+        for column, name in enumerate(self.names):
+            by_hand.add_dimension_w_vehicle_capacity(
+                _demand_callback(self.demands[:, column].tolist()),
+                (self.capacities[:, column] + 30).tolist(),
+                name,
+            )
+        solution = router.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC)
+        expected = by_hand.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC)
+        self.assertEqual(
+            hlp.solution_routes(router, solution),
+            hlp.solution_routes(by_hand, expected),
+        )
+
+    def test_shared_capacities_and_shapes(self):
+        router = _router(self.data)
+        dimensions = router.add_capacity_dimensions(
+            self.demands, [100, 200, 100], self.names
+        )
+        self.assertEqual(len(dimensions), 3)
+        self.assertEqual(router._dimensions["Volume"][1], [200] * 4)
+        with self.assertRaises(ValueError):
+            _router(self.data).add_capacity_dimensions(
+                self.demands[:, :2], [100, 200, 100], self.names
+            )
+        with self.assertRaises(ValueError):
+            _router(self.data).add_capacity_dimensions(
+                self.demands, [[100, 200, 100]] * 3, self.names
+            )
+
+    def test_fractional_values_need_a_resolution(self):
+        with self.assertRaises(ValueError):
+            _router(self.data).add_capacity_dimensions(
+                self.demands / 2, [100, 200, 100], self.names
+            )
+        with self.assertRaises(ValueError):
+            _router(self.data).add_capacity_dimensions(
+                self.demands, [100.5, 200, 100], self.names
+            )
+        router = _router(self.data)
+        router.add_capacity_dimensions(
+            self.demands / 2, [7.5, 15, 7.5], self.names, resolution=[0.5, 0.5, 1]
+        )
+        self.assertEqual(router._dimensions["Weight"][1], [15] * 4)
+        self.assertEqual(router._dimensions["Pallets"][1], [7] * 4)
+        weight = router._dimensions["Weight"][0]
+        np.testing.assert_array_equal(weight.node_values(), self.demands[:, 0])
+        self.assertEqual(weight.dequantize(weight(1)), self.demands[1, 0] / 2)
+        # Demands round up and capacities down, a rounded load never overflows.
+        pallets = router._dimensions["Pallets"][0]
+        np.testing.assert_array_equal(
+            pallets.node_values(), np.ceil(self.demands[:, 2] / 2)
+        )
+        router = _router(self.data)
+        router.add_capacity_dimensions(
+            self.demands / 10, [0.3, 0.3, 0.3], self.names, resolution=0.1
+        )
+        self.assertEqual(router._dimensions["Weight"][1], [3] * 4)
@@ -0,0 +1,95 @@
+"""Verify instance files, their binary format and the command line solver."""
+import json
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+import numpy as np
+
+import ort_simpleroute as hlp
+from ort_simpleroute.binary_format import (
+    dumps_binary,
+    loads_binary,
+    read_binary,
+    write_binary,
+)
+from ort_simpleroute.cli import main
+from ort_simpleroute.instances import optimizer_from_data, read_instance
+from ort_simpleroute.tests._data import drop_nodes_data
+
+
+class CommandLineTestCase(TestCase):
+    def setUp(self):
+        self._directory = TemporaryDirectory()
+        self.directory = self._directory.name
+        data = drop_nodes_data()
+        data["drop_penalty"] = 1000
+        with open(os.path.join(self.directory, "drop.json"), "w") as file:
+            json.dump(data, file)
+        data["penalties"] = [None] + [1000] * 16
+        write_binary(os.path.join(self.directory, "drop.orsr"), data)
+        with open(os.path.join(self.directory, "matrix.csv"), "w") as file:
+            file.write("# distances\n0,3,4\n3,0,5\n4,5,0\n")
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_read_csv(self):
+        data = read_instance(os.path.join(self.directory, "matrix.csv"))
+        self.assertEqual(data["distance_matrix"], [[0, 3, 4], [3, 0, 5], [4, 5, 0]])
+
+    def test_float_distances_quantized_or_rejected(self):
+        path = os.path.join(self.directory, "floats.csv")
+        with open(path, "w") as file:
+            file.write("0,3.0,4\n3,0,5.0\n4,5,0\n")
+        data = read_instance(path)
+        solution = optimizer_from_data(data).solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC)
+        self.assertEqual(solution.ObjectiveValue(), 12)
+
+        data["distance_matrix"][0][1] = 2.5
+        with self.assertRaises(ValueError):
+            optimizer_from_data(data)
+        data["resolution"] = 0.5
+        solution = optimizer_from_data(data).solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC)
+        self.assertEqual(solution.ObjectiveValue(), 23)
+
+    def test_solve_directory_in_parallel(self):
+        output = os.path.join(self.directory, "routes.jsonl")
+        main(["-s", "PATH_CHEAPEST_ARC", "-j", "2", "-o", output, self.directory])
+        with open(output) as file:
+            results = {
+                os.path.basename(result["instance"]): result
+                for result in map(json.loads, file)
+            }
+        self.assertEqual(results["drop.json"]["objective"], 7936)
+        self.assertEqual(results["drop.orsr"]["routes"], results["drop.json"]["routes"])
+        self.assertEqual(results["matrix.csv"]["routes"], [[1, 2]])
+
+
+class BinaryFormatTestCase(TestCase):
+    def test_round_trip_uses_compact_types_without_copy(self):
+        data = drop_nodes_data()
+        data["penalties"] = [None, 5] + [70000] * 15
+        encoded = dumps_binary(data)
+        decoded = loads_binary(encoded)
+
+        self.assertEqual(decoded["num_vehicles"], data["num_vehicles"])
+        self.assertEqual(decoded["distance_matrix"].dtype, np.int16)
+        self.assertEqual(decoded["demands"].dtype, np.int8)
+        self.assertEqual(decoded["penalties"].dtype, np.int32)
+        self.assertEqual(decoded["distance_matrix"].tolist(), data["distance_matrix"])
+        self.assertEqual(decoded["penalties"][0], -1)
+        self.assertFalse(decoded["distance_matrix"].flags.owndata)
+
+    def test_rewrite_keeps_mapped_instances_readable(self):
+        data = drop_nodes_data()
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "drop.orsr")
+            write_binary(path, data)
+            mapped = read_binary(path)
+            write_binary(path, {"distance_matrix": [[0]]})
+            self.assertEqual(
+                mapped["distance_matrix"].tolist(), data["distance_matrix"]
+            )
+            self.assertEqual(read_binary(path)["distance_matrix"].tolist(), [[0]])
+            self.assertEqual(os.listdir(directory), ["drop.orsr"])
@@ -0,0 +1,81 @@
+"""Verify pre-solve checks find infeasible problems and the nodes to drop."""
+from unittest import TestCase
+
+import numpy as np
+
+import ort_simpleroute as hlp
+from ort_simpleroute.feasibility import (
+    FLEET_CAPACITY,
+    UNSERVABLE_NODE,
+    UNSERVABLE_PAIR,
+    InfeasibleProblem,
+)
+from ort_simpleroute.tests._data import drop_nodes_data, drop_nodes_router
+
+
+def _line_router(demands, capacities, max_distance=None):
+    """Nodes on a line, node i at position i, the depot being node 0."""
+    positions = np.arange(len(demands))
+    distances = np.abs(positions[:, None] - positions[None, :])
+    router = hlp.RouteOptimizer(len(demands), len(capacities))
+    router.set_global_arc_cost(hlp.QuantizedMatrix(distances))
+    router.add_dimension_w_vehicle_capacity(
+        hlp.QuantizedVector(demands), capacities, "Capacity"
+    )
+    if max_distance is not None:
+        router.add_dimension(hlp.QuantizedMatrix(distances), max_distance, "Distance")
+    return router
+
+
+class FeasibilityTestCase(TestCase):
+    def test_fleet_capacity(self):
+        router = _line_router([0, 4, 3, 2, 1], [5, 2])
+        report = router.check_feasibility()
+        self.assertEqual([issue.kind for issue in report.issues], [FLEET_CAPACITY])
+        self.assertIn("need 10 of Capacity, the fleet holds 7", report.messages[0])
+        self.assertEqual(report.suggested_drops.tolist(), [1])
+        with self.assertRaises(InfeasibleProblem):
+            router.check_feasibility(raise_error=True)
+
+    def test_unreachable_node(self):
+        router = _line_router([0, 1, 1, 1, 1], [10], max_distance=6)
+        report = router.check_feasibility()
+        self.assertEqual([issue.kind for issue in report.issues], [UNSERVABLE_NODE])
+        self.assertEqual(report.issues[0].nodes.tolist(), [4])
+        self.assertIn("Distance needs at least 8", report.messages[0])
+
+        router.allow_drop_of_node(4, 100)
+        self.assertTrue(router.check_feasibility().feasible)
+        self.assertIsNotNone(router.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC))
+
+    def test_pair_too_large_for_every_vehicle(self):
+        demands = [0, 6, -6, 1, -1]
+        router = _line_router(demands, [5, 5])
+        router.add_delivery_request(1, 2)
+        router.add_delivery_request(3, 4)
+        report = router.check_feasibility()
+        self.assertEqual([issue.kind for issue in report.issues], [UNSERVABLE_NODE])
+        self.assertEqual(report.suggested_drops.tolist(), [1, 2])
+
+        # Node 1 is cheap to reach and costly to leave, node 2 the other way round.
+        distances = hlp.QuantizedMatrix([[0, 1, 5], [5, 0, 5], [1, 1, 0]])
+        router = hlp.RouteOptimizer(3, 2)
+        router.set_global_arc_cost(distances)
+        router.add_dimension(distances, 8, "Distance")
+        router.add_delivery_request(2, 1)
+        report = router.check_feasibility()
+        self.assertEqual([issue.kind for issue in report.issues], [UNSERVABLE_PAIR])
+        self.assertEqual(report.issues[0].nodes.tolist(), [2, 1])
+        self.assertIsNone(router.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC))
+
+    def test_feasible_problem(self):
+        self.assertTrue(drop_nodes_router().check_feasibility().feasible)
+        data = drop_nodes_data()
+        router = hlp.RouteOptimizer(len(data["demands"]), data["num_vehicles"])
+        router.set_global_arc_cost(hlp.QuantizedMatrix(data["distance_matrix"]))
+        router.add_dimension_w_vehicle_capacity(
+            hlp.QuantizedVector(data["demands"]), data["vehicle_capacities"], "Capacity"
+        )
+        report = router.check_feasibility()
+        self.assertEqual([issue.kind for issue in report.issues], [FLEET_CAPACITY])
+        self.assertEqual(report.suggested_drops.tolist(), [7, 8])
@@ -0,0 +1,58 @@
+"""Verify instance features and the calibrated strategy selection."""
+from unittest import TestCase
+
+import ort_simpleroute as hlp
+from ort_simpleroute.fss_selection import instance_features
+from ort_simpleroute.tests._data import drop_nodes_router
+
+drop_nodes_features = instance_features(drop_nodes_router())
+
+
+class StrategySelectorTestCase(TestCase):
+    def test_features(self):
+        features = instance_features(drop_nodes_router())
+        self.assertEqual(features["num_nodes"], 17)
+        self.assertEqual(features["drop_fraction"], 1)
+        self.assertAlmostEqual(features["capacity_tightness"], 70 / 60)
+
+    def test_recorded_winners(self):
+        small = dict(drop_nodes_features, num_nodes=10)
+        large = dict(drop_nodes_features, num_nodes=500)
+        # Within the 1% tolerance the fastest run wins, failed runs never do.
+        runs = [
+            (small, "SAVINGS", 100, 1.0),
+            (small, "SWEEP", 100.5, 0.1),
+            (small, "PATH_CHEAPEST_ARC", 150, 0.01),
+            (large, "SAVINGS", 1000, 2.0),
+            (large, "SWEEP", 1200, 0.5),
+            (large, "PATH_CHEAPEST_ARC", None, 0.1),
+        ]
+        selector = hlp.StrategySelector(
+            dict(zip(("features", "strategy", "objective", "seconds"), run))
+            for run in runs
+        )
+        self.assertEqual(selector.select(dict(small, num_nodes=12)), hlp.fss.SWEEP)
+        self.assertEqual(selector.select(dict(large, num_nodes=400)), hlp.fss.SAVINGS)
+
+    def test_calibrated_choice_and_override(self):
+        # SWEEP finds no solution here, it must never be selected.
+        strategies = ["SAVINGS", "PATH_CHEAPEST_ARC", "SWEEP"]
+        selector = hlp.StrategySelector()
+        selector.calibrate([drop_nodes_router], strategies=strategies)
+        self.assertEqual(len(selector.records), 3)
+        objectives = dict()
+        for strategy in strategies:
+            solution = drop_nodes_router().solve_using_fss(getattr(hlp.fss, strategy))
+            if solution:
+                objectives[strategy] = solution.ObjectiveValue()
+        selected = selector.select_name(drop_nodes_features)
+        self.assertIn(selected, objectives)
+        best = min(objectives.values())
+        self.assertLessEqual(objectives[selected], best * (1 + selector.tolerance))
+        router = drop_nodes_router()
+        self.assertEqual(selector.select(router, override="SWEEP"), hlp.fss.SWEEP)
+
+    def test_solve_with_default_rules(self):
+        router = drop_nodes_router()
+        solution = hlp.solve_using_selected_fss(router)
+        self.assertIsNotNone(solution)
@@ -0,0 +1,45 @@
+"""Verify insertion quotes against evaluating every insertion."""
+from unittest import TestCase
+
+import ort_simpleroute as hlp
+from ort_simpleroute.tests._data import drop_nodes_router
+
+
+class InsertionQuoterTestCase(TestCase):
+    def setUp(self):
+        self.router = drop_nodes_router()
+        self.evaluator = hlp.RouteEvaluator(self.router)
+        self.plan = [[0, 1, 2, 0], [0, 5, 0], [0, 0], [0, 0]]
+        self.quoter = hlp.InsertionQuoter(self.evaluator, self.plan)
+
+    def _brute_force(self, node):
+        base = self.evaluator.evaluate(self.plan).costs.sum()
+        best = None
+        for vehicle, route in enumerate(self.plan):
+            for position in range(1, len(route)):
+                plan = [list(other) for other in self.plan]
+                plan[vehicle].insert(position, node)
+                evaluation = self.evaluator.evaluate(plan)
+                if evaluation.feasible.all():
+                    cost = evaluation.costs.sum() - base
+                    if best is None or cost < best:
+                        best = cost
+        return best
+
+    def test_batch_quotes_match_brute_force(self):
+        nodes = [3, 4, 7, 8, 16]
+        quotes = self.quoter.quote(nodes)
+        self.assertTrue(quotes.feasible.all())
+        for node, cost in zip(nodes, quotes.costs):
+            self.assertEqual(cost, self._brute_force(node))
+
+    def test_capacity_excludes_insertions(self):
+        self.quoter.set_plan([[0, 7, 4, 0], [0, 15, 6, 0], [0, 16, 13, 0], [0, 0]])
+        quotes = self.quoter.quote([3, 14])
+        self.assertTrue(quotes.feasible.all())
+        self.assertTrue((quotes.vehicles == 3).all())
+
+        for node in (3, 14, 5):
+            self.quoter.insert(node)
+        self.assertEqual(sorted(self.quoter.plan[3]), [0, 0, 3, 5, 14])
+        self.assertFalse(self.quoter.quote([13]).feasible[0])
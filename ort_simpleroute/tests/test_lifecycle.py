@@ -0,0 +1,102 @@
+"""Verify the release of route optimizers and their memory accounting."""
+import gc
+import os
+import subprocess
+import sys
+import weakref
+from unittest import TestCase
+
+import ort_simpleroute as hlp
+from ort_simpleroute.memory import memory_footprint, process_rss
+from ort_simpleroute.tests._data import drop_nodes_data, drop_nodes_router
+
+
+class _Matrix(list):
+    """A list that can be weakly referenced."""
+
+
+class LifecycleTestCase(TestCase):
+    def test_close_releases_registered_data(self):
+        matrix = _Matrix([[0, 1], [1, 0]])
+        matrix_reference = weakref.ref(matrix)
+        with hlp.RouteOptimizer(2) as router:
+            router.set_global_arc_cost(lambda x, y: matrix[x][y])
+            self.assertIsNotNone(router.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC))
+        del matrix
+
+        self.assertTrue(router.closed)
+        self.assertIsNone(matrix_reference())
+        with self.assertRaises(RuntimeError):
+            router.model
+        router.close()
+
+    def test_solution_hooks_dont_keep_routers_alive(self):
+        pool = hlp.SolutionPool()
+        with hlp.tracing.tracing(hlp.tracing.MemoryRecorder()):
+            data = drop_nodes_data()
+            router = hlp.RouteOptimizer(len(data["distance_matrix"]), 2)
+            router.set_global_arc_cost(hlp.QuantizedMatrix(data["distance_matrix"]))
+            self.assertFalse(router.calls_python)
+            router.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC, pool=pool, gap=0.5)
+        self.assertTrue(router.calls_python)
+        self.assertEqual(router._python_hooks, 2)  # The tracing hook isn't counted.
+        router_reference = weakref.ref(router)
+        del router
+        gc.collect()
+        self.assertIsNone(router_reference())
+        self.assertGreater(len(pool), 0)
+
+    def test_memory_footprint(self):
+        router = drop_nodes_router()
+        footprint = memory_footprint(router)
+        self.assertGreater(footprint["python_data"], 0)
+        self.assertGreater(footprint["solver_disjunctions"], 0)
+        self.assertEqual(
+            footprint["total"],
+            sum(value for key, value in footprint.items() if key != "total"),
+        )
+
+    def test_memory_footprint_close_to_resident_size(self):
+        if not process_rss():
+            self.skipTest("Resident size unknown on this platform.")
+        # In a fresh process, memory freed by other tests would hide the model.
+        script = """
+import gc
+import numpy as np
+import ort_simpleroute as hlp
+from ort_simpleroute.memory import memory_footprint, process_rss, release_free_memory
+from ort_simpleroute.ortools_helpers import _make_search_parameters
+
+def build(num_nodes):
+    rng = np.random.default_rng(0)
+    router = hlp.RouteOptimizer(num_nodes, 2)
+    router.set_global_arc_cost(
+        hlp.QuantizedMatrix(rng.integers(0, 1000, (num_nodes, num_nodes)))
+    )
+    router.add_dimension_w_vehicle_capacity(
+        hlp.QuantizedVector(rng.integers(0, 10, num_nodes)), [10**6] * 2, "C"
+    )
+    router.model.CloseModelWithParameters(
+        _make_search_parameters(hlp.fss.PATH_CHEAPEST_ARC, None)
+    )
+    return router
+
+build(2).close()
+gc.collect()
+release_free_memory()
+before = process_rss()
+router = build(1000)
+gc.collect()
+release_free_memory()
+print(process_rss() - before, memory_footprint(router)["total"])
+"""
+        package_root = os.path.dirname(os.path.dirname(hlp.__file__))
+        output = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=package_root,
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+        measured, estimated = map(int, output.split())
+        self.assertLess(abs(estimated - measured), 0.35 * measured)
@@ -0,0 +1,41 @@
+"""Verify locked route prefixes are kept by the search."""
+from unittest import TestCase
+
+import ort_simpleroute as hlp
+from ort_simpleroute.tests._data import drop_nodes_router
+
+
+class LockedPrefixesTestCase(TestCase):
+    def test_routes_start_with_their_prefix(self):
+        router = drop_nodes_router()
+        prefixes = [[5, 3], [], [12], [1, 2, 4]]
+        router.lock_route_prefixes(prefixes)
+        solution = router.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC)
+        self.assertTrue(solution)
+        for prefix, route in zip(prefixes, hlp.solution_routes(router, solution)):
+            self.assertEqual(route[: len(prefix)], prefix)
+        self.assertNotEqual(router.fingerprint(), drop_nodes_router().fingerprint())
+
+    def test_invalid_prefixes(self):
+        router = drop_nodes_router()
+        with self.assertRaises(ValueError):
+            router.lock_route_prefixes([[1]])
+        with self.assertRaises(ValueError):
+            router.lock_route_prefixes([[1], [1], [], []])
+        with self.assertRaises(ValueError):
+            router.lock_route_prefixes([[0], [], [], []])
+
+    def test_locked_arcs_survive_pruning(self):
+        router = drop_nodes_router()
+        prefixes = [[1, 16], [], [], []]  # 16 is far from 1.
+        router.lock_route_prefixes(prefixes)
+        pruning = router.prune_arcs(k=2)
+        self.assertFalse(pruning.candidates[1, 16] or pruning.candidates[16, 1])
+        solution = router.solve_using_fss(hlp.fss.PARALLEL_CHEAPEST_INSERTION)
+        self.assertTrue(solution)
+        self.assertEqual(hlp.solution_routes(router, solution)[0][:2], [1, 16])
+
+        pruned_first = drop_nodes_router()
+        pruned_first.prune_arcs(k=2)
+        with self.assertRaises(ValueError):
+            pruned_first.lock_route_prefixes(prefixes)
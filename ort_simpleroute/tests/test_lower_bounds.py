@@ -0,0 +1,82 @@
+"""Verify lower bounds stay below the optimum and stop searches at a gap."""
+from itertools import permutations
+from unittest import TestCase
+
+import numpy as np
+
+import ort_simpleroute as hlp
+from ort_simpleroute.lower_bounds import optimality_gap
+from ort_simpleroute.tests._data import drop_nodes_router
+
+
+def _tsp_router(costs):
+    router = hlp.RouteOptimizer(len(costs))
+    router.set_global_arc_cost(hlp.QuantizedMatrix(costs))
+    return router
+
+
+def _tsp_optimum(costs) -> int:
+    return min(
+        sum(costs[a][b] for a, b in zip((0,) + tour, tour + (0,)))
+        for tour in permutations(range(1, len(costs)))
+    )
+
+
+class LowerBoundTestCase(TestCase):
+    def test_bounds_below_optimum(self):
+        rng = np.random.default_rng(3)
+        for _ in range(5):
+            costs = rng.integers(1, 100, (7, 7))
+            with _tsp_router(costs) as router:
+                bound = router.lower_bound()
+            self.assertLessEqual(bound.value, _tsp_optimum(costs))
+            self.assertEqual(bound.value, max(bound.spanning_tree, bound.assignment))
+            self.assertGreater(bound.value, 0)
+
+        # Every arc leaving node 2, start of vehicle 1, is costly: unused, it's free.
+        costs = np.ones((4, 4), np.int64)
+        np.fill_diagonal(costs, 0)
+        costs[2] = 1000
+        with hlp.RouteOptimizer(4, 2, starts=[0, 2], ends=[0, 3]) as router:
+            router.set_global_arc_cost(hlp.QuantizedMatrix(costs))
+            solution = router.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC)
+            self.assertEqual(solution.ObjectiveValue(), 2)
+            bound = router.lower_bound()
+        self.assertLessEqual(bound.assignment, 2)
+        self.assertLessEqual(bound.spanning_tree, 2)
+
+    def test_vehicles_without_arc_costs_travel_free(self):
+        costs = np.full((4, 4), 10)
+        np.fill_diagonal(costs, 0)
+        with hlp.RouteOptimizer(4, 2) as router:
+            router.set_vehicle_arc_cost(hlp.QuantizedMatrix(costs), 0)
+            self.assertEqual(router.lower_bound().value, 0)
+            solution = router.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC)
+            self.assertEqual(solution.ObjectiveValue(), 0)
+
+    def test_drop_penalties_bound_the_cost(self):
+        costs = np.full((4, 4), 1000)
+        np.fill_diagonal(costs, 0)
+        with _tsp_router(costs) as router:
+            for node in (1, 2, 3):
+                router.allow_drop_of_node(node, 5)
+            self.assertLessEqual(router.lower_bound().value, 15)
+            solution = router.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC)
+            self.assertEqual(solution.ObjectiveValue(), 15)
+
+    def test_search_stops_at_gap(self):
+        router = drop_nodes_router()
+        solution = router.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC, gap=0.58)
+        gaps = router.solution_gaps
+        self.assertLessEqual(gaps[-1][1], 0.58)
+        self.assertTrue(all(gap > 0.58 for _, gap in gaps[:-1]))
+        self.assertEqual(gaps[-1][0], solution.ObjectiveValue())
+        self.assertAlmostEqual(router.optimality_gap(solution), gaps[-1][1])
+
+        best = drop_nodes_router().solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC)
+        self.assertGreater(solution.ObjectiveValue(), best.ObjectiveValue())
+
+    def test_optimality_gap(self):
+        self.assertEqual(optimality_gap(100, 100), 0.0)
+        self.assertEqual(optimality_gap(100, 120), 0.0)
+        self.assertAlmostEqual(optimality_gap(100, 90), 0.1)
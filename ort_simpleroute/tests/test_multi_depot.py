@@ -0,0 +1,40 @@
+"""Verify models with per vehicle start and end nodes."""
+from unittest import TestCase
+
+import ort_simpleroute as hlp
+from ort_simpleroute.tests._data import drop_nodes_data
+
+
+class MultiDepotTestCase(TestCase):
+    def setUp(self):
+        self.data = drop_nodes_data()
+        self.data["starts"] = [0, 0, 7, 9]
+        self.data["ends"] = [0, 8, 7, 9]
+        self.router = hlp.RouteOptimizer(
+            len(self.data["distance_matrix"]),
+            self.data["num_vehicles"],
+            starts=self.data["starts"],
+            ends=self.data["ends"],
+        )
+        self.router.set_global_arc_cost(lambda x, y: self.data["distance_matrix"][x][y])
+        self.router.add_dimension_w_vehicle_capacity(
+            lambda x: self.data["demands"][x], self.data["vehicle_capacities"], "Load"
+        )
+        for node in set(range(17)) - set(self.data["starts"] + self.data["ends"]):
+            self.router.allow_drop_of_node(node, 1000)
+
+    def test_routes_use_their_start_and_end(self):
+        solution = self.router.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC)
+        plan = [
+            list(hlp.solution_sequence(self.router, solution, vehicle))
+            for vehicle in range(4)
+        ]
+        self.assertEqual([route[0] for route in plan], self.data["starts"])
+        self.assertEqual([route[-1] for route in plan], self.data["ends"])
+
+        evaluation = hlp.RouteEvaluator(self.router).evaluate_plan(plan)
+        self.assertEqual(evaluation.total_cost, solution.ObjectiveValue())
+
+    def test_start_and_end_nodes_cant_be_dropped(self):
+        with self.assertRaises(ValueError):
+            self.router.allow_drop_of_node(8, 1000)
@@ -0,0 +1,60 @@
+"""Verify re-optimizing part of a plan leaves the rest untouched."""
+from unittest import TestCase
+
+import ort_simpleroute as hlp
+from ort_simpleroute.tests._data import drop_nodes_router
+
+
+class ReoptimizeSubsetTestCase(TestCase):
+    def setUp(self):
+        self.router = drop_nodes_router()
+        self.evaluator = hlp.RouteEvaluator(self.router)
+        solution = self.router.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC)
+        self.plan = [
+            list(hlp.solution_sequence(self.router, solution, vehicle))
+            for vehicle in range(4)
+        ]
+        # Swap two stops of vehicle 0, leaving it worse than needed.
+        route = self.plan[0]
+        route[1], route[2] = route[2], route[1]
+
+    def test_vehicles_subset(self):
+        merged = hlp.reoptimize_subset(
+            self.router, self.plan, vehicles=[0, 1], evaluator=self.evaluator
+        )
+        self.assertEqual(merged[2:], self.plan[2:])
+        before = {n for route in self.plan[:2] for n in route[1:-1]}
+        after = {n for route in merged[:2] for n in route[1:-1]}
+        self.assertLessEqual(after, before)
+        self.assertLessEqual(
+            self.evaluator.evaluate_plan(merged).total_cost,
+            self.evaluator.evaluate_plan(self.plan).total_cost,
+        )
+        self.assertTrue(self.evaluator.evaluate_plan(merged).feasible)
+
+    def test_nodes_select_their_vehicles(self):
+        node = self.plan[3][1]
+        merged = hlp.reoptimize_subset(self.router, self.plan, nodes=[node])
+        self.assertEqual(merged[:3], self.plan[:3])
+        with self.assertRaises(ValueError):
+            hlp.reoptimize_subset(self.router, self.plan, nodes=[0])
+        with self.assertRaises(ValueError):
+            hlp.reoptimize_subset(self.router, self.plan)
+
+    def test_pairs_bring_the_vehicle_of_their_partner(self):
+        router = drop_nodes_router()
+        router.add_delivery_request(1, 2)
+        solution = router.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC)
+        plan = [
+            list(hlp.solution_sequence(router, solution, vehicle))
+            for vehicle in range(4)
+        ]
+        serving = next(v for v, route in enumerate(plan) if 2 in route)
+        other = (serving + 1) % 4
+        plan[serving].remove(1)  # The pickup is to be served again.
+        merged = hlp.reoptimize_subset(router, plan, vehicles=[other], nodes=[1])
+        visits = [node for route in merged for node in route[1:-1]]
+        self.assertEqual(len(visits), len(set(visits)))
+        untouched = set(range(4)) - {serving, other}
+        self.assertEqual([merged[v] for v in untouched], [plan[v] for v in untouched])
+        self.assertEqual(1 in visits, 2 in visits)
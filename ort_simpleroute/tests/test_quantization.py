@@ -0,0 +1,98 @@
+"""Verify quantized data gives the same models as integer callbacks."""
+from unittest import TestCase
+
+import numpy as np
+
+import ort_simpleroute as hlp
+from ort_simpleroute.instances import optimizer_from_data
+from ort_simpleroute.tests._data import drop_nodes_data, drop_nodes_router
+
+
+class QuantizationTestCase(TestCase):
+    def setUp(self):
+        self.data = drop_nodes_data()
+        self.distances = np.array(self.data["distance_matrix"], np.float64) / 100
+
+    def test_same_solution_as_integer_callbacks(self):
+        router = hlp.RouteOptimizer(len(self.distances), self.data["num_vehicles"])
+        distances = hlp.QuantizedMatrix(self.distances, resolution=0.01)
+        demands = hlp.QuantizedVector(self.data["demands"])
+        self.assertEqual(distances.values.dtype, np.int32)
+        router.set_global_arc_cost(distances)
+        router.add_dimension_w_vehicle_capacity(
+            demands, self.data["vehicle_capacities"], "Capacity"
+        )
+        for node in range(1, len(self.distances)):
+            router.allow_drop_of_node(node, 1000)
+        solution = router.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC)
+
+        by_hand = drop_nodes_router()
+        expected = by_hand.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC)
+        self.assertEqual(solution.ObjectiveValue(), expected.ObjectiveValue())
+        self.assertEqual(
+            hlp.solution_routes(router, solution),
+            hlp.solution_routes(by_hand, expected),
+        )
+        self.assertEqual(router.fingerprint(), by_hand.fingerprint())
+        self.assertAlmostEqual(
+            distances.dequantize(solution.ObjectiveValue()),
+            expected.ObjectiveValue() / 100,
+        )
+
+    def test_type_and_overflow_checks(self):
+        self.assertEqual(hlp.QuantizedVector([0, 2**40]).values.dtype, np.int64)
+        self.assertEqual(hlp.QuantizedVector([1.5], 0.5).quantize_value(3.0), 6)
+        with self.assertRaises(OverflowError):
+            hlp.QuantizedVector([1.0, 2.0], resolution=1e-20)
+        with self.assertRaises(ValueError):
+            hlp.QuantizedVector([1.0, float("nan")])
+        with self.assertRaises(ValueError):
+            hlp.QuantizedMatrix([[1.0, 2.0]])
+
+
+class SymmetricMatrixTestCase(TestCase):
+    def setUp(self):
+        self.data = drop_nodes_data()
+        self.distances = np.array(self.data["distance_matrix"])
+
+    def test_access_and_storage(self):
+        matrix = hlp.SymmetricMatrix(self.distances)
+        num_nodes = len(self.distances)
+        self.assertEqual(len(matrix.values), num_nodes * (num_nodes + 1) // 2)
+        for from_node in range(num_nodes):
+            for to_node in range(num_nodes):
+                self.assertEqual(
+                    matrix(from_node, to_node), self.distances[from_node, to_node]
+                )
+        np.testing.assert_array_equal(matrix.node_values(), self.distances)
+        np.testing.assert_array_equal(list(matrix.rows()), self.distances)
+        packed = hlp.SymmetricMatrix.from_upper_triangle(matrix.values, num_nodes)
+        np.testing.assert_array_equal(packed.node_values(), self.distances)
+        with self.assertRaises(ValueError):
+            hlp.SymmetricMatrix([[0, 1], [2, 0]])
+
+    def test_same_solution_as_full_matrix(self):
+        data = dict(self.data, symmetric=True, drop_penalty=1000)
+        router = optimizer_from_data(data)
+        solution = router.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC)
+        by_hand = drop_nodes_router()
+        expected = by_hand.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC)
+        self.assertEqual(solution.ObjectiveValue(), expected.ObjectiveValue())
+        self.assertEqual(router.fingerprint(), by_hand.fingerprint())
+
+    def test_triangle_only_registration(self):
+        router = hlp.RouteOptimizer(len(self.distances), self.data["num_vehicles"])
+        distances = hlp.SymmetricMatrix(self.distances, native=False)
+        router.set_global_arc_cost(distances)
+        router.add_dimension_w_vehicle_capacity(
+            hlp.QuantizedVector(self.data["demands"]),
+            self.data["vehicle_capacities"],
+            "Capacity",
+        )
+        for node in range(1, len(self.distances)):
+            router.allow_drop_of_node(node, 1000)
+        self.assertTrue(router.calls_python)
+        solution = router.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC)
+        by_hand = drop_nodes_router()
+        expected = by_hand.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC)
+        self.assertEqual(solution.ObjectiveValue(), expected.ObjectiveValue())
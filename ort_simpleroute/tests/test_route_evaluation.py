@@ -0,0 +1,43 @@
+"""Verify that route evaluation and solution reports agree with the solver."""
+from unittest import TestCase
+
+import ort_simpleroute as hlp
+from ort_simpleroute.tests._data import drop_nodes_data, drop_nodes_router
+
+
+class RouteEvaluatorTestCase(TestCase):
+    def setUp(self):
+        self.data = drop_nodes_data()
+        self.router = drop_nodes_router(self.data)
+        solution = self.router.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC)
+        self.report = hlp.solution_report(self.router, solution)
+        self.objective = solution.ObjectiveValue()
+        self.plan = [
+            list(hlp.solution_sequence(self.router, solution, vehicle))
+            for vehicle in range(self.data["num_vehicles"])
+        ]
+        self.evaluator = hlp.RouteEvaluator(self.router)
+
+    def test_solution_plan_matches_objective(self):
+        evaluation = self.evaluator.evaluate_plan(self.plan)
+        self.assertTrue(evaluation.feasible)
+        self.assertEqual(evaluation.total_cost, self.objective)
+        self.assertEqual(
+            evaluation.dropped_nodes.tolist(), self.report.dropped_nodes.tolist()
+        )
+        self.assertEqual(evaluation.drop_penalty, self.report.dropped_penalties.sum())
+        self.assertEqual(
+            evaluation.routes.costs.tolist(), self.report.vehicle_arc_costs.tolist()
+        )
+        self.assertEqual(self.report.unaccounted, 0)
+        for route, load in zip(self.plan, evaluation.routes.loads["Capacity"]):
+            self.assertEqual(load, sum(self.data["demands"][node] for node in route))
+
+    def test_violations(self):
+        overloaded = [[0, 3, 4, 5, 6, 7, 0], [0, 0], [0, 0], [0, 0]]
+        evaluation = self.evaluator.evaluate_plans([self.plan, overloaded])[1]
+        self.assertFalse(evaluation.feasible)
+        self.assertTrue(evaluation.routes.violations["Capacity"][0])
+        self.assertEqual(evaluation.routes.costs[1], 0)
+        self.assertEqual(len(evaluation.dropped_nodes), 11)
+        self.assertEqual(len(evaluation.missing_nodes), 0)
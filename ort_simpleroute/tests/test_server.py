@@ -0,0 +1,119 @@
+"""Verify the warm server answers requests and limits its load."""
+import argparse
+import json
+import os
+import threading
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+import ort_simpleroute as hlp
+from ort_simpleroute.binary_format import write_binary
+from ort_simpleroute.server import (
+    RoutingServer,
+    ServerBusy,
+    _load_template,
+    make_http_server,
+    request,
+)
+from ort_simpleroute.tests._data import drop_nodes_data
+
+
+class RoutingServerTestCase(TestCase):
+    def setUp(self):
+        self._directory = TemporaryDirectory()
+        self.data = drop_nodes_data()
+        self.data["drop_penalty"] = 1000
+        self.path = os.path.join(self._directory.name, "drop.json")
+        with open(self.path, "w") as file:
+            json.dump(self.data, file)
+        self.routing = RoutingServer(max_workers=1, max_queue=1)
+
+    def tearDown(self):
+        self.routing.close()
+        self._directory.cleanup()
+
+    def test_instances_are_cached(self):
+        first = self.routing.solve({"instance": self.path, "strategy": "SAVINGS"})
+        second = self.routing.solve({"instance": self.path, "strategy": "SAVINGS"})
+        self.assertEqual(first["routes"], second["routes"])
+        status = self.routing.status()
+        self.assertEqual(status["cached_instances"], 1)
+        self.assertEqual(status["instance_cache_hits"], 1)
+        self.assertEqual(status["solved"], 2)
+
+    def test_cached_binary_instances_dont_map_their_file(self):
+        path = os.path.join(self._directory.name, "drop.orsr")
+        write_binary(path, self.data)
+        cached = self.routing._instances.get(path)
+        self.assertTrue(cached["distance_matrix"].flags.owndata)
+        os.truncate(path, 0)  # A mapped array would fault from now on.
+        self.assertEqual(
+            cached["distance_matrix"].tolist(), self.data["distance_matrix"]
+        )
+
+    def test_template_request(self):
+        template = hlp.FleetTemplate(self.data["num_vehicles"])
+        template.add_dimension_w_vehicle_capacity(
+            "Capacity", self.data["vehicle_capacities"]
+        )
+        self.routing.add_template("fleet", template)
+        answer = self.routing.solve(
+            {
+                "template": "fleet",
+                "distance": self.data["distance_matrix"],
+                "dimension_data": {"Capacity": self.data["demands"]},
+                "drop_penalties": {str(node): 1000 for node in range(1, 17)},
+                "strategy": "PATH_CHEAPEST_ARC",
+            }
+        )
+        inline = self.routing.solve(
+            {"data": self.data, "strategy": "PATH_CHEAPEST_ARC"}
+        )
+        self.assertEqual(answer["objective"], 7936)
+        self.assertEqual(answer["routes"], inline["routes"])
+
+    def test_template_option(self):
+        name, loaded = _load_template(
+            "fleet=ort_simpleroute.tests._data:drop_nodes_data"
+        )
+        self.assertEqual(name, "fleet")
+        self.assertIs(loaded, drop_nodes_data)
+        for option in ("fleet", "fleet=ort_simpleroute", "fleet=missing:thing"):
+            with self.assertRaises(argparse.ArgumentTypeError):
+                _load_template(option)
+
+    def test_infeasible_request_fails_fast(self):
+        data = dict(self.data, vehicle_capacities=[10, 10, 10, 10])
+        del data["drop_penalty"]
+        answer = self.routing.solve({"data": data, "check": True})
+        self.assertFalse(answer["solved"])
+        self.assertIn("the fleet holds 40", answer["infeasible"][0])
+        self.assertEqual(answer["suggested_drops"], [7, 8, 15, 16])
+
+    def test_full_queue_is_refused(self):
+        release = threading.Event()
+        self.routing._executor.submit(release.wait)  # Keeps the worker busy.
+        queued = self.routing.submit({"data": self.data})
+        running = self.routing.submit({"data": self.data})
+        with self.assertRaises(ServerBusy):
+            self.routing.submit({"data": self.data})
+        self.assertEqual(self.routing.status()["rejected"], 1)
+        release.set()
+        self.assertTrue(queued.result()["solved"])
+        self.assertTrue(running.result()["solved"])
+
+    def test_http_over_unix_socket(self):
+        address = os.path.join(self._directory.name, "server.sock")
+        server = make_http_server(self.routing, address)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            answer = request(address, {"instance": self.path}, timeout=30)
+            self.assertTrue(answer["solved"])
+            self.assertEqual(request(address)["solved"], 1)
+            with self.assertRaises(RuntimeError):
+                request(address, {"instance": "missing.json"}, timeout=30)
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
@@ -0,0 +1,75 @@
+"""Verify problem fingerprints and the reuse of cached routes."""
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+import ort_simpleroute as hlp
+from ort_simpleroute.tests._data import drop_nodes_data, drop_nodes_router
+
+
+class FingerprintTestCase(TestCase):
+    def test_same_problem_same_fingerprint(self):
+        self.assertEqual(
+            drop_nodes_router().fingerprint(), drop_nodes_router().fingerprint()
+        )
+
+    def test_different_data_different_fingerprint(self):
+        data = drop_nodes_data()
+        data["demands"][3] += 1
+        self.assertNotEqual(
+            drop_nodes_router().fingerprint(), drop_nodes_router(data).fingerprint()
+        )
+
+    def test_data_key_hashed_instead_of_calls(self):
+        calls = []
+
+        def distance(from_node, to_node):
+            calls.append(from_node)
+            return 1
+
+        fingerprints = []
+        for data_key in ("v1", "v1", "v2"):
+            distance.data_key = data_key
+            router = hlp.RouteOptimizer(4, 1)
+            router.set_global_arc_cost(distance)
+            fingerprints.append(router.fingerprint())
+        self.assertEqual(calls, [])
+        self.assertEqual(fingerprints[0], fingerprints[1])
+        self.assertNotEqual(fingerprints[0], fingerprints[2])
+
+
+class SolutionCacheTestCase(TestCase):
+    def test_cached_solution_has_same_routes_and_objective(self):
+        cache = hlp.SolutionCache()
+        router = drop_nodes_router()
+        solution = router.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC, cache=cache)
+        self.assertEqual(len(cache), 1)
+
+        repeated = drop_nodes_router()
+        cached = repeated.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC, cache=cache)
+        self.assertEqual(
+            hlp.solution_routes(router, solution),
+            hlp.solution_routes(repeated, cached),
+        )
+        self.assertEqual(solution.ObjectiveValue(), cached.ObjectiveValue())
+
+    def test_memory_eviction(self):
+        cache = hlp.SolutionCache(max_entries=2)
+        for key in "abc":
+            cache.put(key, [[1, 2]])
+        self.assertNotIn("a", cache)
+        self.assertIn("c", cache)
+        # Membership tests don't count as uses, "b" is still the oldest.
+        self.assertIn("b", cache)
+        cache.put("d", [[3]])
+        self.assertNotIn("b", cache)
+
+    def test_disk_cache_survives_memory_and_evicts_by_size(self):
+        with TemporaryDirectory() as directory:
+            hlp.SolutionCache(directory=directory).put("a", [[1, 2, 3]])
+            self.assertEqual(
+                hlp.SolutionCache(directory=directory).get("a"), [[1, 2, 3]]
+            )
+
+            small = hlp.SolutionCache(directory=directory, max_disk_bytes=10)
+            small.put("b", [[4, 5, 6]])
+            self.assertIsNone(small.get("a"))
@@ -0,0 +1,36 @@
+"""Verify the solution pool keeps the best distinct solutions of a search."""
+from unittest import TestCase
+
+import numpy as np
+
+import ort_simpleroute as hlp
+from ort_simpleroute.solution_pool import route_difference
+from ort_simpleroute.tests._data import drop_nodes_router
+
+
+class SolutionPoolTestCase(TestCase):
+    def test_pool_of_one_search(self):
+        router = drop_nodes_router()
+        pool = hlp.SolutionPool(3, min_difference=0.1)
+        solution = router.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC, pool=pool)
+        solutions = pool.solutions
+        self.assertEqual(len(solutions), 3)
+        best = solutions[0]
+        self.assertEqual(best.objective, solution.ObjectiveValue())
+        self.assertEqual(
+            [route.tolist() for route in best.routes],
+            hlp.solution_routes(router, solution),
+        )
+        objectives = [pooled.objective for pooled in solutions]
+        self.assertEqual(objectives, sorted(objectives))
+
+    def test_offer_keeps_distinct_solutions(self):
+        pool = hlp.SolutionPool(2, min_difference=0.5)
+        base = np.array([1, 2, 3, 4, 5])
+        pool.offer(10, base)
+        pool.offer(9, np.array([1, 2, 3, 5, 4]))  # Close, and better: replaces.
+        self.assertEqual([objective for objective, _ in pool._entries], [9])
+        pool.offer(12, np.array([2, 3, 4, 5, 1]))  # Distinct.
+        pool.offer(11, np.array([1, 2, 3, 4, 4]))  # Close to the best, worse.
+        self.assertEqual([objective for objective, _ in pool._entries], [9, 12])
+        self.assertEqual(route_difference(base, base), 0)
@@ -0,0 +1,62 @@
+"""Verify concurrent solves pick threads only for models free of Python callbacks."""
+from functools import partial
+from unittest import TestCase
+
+import ort_simpleroute as hlp
+from ort_simpleroute.solve_executor import PROCESSES, SERIAL, THREADS
+from ort_simpleroute.tests._data import drop_nodes_data, drop_nodes_router
+
+
+def native_drop_nodes_router():
+    data = drop_nodes_data()
+    router = hlp.RouteOptimizer(len(data["distance_matrix"]), data["num_vehicles"])
+    router.set_global_arc_cost(hlp.QuantizedMatrix(data["distance_matrix"]))
+    router.add_dimension_w_vehicle_capacity(
+        hlp.QuantizedVector(data["demands"]), data["vehicle_capacities"], "Capacity"
+    )
+    for node in range(1, len(data["distance_matrix"])):
+        router.allow_drop_of_node(node, 1000)
+    return router
+
+
+class SolveExecutorTestCase(TestCase):
+    def test_modes_and_results(self):
+        self.assertFalse(native_drop_nodes_router().calls_python)
+        self.assertTrue(drop_nodes_router().calls_python)
+
+        factories = [
+            native_drop_nodes_router,
+            native_drop_nodes_router,
+            partial(drop_nodes_router),
+            lambda: drop_nodes_router(),
+        ]
+        report = hlp.solve_all(factories, hlp.fss.PATH_CHEAPEST_ARC, max_workers=2)
+        modes = [result.mode for result in report.results]
+        self.assertEqual(modes, [THREADS, THREADS, PROCESSES, SERIAL])
+        expected = drop_nodes_router().solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC)
+        for result in report.results:
+            self.assertEqual(result.objective, expected.ObjectiveValue())
+        self.assertGreater(report.speedup, 0)
+
+    def test_routers_built_once_or_as_declared(self):
+        built = []
+
+        def counted(factory):
+            def build():
+                built.append(factory)
+                return factory()
+
+            return build
+
+        factories = [counted(native_drop_nodes_router), counted(drop_nodes_router)]
+        report = hlp.solve_all(factories, hlp.fss.PATH_CHEAPEST_ARC)
+        self.assertEqual([r.mode for r in report.results], [THREADS, SERIAL])
+        self.assertEqual(len(built), 2)
+
+        declared = [native_drop_nodes_router, partial(drop_nodes_router)]
+        report = hlp.solve_all(
+            declared, hlp.fss.PATH_CHEAPEST_ARC, modes=[SERIAL, PROCESSES]
+        )
+        self.assertEqual([r.mode for r in report.results], [SERIAL, PROCESSES])
+        with self.assertRaises(ValueError):
+            hlp.solve_all(declared, hlp.fss.PATH_CHEAPEST_ARC, modes=[THREADS])
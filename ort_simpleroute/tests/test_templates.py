@@ -0,0 +1,62 @@
+"""Verify that fleet templates build the same models as building by hand."""
+import functools
+from unittest import TestCase
+
+import ort_simpleroute as hlp
+from ort_simpleroute._callback_management import _argument_count
+from ort_simpleroute.tests._data import drop_nodes_data, drop_nodes_router
+
+
+def _logged(callback):
+    @functools.wraps(callback)
+    def wrapper(*args):
+        return callback(*args)
+
+    return wrapper
+
+
+class FleetTemplateTestCase(TestCase):
+    def setUp(self):
+        self.data = drop_nodes_data()
+        self.template = hlp.FleetTemplate(self.data["num_vehicles"])
+        self.template.add_dimension_w_vehicle_capacity(
+            "Capacity", self.data["vehicle_capacities"]
+        )
+
+    def test_same_solution_as_by_hand(self):
+        router = self.template.build(
+            self.data["distance_matrix"],
+            {"Capacity": self.data["demands"]},
+            drop_penalties={node: 1000 for node in range(1, 17)},
+        )
+        solution = router.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC)
+        by_hand = drop_nodes_router()
+        expected = by_hand.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC)
+        self.assertEqual(
+            hlp.solution_routes(router, solution),
+            hlp.solution_routes(by_hand, expected),
+        )
+        self.assertEqual(router.fingerprint(), by_hand.fingerprint())
+
+    def test_callback_arity_and_dimensions_are_checked(self):
+        with self.assertRaises(ValueError):
+            self.template.build(
+                self.data["distance_matrix"], {"Capacity": lambda x, y: 1}
+            )
+        with self.assertRaises(ValueError):
+            self.template.build(self.data["distance_matrix"], {})
+
+    def test_wrapped_callbacks_arity(self):
+        # Every wrapper shares one code object, their arity is the wrapped one.
+        transit = _logged(lambda from_node, to_node: 1)
+        unary = _logged(lambda node: 1)
+        self.assertEqual(_argument_count(transit), 2)
+        self.assertEqual(_argument_count(unary), 1)
+        distances, demands = self.data["distance_matrix"], self.data["demands"]
+        router = self.template.build(
+            _logged(lambda from_node, to_node: distances[from_node][to_node]),
+            {"Capacity": _logged(lambda node: demands[node])},
+            len(demands),
+            drop_penalties={node: 1000 for node in range(1, 17)},
+        )
+        self.assertTrue(router.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC))
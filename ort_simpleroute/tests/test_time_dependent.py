@@ -0,0 +1,61 @@
+"""Verify time dependent dimensions follow the travel times of departure."""
+from unittest import TestCase
+
+import numpy as np
+
+import ort_simpleroute as hlp
+from ort_simpleroute.tests._data import drop_nodes_data
+
+
+class TimeDependentTestCase(TestCase):
+    def setUp(self):
+        data = drop_nodes_data()
+        self.distances = np.array(data["distance_matrix"])[:9, :9]
+        # Travel times grow by half in the second bucket and double in the third.
+        self.times = np.stack(
+            [self.distances, self.distances * 3 // 2, self.distances * 2]
+        )
+
+    def test_travel_time_lookup(self):
+        matrix = hlp.TimeDependentMatrix(self.times, 60, start=10)
+        departures = np.array([0, 69, 70, 130, 500])
+        np.testing.assert_array_equal(matrix.bucket(departures), [0, 0, 1, 2, 2])
+        np.testing.assert_array_equal(
+            matrix.travel_time(1, 2, departures), self.times[[0, 0, 1, 2, 2], 1, 2]
+        )
+        interpolated = hlp.TimeDependentMatrix(self.times, 60, interpolate=True)
+        low, high = self.times[0, 1, 2], self.times[1, 1, 2]
+        self.assertEqual(
+            interpolated.travel_time(1, 2, 30), low + -(-(high - low) * 30 // 60)
+        )
+        self.assertEqual(matrix.nbytes, self.times.size * 4 + 9 * 9 * 4)
+
+    def check_routes_follow_times(self, matrix):
+        router = hlp.RouteOptimizer(len(self.distances), 2)
+        router.set_global_arc_cost(hlp.QuantizedMatrix(self.distances))
+        time = router.add_time_dependent_dimension(matrix, 10000, "Time")
+        solution = router.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC)
+        self.assertTrue(solution)
+        for vehicle in range(2):
+            index = router.model.Start(vehicle)
+            while not router.model.IsEnd(index):
+                following = solution.Value(router.model.NextVar(index))
+                departure = solution.Value(time.CumulVar(index))
+                expected = matrix.travel_time(
+                    router.manager.IndexToNode(index),
+                    router.manager.IndexToNode(following),
+                    departure,
+                )
+                self.assertEqual(
+                    solution.Value(time.CumulVar(following)) - departure, expected
+                )
+                index = following
+        self.assertIn("Time", router._time_dependent_matrices)
+
+    def test_routes_follow_bucket_times(self):
+        self.check_routes_follow_times(hlp.TimeDependentMatrix(self.times, 1000))
+
+    def test_routes_follow_interpolated_times(self):
+        self.check_routes_follow_times(
+            hlp.TimeDependentMatrix(self.times, 1000, interpolate=True)
+        )
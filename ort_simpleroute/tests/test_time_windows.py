@@ -0,0 +1,70 @@
+"""Verify bulk time windows and vehicle shifts."""
+from unittest import TestCase
+
+import numpy as np
+
+import ort_simpleroute as hlp
+from ort_simpleroute.tests._data import drop_nodes_data
+
+
+class TimeWindowsTestCase(TestCase):
+    def setUp(self):
+        self.distances = np.array(drop_nodes_data()["distance_matrix"])
+        self.router = hlp.RouteOptimizer(len(self.distances), 4)
+        self.router.set_global_arc_cost(hlp.QuantizedMatrix(self.distances))
+        self.time = self.router.add_dimension(
+            hlp.QuantizedMatrix(self.distances), 10000, "Time", slack_max=10000
+        )
+        self.nodes = np.arange(1, len(self.distances))
+        self.earliest = (self.nodes % 4) * 500
+        self.latest = self.earliest + 1000
+
+    def cumuls(self, solution, nodes):
+        indices = self.router.manager
+        return np.array(
+            [solution.Min(self.time.CumulVar(indices.NodeToIndex(n))) for n in nodes]
+        )
+
+    def test_hard_windows_and_shifts(self):
+        # Repeated windows for node 1 are intersected.
+        self.router.add_time_windows(
+            "Time",
+            np.append(self.nodes, 1),
+            np.append(self.earliest, 700),
+            np.append(self.latest, 1200),
+        )
+        self.router.add_vehicle_shifts("Time", 0, [3000, 3000, 3000, 3500])
+        solution = self.router.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC)
+        self.assertTrue(solution)
+        cumuls = self.cumuls(solution, self.nodes)
+        self.assertTrue((cumuls >= self.earliest).all())
+        self.assertTrue((cumuls <= self.latest).all())
+        self.assertTrue(700 <= cumuls[0] <= 1200)
+        for vehicle, latest in enumerate([3000, 3000, 3000, 3500]):
+            end = self.router.model.End(vehicle)
+            self.assertLessEqual(solution.Min(self.time.CumulVar(end)), latest)
+
+    def test_soft_windows_are_charged(self):
+        self.router.add_time_windows("Time", self.nodes, 0, 0, penalties=3)
+        solution = self.router.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC)
+        report = hlp.solution_report(self.router, solution)
+        lateness = self.cumuls(solution, self.nodes).sum()
+        self.assertGreater(lateness, 0)
+        self.assertEqual(report.soft_bound_costs.sum(), 3 * lateness)
+
+    def test_repeated_soft_windows_intersect(self):
+        self.router.add_time_windows("Time", [1, 1], [100, 0], [5000, 800], 2)
+        self.router.add_time_windows("Time", [1], [200], [900], penalties=5)
+        index = self.router.manager.NodeToIndex(1)
+        self.assertEqual(self.time.GetCumulVarSoftLowerBound(index), 200)
+        self.assertEqual(self.time.GetCumulVarSoftUpperBound(index), 800)
+        self.assertEqual(self.time.GetCumulVarSoftLowerBoundCoefficient(index), 5)
+        self.assertEqual(self.time.GetCumulVarSoftUpperBoundCoefficient(index), 5)
+
+    def test_invalid_windows(self):
+        with self.assertRaises(ValueError):
+            self.router.add_time_windows("Time", [1], [10], [5])
+        with self.assertRaises(ValueError):
+            self.router.add_time_windows("Time", [0], [0], [5])
+        with self.assertRaises(ValueError):
+            self.router.add_time_windows("Time", [2, 2], [0, 20], [10, 30])
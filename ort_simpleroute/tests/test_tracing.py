@@ -0,0 +1,94 @@
+"""Verify the phases of building and solving a router are traced."""
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+import ort_simpleroute as hlp
+from ort_simpleroute.tests._data import drop_nodes_data, drop_nodes_router
+from ort_simpleroute.tracing import (
+    JsonLinesSink,
+    MemoryRecorder,
+    PrometheusTextSink,
+    is_tracing,
+    span,
+    tracing,
+)
+
+
+class TracingTestCase(TestCase):
+    def test_phases_recorded(self):
+        with tracing(MemoryRecorder()) as recorder:
+            router = drop_nodes_router()
+            solution = router.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC)
+            hlp.solution_routes(router, solution)
+        self.assertFalse(is_tracing())
+        names = {record.name for record in recorder.records}
+        self.assertLessEqual(
+            {
+                "build_model",
+                "register_callback",
+                "add_dimension",
+                "solve",
+                "first_solution",
+                "local_search",
+                "extract_routes",
+            },
+            names,
+        )
+        by_name = {record.name: record for record in recorder.records}
+        solve = by_name["solve"]
+        self.assertEqual(by_name["first_solution"].parent_id, solve.span_id)
+        self.assertEqual(by_name["add_dimension"].attributes, {"dimension": "Capacity"})
+        registered = [r for r in recorder.records if r.name == "register_callback"]
+        self.assertIn(
+            by_name["add_dimension"].span_id, [r.parent_id for r in registered]
+        )
+
+    def test_untraced_solves_after_a_traced_one(self):
+        data = drop_nodes_data()
+        router = hlp.RouteOptimizer(len(data["distance_matrix"]), 2)
+        router.set_global_arc_cost(hlp.QuantizedMatrix(data["distance_matrix"]))
+        with tracing(MemoryRecorder()):
+            router.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC)
+        self.assertTrue(router._solution_times)
+        for _ in range(2):
+            router.solve_using_fss(hlp.fss.PATH_CHEAPEST_ARC)
+            self.assertEqual(router._solution_times, [])
+        self.assertFalse(router.calls_python)
+
+    def test_nested_spans(self):
+        with tracing(MemoryRecorder()) as recorder:
+            with span("outer") as outer:
+                with span("inner"):
+                    pass
+        inner, recorded_outer = recorder.records
+        self.assertEqual(inner.parent_id, outer.span_id)
+        self.assertIsNone(recorded_outer.parent_id)
+        self.assertGreaterEqual(recorded_outer.duration, inner.duration)
+
+    def test_untraced_span(self):
+        with span("ignored") as ignored:
+            self.assertIsNone(ignored.span_id)
+
+    def test_file_sinks(self):
+        with tempfile.TemporaryDirectory() as directory:
+            jsonl = os.path.join(directory, "spans.jsonl")
+            prom = os.path.join(directory, "spans.prom")
+            json_sink = JsonLinesSink(jsonl)
+            prometheus = PrometheusTextSink(prom, min_interval=60)
+            with tracing(json_sink), tracing(prometheus):
+                with span("phase", size=3):
+                    pass
+                with span("phase"):
+                    pass
+            json_sink.close()
+            prometheus.flush()
+            with open(jsonl) as file:
+                lines = [json.loads(line) for line in file]
+            self.assertEqual([line["name"] for line in lines], ["phase", "phase"])
+            self.assertEqual(lines[0]["attributes"], {"size": 3})
+            with open(prom) as file:
+                text = file.read()
+            self.assertIn('ort_simpleroute_span_seconds_count{span="phase"} 2', text)
+            self.assertFalse(os.path.exists(prom + ".tmp"))
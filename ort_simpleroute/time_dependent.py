@@ -0,0 +1,145 @@
+"""
+Travel times that depend on the time of departure.
+
+A TimeDependentMatrix stacks one (from node, to node) matrix per time bucket in a
+single contiguous 3-D integer array. Bucket b starts at start + b * bucket_width,
+its matrix holds the travel times departing at that moment. Within a bucket travel
+times are constant, or linearly interpolated towards the next bucket, and the last
+bucket holds for every later departure.
+
+In the solver the dimension transits are the lower bound of every arc over the
+buckets, so the solver filters stay valid, and each node gets a constraint asking
+its slack to cover the extra time of departing when it does:
+
+    bucket_i = min((cumul_i - start) // bucket_width, buckets - 1)
+    slack_i >= travel(i, next_i, cumul_i) - lower_bound(i, next_i)
+
+slack_i may exceed that by up to slack_max, the time vehicles are allowed to wait.
+
+The constraints look values up in the array through the nodes and buckets left in
+the variable domains, the array isn't copied into the solver, so the memory used is
+the array plus its lower bound matrix, see nbytes.
+"""
+from typing import Union
+
+import numpy as np
+
+from .quantization import QuantizedMatrix, _quantize
+
+
+class TimeDependentMatrix:
+    """Travel times by departure bucket, values[bucket, from node, to node]."""
+
+    def __init__(
+        self,
+        values,
+        bucket_width: int,
+        start: int = 0,
+        resolution: float = 1.0,
+        interpolate: bool = False,
+    ):
+        array = np.asarray(values)
+        if array.ndim != 3 or array.shape[1] != array.shape[2]:
+            raise ValueError("values must have shape (buckets, nodes, nodes).")
+        if bucket_width <= 0:
+            raise ValueError("bucket_width must be positive.")
+        self.values = np.ascontiguousarray(_quantize(array, resolution, array.shape[1]))
+        self.bucket_width = bucket_width
+        self.start = start
+        self.resolution = resolution
+        self.interpolate = interpolate
+        self.lower_bound = QuantizedMatrix(self.values.min(axis=0))
+
+    @property
+    def num_buckets(self) -> int:
+        return self.values.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes + self.lower_bound.nbytes
+
+    def node_values(self) -> np.ndarray:
+        return self.values
+
+    def bucket(self, departure: Union[int, np.ndarray]):
+        """Return the bucket of departure times, before start counts as the first."""
+        buckets = (np.asarray(departure) - self.start) // self.bucket_width
+        return np.clip(buckets, 0, self.num_buckets - 1)
+
+    def travel_time(self, from_node, to_node, departure):
+        """
+        Return the travel times departing at the times given, rounded up.
+
+        Arguments may be arrays of the same shape, evaluated element wise.
+        """
+        departure = np.asarray(departure)
+        bucket = self.bucket(departure)
+        times = self.values[bucket, from_node, to_node]
+        if not self.interpolate:
+            return times
+        following = np.minimum(bucket + 1, self.num_buckets - 1)
+        elapsed = np.clip(
+            departure - self.start - bucket * self.bucket_width, 0, self.bucket_width
+        )
+        change = self.values[following, from_node, to_node].astype(np.int64) - times
+        # Integer ceiling of times + change * elapsed / bucket_width.
+        return times - (-change * elapsed // self.bucket_width)
+
+
+def add_time_dependent_dimension(
+    router,
+    matrix: TimeDependentMatrix,
+    capacity: int,
+    name: str,
+    slack_max: int = 0,
+    fix_start_cumul_to_zero: bool = True,
+):
+    """Add a time dimension to a RouteOptimizer, see module docs."""
+    lower_bound = matrix.lower_bound
+    extra_max = int((matrix.values - lower_bound.values).max(initial=0))
+    dimension = router.add_dimension(
+        lower_bound, capacity, name, slack_max + extra_max, fix_start_cumul_to_zero
+    )
+    model, manager = router.model, router.manager
+    solver = model.solver()
+    index_to_node = [
+        manager.IndexToNode(i) for i in range(manager.GetNumberOfIndices())
+    ]
+    values, lower = matrix.values, lower_bound.values
+    last_bucket = matrix.num_buckets - 1
+    width = matrix.bucket_width
+
+    def extra_callback(node):
+        def extra(next_index, bucket):
+            to_node = index_to_node[next_index]
+            return int(values[bucket, node, to_node] - lower[node, to_node])
+
+        return extra
+
+    def change_callback(node):
+        def change(next_index, bucket):
+            to_node = index_to_node[next_index]
+            following = min(bucket + 1, last_bucket)
+            return int(values[following, node, to_node] - values[bucket, node, to_node])
+
+        return change
+
+    for index in range(model.Size()):
+        node = index_to_node[index]
+        cumul, slack, next_var = (
+            dimension.CumulVar(index),
+            dimension.SlackVar(index),
+            model.NextVar(index),
+        )
+        elapsed = cumul - matrix.start
+        bucket = solver.IntVar(0, last_bucket, "{}_bucket_{}".format(name, index))
+        solver.Add(bucket == solver.Max(solver.Min(elapsed // width, last_bucket), 0))
+        # Times scaled by width, to compare interpolated times without rounding.
+        required = solver.Element(extra_callback(node), next_var, bucket) * width
+        if matrix.interpolate:
+            into_bucket = solver.Max(solver.Min(elapsed - bucket * width, width), 0)
+            change = solver.Element(change_callback(node), next_var, bucket)
+            required = required + change * into_bucket
+        solver.Add(slack * width >= required)
+        solver.Add(slack * width < required + (slack_max + 1) * width)
+    return dimension
@@ -0,0 +1,102 @@
+"""
+Bulk time windows on the cumuls of a dimension.
+
+Windows are given as arrays and checked, merged and translated from nodes to
+indices with numpy, leaving one solver call per bound set. Windows given for the
+same node more than once are intersected, soft ones charged at the larger penalty
+(the solver keeps one soft bound per node and side).
+"""
+import numpy as np
+
+
+def node_indices(router) -> np.ndarray:
+    """Return the index of every node, -1 for start and end nodes, built once."""
+    table = router._node_index_table
+    if table is None:
+        manager = router.manager
+        table = np.full(manager.GetNumberOfNodes(), -1, np.int64)
+        for node in range(len(table)):
+            if node not in router._route_end_nodes:
+                table[node] = manager.NodeToIndex(node)
+        router._node_index_table = table
+    return table
+
+
+def _window_arrays(nodes, earliest, latest, num_nodes: int):
+    nodes = np.asarray(nodes, np.int64).ravel()
+    earliest = np.broadcast_to(np.asarray(earliest, np.int64), nodes.shape)
+    latest = np.broadcast_to(np.asarray(latest, np.int64), nodes.shape)
+    if ((nodes < 0) | (nodes >= num_nodes)).any():
+        raise ValueError("Time window for a node out of range.")
+    if (earliest > latest).any():
+        raise ValueError("Time windows must have earliest <= latest.")
+    return nodes, earliest, latest
+
+
+def add_time_windows(
+    router, dimension_name: str, nodes, earliest, latest, penalties=None
+):
+    """Add time windows to a RouteOptimizer, see RouteOptimizer.add_time_windows."""
+    dimension = router.model.GetDimensionOrDie(dimension_name)
+    table = node_indices(router)
+    nodes, earliest, latest = _window_arrays(nodes, earliest, latest, len(table))
+    indices = table[nodes]
+    if (indices < 0).any():
+        raise ValueError(
+            "Start and end nodes can't get time windows, use add_vehicle_shifts."
+        )
+
+    if penalties is None:
+        # Intersect repeated windows, keep one per index.
+        order = np.argsort(indices, kind="stable")
+        indices, earliest, latest = indices[order], earliest[order], latest[order]
+        unique, starts = np.unique(indices, return_index=True)
+        earliest = np.maximum.reduceat(earliest, starts)
+        latest = np.minimum.reduceat(latest, starts)
+        if (earliest > latest).any():
+            raise ValueError("Time windows given for the same node don't overlap.")
+        for index, low, high in zip(
+            unique.tolist(), earliest.tolist(), latest.tolist()
+        ):
+            dimension.CumulVar(index).SetRange(low, high)
+        return
+
+    penalties = np.broadcast_to(np.asarray(penalties, np.int64), nodes.shape)
+    for index, low, high, penalty in zip(
+        indices.tolist(), earliest.tolist(), latest.tolist(), penalties.tolist()
+    ):
+        low_penalty = high_penalty = penalty
+        if dimension.HasCumulVarSoftLowerBound(index):
+            low = max(low, dimension.GetCumulVarSoftLowerBound(index))
+            low_penalty = max(
+                penalty, dimension.GetCumulVarSoftLowerBoundCoefficient(index)
+            )
+        if dimension.HasCumulVarSoftUpperBound(index):
+            high = min(high, dimension.GetCumulVarSoftUpperBound(index))
+            high_penalty = max(
+                penalty, dimension.GetCumulVarSoftUpperBoundCoefficient(index)
+            )
+        dimension.SetCumulVarSoftLowerBound(index, low, low_penalty)
+        dimension.SetCumulVarSoftUpperBound(index, high, high_penalty)
+
+
+def add_vehicle_shifts(router, dimension_name: str, earliest, latest, penalties=None):
+    """Add vehicle shifts to a RouteOptimizer, see RouteOptimizer.add_vehicle_shifts."""
+    model = router.model
+    dimension = model.GetDimensionOrDie(dimension_name)
+    num_vehicles = model.vehicles()
+    vehicles = np.arange(num_vehicles)
+    _, earliest, latest = _window_arrays(vehicles, earliest, latest, num_vehicles)
+    if penalties is not None:
+        penalties = np.broadcast_to(np.asarray(penalties, np.int64), vehicles.shape)
+    for vehicle, low, high in zip(
+        vehicles.tolist(), earliest.tolist(), latest.tolist()
+    ):
+        start, end = model.Start(vehicle), model.End(vehicle)
+        if penalties is None:
+            dimension.CumulVar(start).SetRange(low, high)
+            dimension.CumulVar(end).SetRange(low, high)
+        else:
+            penalty = int(penalties[vehicle])
+            dimension.SetCumulVarSoftLowerBound(start, low, penalty)
+            dimension.SetCumulVarSoftUpperBound(end, high, penalty)
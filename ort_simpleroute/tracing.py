@@ -0,0 +1,201 @@
+"""
+Tracing spans around the phases of building and solving routing models.
+
+Phases traced: "load_data" (read_instance), "build_model" (RouteOptimizer creation),
+"register_callback", "add_dimension", "solve" with its "first_solution" and
+"local_search" parts, and "extract_routes".
+
+Spans are sent to the sinks added with add_sink, any object with a record method
+taking a SpanRecord. MemoryRecorder, JsonLinesSink and PrometheusTextSink are
+provided. Without sinks, spans cost a single check.
+"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from itertools import count
+from typing import Dict, List, NamedTuple, Optional
+
+_sinks: List = []
+_span_ids = count(1)
+_local = threading.local()
+
+
+class SpanRecord(NamedTuple):
+    name: str
+    span_id: int
+    parent_id: Optional[int]
+    start: float  # Unix time.
+    duration: float  # Seconds.
+    attributes: Dict
+
+
+def add_sink(sink):
+    """Send every span ended from now on to sink."""
+    _sinks.append(sink)
+
+
+def remove_sink(sink):
+    _sinks.remove(sink)
+
+
+@contextmanager
+def tracing(sink):
+    """Send the spans ended within the block to sink."""
+    add_sink(sink)
+    try:
+        yield sink
+    finally:
+        remove_sink(sink)
+
+
+def is_tracing() -> bool:
+    return bool(_sinks)
+
+
+def record_span(
+    name: str,
+    start: float,
+    duration: float,
+    parent_id: Optional[int] = None,
+    **attributes
+):
+    """Send a span measured by the caller, start given as Unix time."""
+    record = SpanRecord(name, next(_span_ids), parent_id, start, duration, attributes)
+    for sink in list(_sinks):
+        sink.record(record)
+
+
+class _Span:
+    __slots__ = ("name", "attributes", "span_id", "parent_id", "start", "_clock")
+
+    def __init__(self, name: str, attributes: Dict):
+        self.name = name
+        self.attributes = attributes
+
+    def __enter__(self):
+        stack = _local.__dict__.setdefault("stack", [])
+        self.span_id = next(_span_ids)
+        self.parent_id = stack[-1].span_id if stack else None
+        stack.append(self)
+        self.start, self._clock = time.time(), time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        duration = time.perf_counter() - self._clock
+        _local.stack.pop()
+        record = SpanRecord(
+            self.name,
+            self.span_id,
+            self.parent_id,
+            self.start,
+            duration,
+            self.attributes,
+        )
+        for sink in list(_sinks):
+            sink.record(record)
+
+
+class _NoSpan:
+    span_id = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name: str, **attributes):
+    """Context manager timing a phase, nested spans record it as their parent."""
+    if not _sinks:
+        return _NO_SPAN
+    return _Span(name, attributes)
+
+
+class MemoryRecorder:
+    """Keep every span in memory, to inspect them."""
+
+    def __init__(self):
+        self.records: List[SpanRecord] = []
+        self._lock = threading.Lock()
+
+    def record(self, record: SpanRecord):
+        with self._lock:
+            self.records.append(record)
+
+    def totals(self) -> Dict[str, float]:
+        """Seconds spent in every span name, slowest first."""
+        totals = defaultdict(float)
+        for record in self.records:
+            totals[record.name] += record.duration
+        return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+
+class JsonLinesSink:
+    """Append one json object per span to a file."""
+
+    def __init__(self, path: str):
+        self._file = open(path, "a")
+        self._lock = threading.Lock()
+
+    def record(self, record: SpanRecord):
+        line = json.dumps(record._asdict(), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class PrometheusTextSink:
+    """
+    Keep per span counts and seconds, written in Prometheus text exposition format.
+
+    The file, meant for the node exporter textfile collector, is replaced at most
+    every min_interval seconds, and on flush.
+    """
+
+    def __init__(self, path: str, min_interval: float = 1.0):
+        self.path = path
+        self.min_interval = min_interval
+        self._counts = defaultdict(int)
+        self._seconds = defaultdict(float)
+        self._written = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, record: SpanRecord):
+        with self._lock:
+            self._counts[record.name] += 1
+            self._seconds[record.name] += record.duration
+            if time.monotonic() - self._written >= self.min_interval:
+                self._write()
+
+    def flush(self):
+        with self._lock:
+            self._write()
+
+    def _write(self):
+        lines = [
+            "# HELP ort_simpleroute_span_seconds Time spent in each phase.",
+            "# TYPE ort_simpleroute_span_seconds summary",
+        ]
+        for name in sorted(self._counts):
+            label = '{span="%s"}' % name
+            lines.append(
+                "ort_simpleroute_span_seconds_sum%s %r" % (label, self._seconds[name])
+            )
+            lines.append(
+                "ort_simpleroute_span_seconds_count%s %d" % (label, self._counts[name])
+            )
+        temporary = self.path + ".tmp"
+        with open(temporary, "w") as file:
+            file.write("\n".join(lines) + "\n")
+        os.replace(temporary, self.path)
+        self._written = time.monotonic()